@@ -1,7 +1,15 @@
 import streamlit as st
-from google import genai
+from msy import chat
 
-client = genai.Client()
+def grounded_prompt(msg):
+    """The question with its data context; runs on msy.chat's worker, not the page thread."""
+    try:
+        # imported here: the data stack loads on the first question, not with the landing page
+        from msy import context
+
+        return context.grounded_prompt(msg)
+    except Exception:  # no data yet: ask the bare question
+        return msg
 
 def render_gemini_chat():
     if "chat_history" not in st.session_state:
@@ -10,6 +18,8 @@ def render_gemini_chat():
         st.session_state.chat_open = False
     if "chat_input" not in st.session_state:
         st.session_state.chat_input = ""
+    if "chat_pending" not in st.session_state:
+        st.session_state.chat_pending = None
 
     if st.button("💬 Chat"):
         st.session_state.chat_open = not st.session_state.chat_open
@@ -20,16 +30,8 @@ def render_gemini_chat():
             return
         st.session_state.chat_input = ""
         st.session_state.chat_history.append(("user", msg))
-        st.session_state.chat_history.append(("Gemini", "*typing...*"))
-
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=msg
-            )
-            st.session_state.chat_history[-1] = ("Gemini", response.text)
-        except Exception as e:
-            st.session_state.chat_history[-1] = ("Gemini", f"Error: {e}")
+        # the data context and the model both run on msy.chat's worker pool; the callback returns right away
+        st.session_state.chat_pending = chat.submit(msg, build=grounded_prompt)
 
     if st.session_state.chat_open:
         # Display chat in the right sidebar
@@ -38,5 +40,15 @@ def render_gemini_chat():
         for role, text in st.session_state.chat_history:
             st.sidebar.markdown(f"**{role}:** {text}")
 
+        # Stream the pending reply as its chunks arrive
+        reply = st.session_state.chat_pending
+        if reply is not None:
+            st.sidebar.markdown("**Gemini:**")
+            with st.sidebar:
+                st.write_stream(reply.chunks())
+            text = f"Error: {reply.error}" if reply.error else reply.text
+            st.session_state.chat_history.append(("Gemini", text))
+            st.session_state.chat_pending = None
+
         # Input box
         st.sidebar.text_input("Type your message:", key="chat_input", on_change=send_message)
@@ -70,12 +70,15 @@ with content_col:
     row4, row5, row6 = st.columns(3)
     row4.page_link("pages/Menu_Items_Trend.py", label="📈 Menu Items Trend")
     row5.page_link("pages/Network.py", label="🌐 Menu Item Network")
-    row6.page_link("pages/Optimization_by_Item.py", label="⚙️ Item Optimization")
+    row6.page_link("pages/Optimization_By_Item.py", label="⚙️ Item Optimization")
     
     # Third row: last link slightly to the right
     row_left, row_center, row_right = st.columns([1.5, 2, 1])
     with row_center:
         st.page_link("pages/Forecasting_Ingredient_Analysis.py", label="🔮 Forecasting Ingredient Analysis")
+        st.page_link("pages/Inventory_Simulation.py", label="📉 Inventory Simulation")
+        st.page_link("pages/What_If_Scenarios.py", label="🎛️ What-If Scenarios")
+        st.page_link("pages/Procurement_Plan.py", label="🛒 Procurement Plan")
 
 st.divider()
 
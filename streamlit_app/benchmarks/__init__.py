@@ -0,0 +1 @@
+"""Benchmark scripts for the msy data layer."""
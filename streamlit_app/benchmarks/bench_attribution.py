@@ -0,0 +1,100 @@
+# benchmarks/bench_attribution.py
+"""Benchmark ingredient profit attribution: legacy substring scan vs msy.attribution.
+
+Run from ``streamlit_app``::
+
+    python -m benchmarks.bench_attribution --months 24 --items 500
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from msy import attribution
+
+
+def synthetic_data(n_months: int = 24, n_items: int = 500, n_ingredients: int = 40,
+                   density: float = 0.15, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Recipe sheet with ``n_items`` rows and monthly POS sales with name variants."""
+    rng = np.random.default_rng(seed)
+    names = [f"dish {i:03d} bowl" for i in range(n_items)]
+    qty = rng.integers(5, 300, size=(n_items, n_ingredients)).astype(float)
+    qty[rng.random((n_items, n_ingredients)) > density] = np.nan
+    recipes = pd.DataFrame(qty, columns=[f"ingredient {j:02d} (g)" for j in range(n_ingredients)])
+    recipes.insert(0, "Item name", [n.title() for n in names])
+
+    rows = []
+    for m in range(n_months):
+        month = f"M{m + 1:02d}"
+        for name in names:
+            rows.append((name.title(), rng.uniform(10, 5000), month))
+            if rng.random() < 0.3:  # combo / size variants of the same dish
+                rows.append((f"{name} combo (24oz)", rng.uniform(10, 500), month))
+            if rng.random() < 0.05:  # combos that contain two recipe items
+                other = names[rng.integers(n_items)]
+                rows.append((f"{name} + {other}", rng.uniform(10, 500), month))
+        for k in range(50):  # drinks and sides that match no recipe
+            rows.append((f"drink {k}", rng.uniform(1, 300), month))
+    sales = pd.DataFrame(rows, columns=["Item Name", "Amount", "Month"])
+    return recipes, sales
+
+
+def legacy_ingredient_profit(sales: pd.DataFrame, recipes: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """The month x ingredient x item x pattern loop the Optimization page used to run."""
+    ingredient_df = recipes.copy()
+    ingredient_df["Item name"] = ingredient_df["Item name"].str.strip().str.lower()
+    combined_df = sales.assign(**{"Item Name": sales["Item Name"].str.strip().str.lower()})
+
+    profit, totals = {}, {}
+    for month in combined_df["Month"].unique():
+        month_df = combined_df[combined_df["Month"] == month]
+        totals[month] = month_df["Amount"].sum()
+        profit[month] = {}
+        for ingredient in ingredient_df.columns[1:]:
+            used_in_items = ingredient_df.loc[
+                ingredient_df[ingredient].notna() & (ingredient_df[ingredient] != 0), "Item name"
+            ].dropna().tolist()
+            total_profit = 0.0
+            for item in used_in_items:
+                for p in attribution.SPECIAL_MATCHES.get(item, [item]):
+                    matched = month_df[month_df["Item Name"].str.contains(p, case=False, na=False)]
+                    if not matched.empty:
+                        total_profit += matched["Amount"].sum()
+            profit[month][ingredient.strip()] = total_profit
+    return pd.DataFrame(profit).T, pd.Series(totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--ingredients", type=int, default=40)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the new implementation")
+    args = parser.parse_args()
+
+    recipes, sales = synthetic_data(args.months, args.items, args.ingredients)
+    print(f"{args.months} months, {args.items} recipe items, {len(sales):,} sales rows")
+
+    t0 = time.perf_counter()
+    new_profit, new_totals = attribution.ingredient_profit(sales, recipes)
+    t_new = time.perf_counter() - t0
+    print(f"msy.attribution : {t_new:8.3f} s")
+
+    if args.skip_legacy:
+        return
+
+    t0 = time.perf_counter()
+    old_profit, old_totals = legacy_ingredient_profit(sales, recipes)
+    t_old = time.perf_counter() - t0
+    print(f"legacy scan     : {t_old:8.3f} s  ({t_old / t_new:,.0f}x slower)")
+
+    old_profit = old_profit.reindex(index=new_profit.index, columns=new_profit.columns)
+    over = (old_profit - new_profit).to_numpy()
+    print(f"month totals equal: {np.allclose(old_totals.reindex(new_totals.index), new_totals)}")
+    print(f"legacy double-counted ${over.sum():,.2f} "
+          f"({(over > 1e-6).mean():.0%} of month x ingredient cells)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_forecast.py
+"""Backtest forecasting backends and write a JSON accuracy/speed report.
+
+Run from ``streamlit_app``::
+
+    python -m benchmarks.bench_forecast --backends holt linear seasonal_naive prophet \\
+        --workers 1 4 --out forecast_report.json --baseline forecast_report_main.json
+
+Exits with status 1 when ``--baseline`` is given and a backend got slower
+or less accurate than the allowed margins.
+"""
+import argparse
+import sys
+
+from msy import backtest, constraints
+from msy import forecast as fc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(fc.BACKENDS), choices=list(fc.BACKENDS))
+    parser.add_argument("--workers", nargs="+", type=int, default=None,
+                        help="Prophet process pool sizes to time (default: CPU count)")
+    parser.add_argument("--min-train", type=int, default=3)
+    parser.add_argument("--horizon", type=int, default=1)
+    parser.add_argument("--out", default="forecast_report.json")
+    parser.add_argument("--baseline", help="earlier report to check for regressions")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--max-wape-increase", type=float, default=0.02)
+    args = parser.parse_args()
+
+    history = constraints.history()
+    report = backtest.run(history, args.backends, args.workers, args.min_train, args.horizon)
+    backtest.write_report(report, args.out)
+
+    # peak memory is the parent process only (Prophet's pool workers are not traced)
+    print(f"{'backend':<16}{'workers':>8}{'splits':>8}{'s/split':>10}{'parent MB':>11}{'MAPE':>8}{'WAPE':>8}")
+    for r in report["runs"]:
+        print(f"{r['backend']:<16}{str(r['workers']):>8}{r['splits']:>8}{r['seconds_per_split']:>10.3f}"
+              f"{r['parent_peak_memory_mb']:>11.1f}{r['overall']['mape']:>8.3f}{r['overall']['wape']:>8.3f}")
+    print(f"report written to {args.out}")
+
+    if args.baseline:
+        baseline = backtest.load_report(args.baseline)
+        problems = backtest.compare(report, baseline, args.max_slowdown, args.max_wape_increase)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
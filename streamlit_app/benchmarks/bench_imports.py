@@ -0,0 +1,41 @@
+# benchmarks/bench_imports.py
+"""Check the landing page's cold import against a time budget.
+
+Run from ``streamlit_app``::
+
+    python -m benchmarks.bench_imports --max-seconds 1.5 --repeat 3
+
+Replays Home.py's imports in fresh interpreters and exits with status 1
+when the median cold import exceeds ``--max-seconds`` or when any of
+``msy.startup.HEAVY_MODULES`` gets imported.
+"""
+import argparse
+import statistics
+import sys
+
+from msy import startup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default=str(startup.HOME))
+    parser.add_argument("--max-seconds", type=float, default=startup.IMPORT_BUDGET_SECONDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    code = startup.script_imports(args.script)
+    runs = [startup.profile(code) for _ in range(args.repeat)]
+    seconds = statistics.median(startup.total_seconds(rows) for rows in runs)
+    startup.print_profile(runs[-1], args.top)
+
+    heavy = startup.loaded_heavy(code)
+    print(f"median cold import over {args.repeat} runs: {seconds:.3f}s (budget {args.max_seconds:.3f}s)")
+    print(f"heavy modules loaded: {', '.join(heavy) or 'none'}")
+    if seconds > args.max_seconds or heavy:
+        print("FAIL import budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
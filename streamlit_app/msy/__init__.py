@@ -0,0 +1,2 @@
+# msy/__init__.py
+"""Shared data layer for the Mai-Shan-Yun dashboard pages."""
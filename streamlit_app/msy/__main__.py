@@ -0,0 +1,44 @@
+# msy/__main__.py
+"""Command line entry point: ``python -m msy <command>`` from ``streamlit_app``."""
+import argparse
+import sys
+import time
+
+from msy import cache, precompute, startup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m msy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pre = commands.add_parser("precompute", help="build every derived dataset the pages read")
+    pre.add_argument("--workers", type=int, default=None, help="thread pool size (default: CPU based)")
+    pre.add_argument("--only", nargs="+", choices=list(precompute.STAGES), metavar="STAGE",
+                     help=f"stages to build, plus their dependencies: {', '.join(precompute.STAGES)}")
+    pre.add_argument("--force", action="store_true", help="drop cached results before building")
+
+    imports = commands.add_parser("imports", help="profile the cold import cost of app scripts")
+    imports.add_argument("scripts", nargs="*", default=[str(startup.HOME)], help="default: Home.py")
+    imports.add_argument("--top", type=int, default=15, help="modules to list per script")
+
+    args = parser.parse_args()
+
+    if args.command == "precompute":
+        if args.force:
+            cache.invalidate()
+        t0 = time.perf_counter()
+        rows = precompute.run(args.only, args.workers)
+        precompute.print_report(rows, time.perf_counter() - t0)
+        if any(r["status"] != "ok" for r in rows):
+            sys.exit(1)
+
+    elif args.command == "imports":
+        for script in args.scripts:
+            code = startup.script_imports(script)
+            print(f"== {script}")
+            startup.print_profile(startup.profile(code), args.top)
+            print(f"heavy modules loaded: {', '.join(startup.loaded_heavy(code)) or 'none'}\n")
+
+
+if __name__ == "__main__":
+    main()
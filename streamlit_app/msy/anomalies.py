@@ -0,0 +1,160 @@
+# msy/anomalies.py
+"""Batch anomaly detection over monthly item and category series.
+
+Every item x month and category x month series of the cube (count, amount
+and amount per unit) is stacked into one matrix and scored at once::
+
+    r      = log1p(x) - row median - month effect     month effect: median of
+                                                        the centered rows of the
+                                                        same dimension and measure
+    score  = r / max(1.4826 * row median(|r|), MIN_SCALE)
+
+so a month that is busy for the whole menu does not flag every item; only
+series moving against the rest do. The history is too short for a yearly
+seasonal term, so the common month effect stands in for it. Scores beyond
+``THRESHOLD`` are spikes or drops; unit-price outliers and months with no
+sales in an otherwise active series are flagged as likely data errors.
+
+Names that look like one item spelled two ways (case, full-width brackets,
+spacing, a trailing "-1") are found with one vectorized similarity matrix
+over normalized names.
+"""
+import re
+import unicodedata
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from msy import cache, cube
+
+DIMENSIONS = ("item", "category")
+MEASURES = ("count", "amount", "price")
+THRESHOLD = 3.5  # modified z-score
+MIN_SCALE = 0.15  # log units: month-to-month noise below ~15% is never an anomaly
+MIN_MEDIAN_COUNT = 5  # series selling less than this in a typical month are too noisy to score
+DUPLICATE_SCORE = 95  # normalized-name similarity (0-100) from which two names are one item
+
+ALERT_COLUMNS = ["Dimension", "Member", "Measure", "Month", "Value", "Expected", "Score", "Kind"]
+DUPLICATE_COLUMNS = [
+    "Dimension", "Name", "Other Name", "Similarity", "Count", "Other Count", "Months Together", "Pattern",
+]
+
+
+def series(c: cube.Cube | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """All scored series stacked (rows: Dimension / Member / Measure) and the matching unit counts."""
+    c = c or cube.load_cube()
+    values, counts = [], []
+    for dim in DIMENSIONS:
+        count = c.query(dim, "count")
+        amount = c.query(dim, "amount")
+        price = (amount / count.where(count > 0)).astype(float)
+        for measure, frame in zip(MEASURES, (count, amount, price)):
+            frame = frame.astype(float)
+            frame.index = pd.MultiIndex.from_arrays(
+                [[dim] * len(frame), frame.index, [measure] * len(frame)], names=["Dimension", "Member", "Measure"]
+            )
+            values.append(frame)
+            counts.append(count.set_axis(frame.index))
+    return pd.concat(values), pd.concat(counts)
+
+
+def scores(values: np.ndarray, blocks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Robust z-scores and expected values (both rows x months) for log-scale series.
+
+    ``blocks`` labels the rows that share a month effect. NaN cells (price in
+    a month without sales) are ignored and score NaN.
+    """
+    logs = np.log1p(np.clip(values, 0, None))
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows: never-priced series
+        level = np.nanmedian(logs, axis=1, keepdims=True)
+        centered = logs - level
+        effect = np.zeros_like(logs)
+        for b in np.unique(blocks):
+            rows = blocks == b
+            effect[rows] = np.nanmedian(centered[rows], axis=0)
+        effect = np.nan_to_num(effect)
+        resid = centered - effect
+        scale = np.maximum(1.4826 * np.nanmedian(np.abs(resid), axis=1, keepdims=True), MIN_SCALE)
+    return resid / scale, np.expm1(level + effect)
+
+
+@cache.cached("anomalies.alerts")
+def alerts(threshold: float = THRESHOLD, min_median_count: float = MIN_MEDIAN_COUNT) -> pd.DataFrame:
+    """One ``ALERT_COLUMNS`` row per flagged cell, strongest first.
+
+    Kinds: "Spike" and "Drop" for count and amount, "Price Outlier" for
+    amount per unit and "No Sales" for an empty month where at least twice
+    ``min_median_count`` sales were expected; the last two usually point at
+    data errors (a renamed item, a missing export).
+    """
+    frame, counts = series()
+    index = frame.index.to_frame(index=False)
+    values, count = frame.to_numpy(), counts.to_numpy()
+    blocks = (index["Dimension"] + "/" + index["Measure"]).to_numpy()
+    z, expected = scores(values, blocks)
+
+    active = np.median(count, axis=1) >= min_median_count
+    measure = index["Measure"].to_numpy()
+    is_price = measure == "price"
+    # an empty month is reported once, on the count series, and only where sales were clearly expected
+    empty = (count == 0) & (measure == "count")[:, None] & (expected >= 2 * min_median_count)
+    outlier = (np.abs(np.nan_to_num(z)) >= threshold) & ~((count == 0) & (measure == "amount")[:, None])
+    flagged = active[:, None] & (outlier | empty)
+    rows, cols = np.nonzero(flagged)
+
+    kind = np.where(
+        empty[rows, cols], "No Sales",
+        np.where(is_price[rows], "Price Outlier", np.where(z[rows, cols] > 0, "Spike", "Drop")),
+    )
+    out = pd.DataFrame({
+        "Dimension": index["Dimension"].to_numpy()[rows],
+        "Member": index["Member"].to_numpy()[rows],
+        "Measure": index["Measure"].to_numpy()[rows],
+        "Month": frame.columns.to_numpy()[cols],
+        "Value": values[rows, cols],
+        "Expected": expected[rows, cols],
+        "Score": z[rows, cols],
+        "Kind": kind,
+    })
+    order = np.argsort(-np.abs(np.nan_to_num(out["Score"].to_numpy(), nan=np.inf)), kind="stable")
+    return out.iloc[order].reset_index(drop=True)[ALERT_COLUMNS]
+
+
+def normalize_name(name: str) -> str:
+    """Case, width, punctuation and spacing removed: "Pepsi zero" and "Pepsi Zero" agree."""
+    return re.sub(r"[^0-9a-z]", "", unicodedata.normalize("NFKC", str(name)).lower())
+
+
+@cache.cached("anomalies.duplicates")
+def duplicates(min_score: float = DUPLICATE_SCORE) -> pd.DataFrame:
+    """Pairs of names that are probably one member spelled two ways (``DUPLICATE_COLUMNS``).
+
+    ``Pattern`` is "Renamed" when the two were never sold in the same month
+    (one spelling replaced the other) and "Both In Use" otherwise.
+    """
+    from rapidfuzz import fuzz, process
+
+    c = cube.load_cube()
+    frames = []
+    for dim in DIMENSIONS:
+        count = c.query(dim, "count")
+        names = list(count.index)
+        keys = [normalize_name(n) for n in names]
+        similarity = process.cdist(keys, keys, scorer=fuzz.ratio, dtype=np.float32)
+        i, j = np.nonzero(np.triu(similarity >= min_score, 1))
+        sold = count.to_numpy() > 0
+        together = (sold[i] & sold[j]).sum(axis=1)
+        frames.append(pd.DataFrame({
+            "Dimension": dim,
+            "Name": np.asarray(names, dtype=object)[i],
+            "Other Name": np.asarray(names, dtype=object)[j],
+            "Similarity": similarity[i, j].astype(float),
+            "Count": count.to_numpy()[i].sum(axis=1),
+            "Other Count": count.to_numpy()[j].sum(axis=1),
+            "Months Together": together,
+            "Pattern": np.where(together == 0, "Renamed", "Both In Use"),
+        }))
+    out = pd.concat(frames, ignore_index=True)
+    return out.sort_values(["Similarity", "Count"], ascending=False).reset_index(drop=True)[DUPLICATE_COLUMNS]
@@ -0,0 +1,151 @@
+# msy/artifacts.py
+"""Forecast artifact store.
+
+Constraint-table rows (``msy.constraints.COLUMNS``) are stored one Parquet
+file per ingredient and run date under ``.msy_cache/forecasts``::
+
+    forecasts/ingredient=<slug>/run=<YYYY-MM-DD>.parquet
+    forecasts/index.json    # ingredient -> latest partition + input key
+
+The input key hashes an ingredient's usage history, its delivery-calendar
+supply and the horizon. :func:`update` only re-forecasts ingredients whose
+key changed (a new month, an edited recipe or shipment line), and pages read
+back a single ingredient with :func:`load_ingredient`, so load time stays
+flat as runs accumulate.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from msy import constraints, shipments, store
+from msy import forecast as fc
+
+ARTIFACT_DIR = store.CACHE_DIR / "forecasts"
+
+
+def partition_name(ingredient: str) -> str:
+    """Directory name for an ingredient, e.g. ``"Egg(count)"`` -> ``ingredient=egg-count``."""
+    slug = re.sub(r"[^a-z0-9]+", "-", ingredient.lower()).strip("-")
+    return f"ingredient={slug}"
+
+
+def _partition_path(artifact_dir: Path, ingredient: str, run_date: str) -> Path:
+    return Path(artifact_dir) / partition_name(ingredient) / f"run={run_date}.parquet"
+
+
+def _index_path(artifact_dir: Path) -> Path:
+    return Path(artifact_dir) / "index.json"
+
+
+def read_index(artifact_dir: Path = ARTIFACT_DIR) -> dict:
+    try:
+        return json.loads(_index_path(artifact_dir).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_index(artifact_dir: Path, index: dict) -> None:
+    text = json.dumps(index, indent=2, sort_keys=True)
+    store.atomic_write(_index_path(artifact_dir), lambda tmp: tmp.write_text(text))
+
+
+def input_keys(history: pd.DataFrame, periods: int) -> dict[str, str]:
+    """Hash of each ingredient's forecast inputs (history rows, delivery calendar supply, horizon)."""
+    end = history["ds"].max() + pd.DateOffset(months=periods) + pd.offsets.MonthEnd(0)
+    supply = shipments.supply(history["ds"].min(), end, "month", "lbs")
+    keys = {}
+    for ing, g in history.sort_values("ds").groupby("Ingredient"):
+        h = hashlib.sha1(f"{ing}|{periods}".encode())
+        h.update(pd.util.hash_pandas_object(g[["ds", "y"]], index=False).to_numpy().tobytes())
+        if ing in supply.index:
+            h.update(supply.loc[ing].to_numpy().tobytes())
+        keys[ing] = h.hexdigest()
+    return keys
+
+
+def update(forecaster: fc.Forecaster | None = None, periods: int = 3, months: list[str] | None = None,
+           run_date: str | None = None, refit: bool = False,
+           artifact_dir: Path = ARTIFACT_DIR) -> list[str]:
+    """Forecast ingredients whose inputs changed and write their partitions.
+
+    With ``refit`` every ingredient stored with a different backend or
+    parameters is forecast again as well. Ingredients the backend returns no
+    rows for (too little history) are indexed as skipped under their input
+    key, so they are only retried once their inputs change. Returns the
+    ingredients written.
+    """
+    forecaster = forecaster or fc.get_forecaster()
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    run_date = run_date or pd.Timestamp.today().date().isoformat()
+    params = json.loads(json.dumps(forecaster.params, default=list))
+
+    hist = constraints.history(months)
+    keys = input_keys(hist, periods)
+    index = read_index(artifact_dir)
+    stale = [
+        ing for ing, key in keys.items()
+        if ing not in index or index[ing]["key"] != key
+        or (refit and (index[ing]["backend"], index[ing]["params"]) != (forecaster.name, params))
+    ]
+    if not stale:
+        return []
+
+    table = constraints.build_constraint_table(forecaster, periods, months, ingredients=stale)
+    for ing, rows in table.groupby("Ingredient"):
+        target = _partition_path(artifact_dir, ing, run_date)
+        target.parent.mkdir(exist_ok=True)
+        store.atomic_write(target, lambda tmp: rows.to_parquet(tmp, index=False))
+        index[ing] = {
+            "partition": str(target.relative_to(artifact_dir)),
+            "run_date": run_date,
+            "key": keys[ing],
+            "backend": forecaster.name,
+            "params": params,
+        }
+    for ing in set(stale) - set(table["Ingredient"]):
+        index[ing] = {"skipped": True, "run_date": run_date, "key": keys[ing], "backend": forecaster.name,
+                      "params": params}
+    _write_index(artifact_dir, index)
+    return sorted(table["Ingredient"].unique())
+
+
+def version(artifact_dir: Path = ARTIFACT_DIR) -> str:
+    """Short hash of the index; changes whenever any partition is rewritten."""
+    blob = json.dumps(read_index(artifact_dir), sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def ingredients(artifact_dir: Path = ARTIFACT_DIR) -> list[str]:
+    """Ingredients with a stored forecast (skipped ones are left out)."""
+    return sorted(ing for ing, entry in read_index(artifact_dir).items() if not entry.get("skipped"))
+
+
+def runs(ingredient: str, artifact_dir: Path = ARTIFACT_DIR) -> list[str]:
+    """Run dates stored for ``ingredient``, oldest first."""
+    folder = Path(artifact_dir) / partition_name(ingredient)
+    return sorted(p.stem.split("=", 1)[1] for p in folder.glob("run=*.parquet"))
+
+
+def load_ingredient(ingredient: str, run_date: str | None = None,
+                    artifact_dir: Path = ARTIFACT_DIR) -> pd.DataFrame:
+    """Rows of one ingredient's partition (the latest run when ``run_date`` is None)."""
+    if run_date is None:
+        entry = read_index(artifact_dir).get(ingredient)
+        if entry is None or entry.get("skipped"):
+            return pd.DataFrame(columns=constraints.COLUMNS)
+        path = Path(artifact_dir) / entry["partition"]
+    else:
+        path = _partition_path(artifact_dir, ingredient, run_date)
+    return pd.read_parquet(path)
+
+
+def load_latest(artifact_dir: Path = ARTIFACT_DIR) -> pd.DataFrame:
+    """Latest run of every ingredient, in the layout of the old CSV export."""
+    frames = [load_ingredient(ing, artifact_dir=artifact_dir) for ing in ingredients(artifact_dir)]
+    if not frames:
+        return pd.DataFrame(columns=constraints.COLUMNS)
+    return pd.concat(frames, ignore_index=True)
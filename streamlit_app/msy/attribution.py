@@ -0,0 +1,80 @@
+# msy/attribution.py
+"""Ingredient profit attribution for the Optimization page.
+
+Each distinct sales item name is matched to recipe items once (substring
+match, with ``SPECIAL_MATCHES`` patterns), giving a sparse names x recipes
+matrix. Ingredient profit for every month is then a single sparse product::
+
+    profit (months x ingredients) = amounts (months x names)
+                                    @ [(matches @ uses) > 0] (names x ingredients)
+
+A sales row counts once towards an ingredient even if it matches several
+recipes that use it. scipy is imported inside the functions, so pages that
+only import :mod:`msy.datasets` do not pay for it.
+"""
+import numpy as np
+import pandas as pd
+
+from msy import recipes as rec
+
+# recipe item -> substrings that identify it in POS item names
+SPECIAL_MATCHES = {
+    "fried wings": ["chicken wings", "fried chicken", "crunch chicken"],
+    "chicken cutlet": ["chicken cutlet"],
+    "beef tossed rice noodles": ["beef tossed rice noodle"],
+    "pork tossed rice noodles": ["pork tossed rice noodle"],
+    "chicken tossed rice noodles": ["chicken tossed rice noodle"],
+}
+
+
+def match_matrix(names, recipe_names) -> "sparse.csr_matrix":
+    """Boolean names x recipes matrix: name contains one of the recipe's patterns."""
+    from scipy import sparse
+
+    names = pd.Series(list(names), dtype="string").str.strip().str.lower()
+    rows, cols = [], []
+    for j, recipe in enumerate(recipe_names):
+        recipe = str(recipe).strip().lower()
+        hit = np.zeros(len(names), dtype=bool)
+        for p in SPECIAL_MATCHES.get(recipe, [recipe]):
+            hit |= names.str.contains(p, regex=False, na=False).to_numpy(dtype=bool)
+        idx = np.flatnonzero(hit)
+        rows.append(idx)
+        cols.append(np.full(len(idx), j))
+    rows = np.concatenate(rows) if rows else np.array([], dtype=int)
+    cols = np.concatenate(cols) if cols else np.array([], dtype=int)
+    data = np.ones(len(rows), dtype=np.int8)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(names), len(recipe_names)))
+
+
+def ingredient_uses(recipes: pd.DataFrame) -> "sparse.csr_matrix":
+    """Boolean recipes x ingredients matrix of non-zero recipe cells."""
+    from scipy import sparse
+
+    return sparse.csr_matrix((rec.recipe_matrix(recipes, unit="g") != 0).astype(np.int8))
+
+
+def ingredient_profit(sales: pd.DataFrame, recipes: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """Profit attributed to each ingredient per month, and total profit per month.
+
+    ``sales`` needs ``Item Name``, ``Amount`` and ``Month`` columns.
+    """
+    from scipy import sparse
+
+    ingredients = rec.ingredient_names(recipes)
+    name_codes, names = pd.factorize(sales["Item Name"].astype(str).str.strip().str.lower())
+    month_codes, months = pd.factorize(sales["Month"])
+    amounts = pd.to_numeric(sales["Amount"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+    matches = match_matrix(names, recipes["Item name"])
+    uses = ingredient_uses(recipes)
+    name_uses = ((matches @ uses) > 0).astype(float)
+
+    month_amounts = sparse.csr_matrix(
+        (amounts, (month_codes, name_codes)), shape=(len(months), len(names))
+    )
+    profit = np.asarray((month_amounts @ name_uses).todense())
+
+    profit_df = pd.DataFrame(profit, index=pd.Index(months, name="Month"), columns=ingredients)
+    totals = pd.Series(np.asarray(month_amounts.sum(axis=1)).ravel(), index=profit_df.index)
+    return profit_df, totals
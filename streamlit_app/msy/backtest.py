@@ -0,0 +1,139 @@
+# msy/backtest.py
+"""Rolling-origin backtests for the forecasting backends.
+
+For every origin ``k`` (``min_train`` <= k < number of months) a backend is
+trained on the first ``k`` months and scored on the next ``horizon`` months.
+Each run records accuracy (MAPE/WAPE per ingredient and overall) together
+with wall time, so speed and accuracy regressions show up in the same
+report. Peak Python memory is taken in a second pass under tracemalloc, so
+tracing never slows the timed pass. It only sees the calling process:
+Prophet's pool workers are not counted, so compare it between runs of one
+backend, not across backends.
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from msy import forecast as fc
+
+
+def rolling_origins(history: pd.DataFrame, min_train: int = 3, horizon: int = 1):
+    """Yield ``(train, test)`` row sets for each forecast origin."""
+    dates = np.sort(history["ds"].unique())
+    for k in range(min_train, len(dates)):
+        test_dates = dates[k:k + horizon]
+        train = history[history["ds"] < dates[k]]
+        test = history[history["ds"].isin(test_dates)]
+        yield train, test
+
+
+def error_metrics(actual: pd.Series, predicted: pd.Series) -> dict:
+    """MAPE over non-zero actuals and WAPE (sum |error| / sum |actual|)."""
+    actual = actual.to_numpy(dtype=float)
+    err = np.abs(predicted.to_numpy(dtype=float) - actual)
+    nonzero = actual != 0
+    mape = float(np.mean(err[nonzero] / np.abs(actual[nonzero]))) if nonzero.any() else float("nan")
+    denom = np.abs(actual).sum()
+    wape = float(err.sum() / denom) if denom else float("nan")
+    return {"mape": mape, "wape": wape, "n": int(len(actual))}
+
+
+def backtest(forecaster: fc.Forecaster, history: pd.DataFrame,
+             min_train: int = 3, horizon: int = 1, memory: bool = True) -> dict:
+    """Replay every rolling origin for one backend; return a JSON-ready result.
+
+    With ``memory`` the origins are replayed a second time under tracemalloc
+    for ``parent_peak_memory_mb`` (None otherwise).
+    """
+    scored = []
+    wall = 0.0
+    splits = 0
+    for train, test in rolling_origins(history, min_train, horizon):
+        t0 = time.perf_counter()
+        pred = forecaster.forecast(train, periods=horizon)
+        wall += time.perf_counter() - t0
+        splits += 1
+        merged = test.merge(pred[["Ingredient", "ds", "yhat"]], on=["Ingredient", "ds"], how="inner")
+        scored.append(merged)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        for train, _ in rolling_origins(history, min_train, horizon):
+            forecaster.forecast(train, periods=horizon)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    scored = pd.concat(scored, ignore_index=True) if scored else pd.DataFrame(columns=["Ingredient", "y", "yhat"])
+    per_ingredient = {
+        ing: error_metrics(g["y"], g["yhat"]) for ing, g in scored.groupby("Ingredient")
+    }
+    return {
+        "backend": forecaster.name,
+        "params": {k: list(v) if isinstance(v, tuple) else v for k, v in forecaster.params.items()},
+        "workers": forecaster.workers,
+        "splits": splits,
+        "wall_seconds": wall,
+        "seconds_per_split": wall / splits if splits else float("nan"),
+        "parent_peak_memory_mb": peak,
+        "overall": error_metrics(scored["y"], scored["yhat"]),
+        "per_ingredient": per_ingredient,
+    }
+
+
+def run(history: pd.DataFrame, backends: list[str], workers: list[int | None] | None = None,
+        min_train: int = 3, horizon: int = 1) -> dict:
+    """Backtest each backend (and each worker count for Prophet) into one report.
+
+    Prophet runs use an empty model cache so the timings include fitting.
+    """
+    runs = []
+    for name in backends:
+        for w in (workers or [None]) if name == "prophet" else [None]:
+            if name == "prophet":
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    forecaster = fc.get_forecaster(name, workers=w, cache_dir=Path(cache_dir))
+                    runs.append(backtest(forecaster, history, min_train, horizon))
+            else:
+                runs.append(backtest(fc.get_forecaster(name), history, min_train, horizon))
+    return {
+        "generated_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "months": [str(pd.Timestamp(d).date()) for d in np.sort(history["ds"].unique())],
+        "min_train": min_train,
+        "horizon": horizon,
+        "runs": runs,
+    }
+
+
+def write_report(report: dict, path: Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2, default=float))
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare(report: dict, baseline: dict, max_slowdown: float = 1.5,
+            max_wape_increase: float = 0.02) -> list[str]:
+    """Regressions of ``report`` against ``baseline`` (matched on backend + workers)."""
+    base = {(r["backend"], r["workers"]): r for r in baseline["runs"]}
+    problems = []
+    for r in report["runs"]:
+        b = base.get((r["backend"], r["workers"]))
+        if b is None:
+            continue
+        label = f"{r['backend']} (workers={r['workers']})"
+        if b["seconds_per_split"] and r["seconds_per_split"] > b["seconds_per_split"] * max_slowdown:
+            problems.append(
+                f"{label}: {r['seconds_per_split']:.3f}s/split vs baseline {b['seconds_per_split']:.3f}s"
+            )
+        if r["overall"]["wape"] > b["overall"]["wape"] + max_wape_increase:
+            problems.append(
+                f"{label}: WAPE {r['overall']['wape']:.3f} vs baseline {b['overall']['wape']:.3f}"
+            )
+    return problems
@@ -0,0 +1,191 @@
+# msy/cache.py
+"""Shared result cache for the dashboard pages.
+
+Results are cached process-wide, so every Streamlit session of a deployment
+shares them, in two layers:
+
+* an in-process LRU bounded by ``MAX_MEMORY_BYTES`` (``MSY_CACHE_MEMORY_MB``)
+* an on-disk store under ``.msy_cache/results/<namespace>/`` that survives
+  restarts
+
+Keys combine the function's arguments with a version of its inputs: by
+default :func:`data_version`, which covers the month workbooks, the recipe
+sheet and the shipment schedule, so usage, forecasts and cubes computed from
+older data are never served once a new month lands. Functions that only read
+particular files pass ``sources=`` and are keyed on those files' content
+hashes instead.
+
+Concurrent calls that miss on the same key compute it once: the others
+wait for the first one and read its result.
+
+Values are stored pickled and unpickled on every hit, so callers get their
+own copy and may modify it.
+"""
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from msy import store
+
+MAX_MEMORY_BYTES = int(os.environ.get("MSY_CACHE_MEMORY_MB", "256")) * 2**20
+RESULT_DIR = store.CACHE_DIR / "results"
+
+
+class LRUCache:
+    """Byte-bounded least-recently-used map of key -> pickled value."""
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            blob = self._items.get(key)
+            if blob is not None:
+                self._items.move_to_end(key)
+            return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.size -= len(self._items.pop(key))
+            self._items[key] = blob
+            self.size += len(blob)
+            while self.size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self.size -= len(old)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [k for k in self._items if k.startswith(prefix)]:
+                self.size -= len(self._items.pop(key))
+
+
+_memory = LRUCache()
+
+
+# ---------- Versions ----------
+def source_version(*paths: Path, cache_dir: Path = store.CACHE_DIR) -> str:
+    """Short hash over the content of ``paths`` (missing files count as absent).
+
+    Hashes are reused from ``.msy_cache/sources/manifest.json`` while mtime
+    and size are unchanged, the same way the month store fingerprints workbooks.
+    """
+    manifest_dir = Path(cache_dir) / "sources"
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    manifest = store._read_manifest(manifest_dir)
+    entries, hashes = dict(manifest), []
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            hashes.append((path.name, None))
+            continue
+        sha1 = store.fingerprint(path, manifest)
+        st_ = os.stat(path)
+        entries[path.name] = {"sha1": sha1, "mtime_ns": st_.st_mtime_ns, "size": st_.st_size}
+        hashes.append((path.name, sha1))
+    if entries != manifest:
+        store._write_manifest(manifest_dir, entries)
+    return hashlib.sha1(json.dumps(hashes).encode()).hexdigest()[:12]
+
+
+def data_version() -> str:
+    """Version of every dashboard input: month workbooks, recipes and shipments."""
+    from msy import constraints, recipes  # modules built on this cache import it too
+
+    blob = store.data_version() + source_version(recipes.RECIPE_PATH, constraints.SHIPMENT_PATH)
+    return hashlib.sha1(blob.encode()).hexdigest()[:12]
+
+
+# ---------- Cached functions ----------
+def _disk_path(namespace: str, version: str, key: str) -> Path:
+    return RESULT_DIR / namespace / f"{version}-{key}.pkl"
+
+
+def _lookup(mem_key: str, path: Path | None) -> bytes | None:
+    blob = _memory.get(mem_key)
+    if blob is None and path is not None and path.exists():
+        blob = path.read_bytes()
+        _memory.put(mem_key, blob)
+    return blob
+
+
+_key_locks: dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def _key_lock(mem_key: str) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(mem_key, threading.Lock())
+
+
+def _release_key(mem_key: str) -> None:
+    # waiters already hold the lock object and find the stored result; later callers hit the cache first
+    with _key_locks_guard:
+        _key_locks.pop(mem_key, None)
+
+
+def cached(namespace: str | None = None, sources: list[Path] | None = None, disk: bool = True):
+    """Decorator: cache a function's result per input version and arguments.
+
+    ``namespace`` defaults to the function's module and name; Streamlit pages
+    all run as ``__main__`` and should pass one. ``sources`` pins the version
+    to those files instead of :func:`data_version`; ``disk=False`` keeps
+    results in memory only.
+    """
+    def decorator(fn):
+        ns = namespace or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            version = data_version() if sources is None else source_version(*sources)
+            key = hashlib.sha1(pickle.dumps((args, sorted(kwargs.items())))).hexdigest()[:16]
+            mem_key = f"{ns}/{version}-{key}"
+
+            path = _disk_path(ns, version, key)
+            blob = _lookup(mem_key, path if disk else None)
+            if blob is not None:
+                return pickle.loads(blob)
+
+            # concurrent misses on one key wait for the first caller instead of computing again
+            with _key_lock(mem_key):
+                blob = _lookup(mem_key, path if disk else None)
+                if blob is not None:
+                    return pickle.loads(blob)
+                try:
+                    value = fn(*args, **kwargs)
+                    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                    _memory.put(mem_key, blob)
+                    if disk:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        # results of older versions are never read again
+                        for old in path.parent.glob("*.pkl"):
+                            if not old.name.startswith(version):
+                                old.unlink(missing_ok=True)
+                        store.atomic_write(path, lambda tmp: tmp.write_bytes(blob))
+                finally:
+                    _release_key(mem_key)
+            return value
+
+        wrapper.namespace = ns
+        return wrapper
+
+    return decorator
+
+
+def invalidate(namespace: str | None = None) -> None:
+    """Drop cached results of one namespace (all namespaces when None)."""
+    _memory.clear(f"{namespace}/" if namespace else "")
+    folders = [RESULT_DIR / namespace] if namespace else list(RESULT_DIR.glob("*"))
+    for folder in folders:
+        for p in folder.glob("*.pkl"):
+            p.unlink(missing_ok=True)
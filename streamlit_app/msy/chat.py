@@ -0,0 +1,219 @@
+# msy/chat.py
+"""Chat backends for the sidebar assistant.
+
+Replies are produced on a shared worker pool, never on the Streamlit script
+thread: :func:`submit` returns a :class:`Reply` at once and the page drains
+its chunks as the backend streams them. Finished replies are kept in a TTL
+cache keyed by (backend, model, prompt), so asking the same question twice
+does not call the model again.
+
+* ``gemini`` -- Google GenAI ``generate_content_stream``; one client per
+  process, created on first use (needs ``GEMINI_API_KEY``)
+* ``stub`` -- deterministic local echo, for offline runs and CI
+
+``CHAT_BACKEND``, ``CHAT_MODEL`` and ``CHAT_TTL_SECONDS`` can be overridden
+with the ``MSY_CHAT_BACKEND``, ``MSY_CHAT_MODEL`` and ``MSY_CHAT_TTL``
+environment variables.
+"""
+import abc
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+CHAT_BACKEND = os.environ.get("MSY_CHAT_BACKEND", "gemini")
+CHAT_MODEL = os.environ.get("MSY_CHAT_MODEL", "gemini-2.5-flash")
+CHAT_TTL_SECONDS = float(os.environ.get("MSY_CHAT_TTL", "600"))
+CACHE_MAX_ENTRIES = 256
+WORKERS = 4
+
+
+# ---------- Response cache ----------
+class TTLCache:
+    """Bounded map of key -> text whose entries expire ``ttl`` seconds after they are stored."""
+
+    def __init__(self, ttl: float = CHAT_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._items: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, text = item
+            if expires < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return text
+
+    def put(self, key: tuple, text: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (time.monotonic() + self.ttl, text)
+            now = time.monotonic()
+            for k in [k for k, (expires, _) in self._items.items() if expires < now]:
+                del self._items[k]
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+# ---------- Backends ----------
+class ChatBackend(abc.ABC):
+    """Streams the reply to one prompt as text chunks."""
+
+    name = "base"
+
+    def __init__(self, model: str = CHAT_MODEL):
+        self.model = model
+
+    @abc.abstractmethod
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the reply to ``prompt`` chunk by chunk."""
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def gemini_client():
+    """The process-wide ``genai.Client``, created on first use and shared by every session."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from google import genai
+
+            _client = genai.Client()
+        return _client
+
+
+class GeminiBackend(ChatBackend):
+    name = "gemini"
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in gemini_client().models.generate_content_stream(model=self.model, contents=prompt):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend(ChatBackend):
+    """Echoes the prompt word by word; ``delay`` seconds between chunks."""
+
+    name = "stub"
+
+    def __init__(self, model: str = "stub", delay: float = 0.0):
+        super().__init__(model)
+        self.delay = delay
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        words = f"(stub) You asked: {prompt}".split(" ")
+        for i, word in enumerate(words):
+            if self.delay:
+                time.sleep(self.delay)
+            yield word if i == 0 else " " + word
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "stub": StubBackend,
+}
+
+
+def get_backend(name: str | None = None, **params) -> ChatBackend:
+    """Instantiate a backend by name (``CHAT_BACKEND`` when None)."""
+    name = name or CHAT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown chat backend {name!r}; expected one of {list(BACKENDS)}")
+    return BACKENDS[name](**params)
+
+
+# ---------- Replies ----------
+_DONE = object()
+
+
+class Reply:
+    """A reply being produced on the worker pool.
+
+    :meth:`chunks` yields text as it arrives (it can be passed straight to
+    ``st.write_stream``); ``text`` holds what has arrived so far and
+    ``error`` the backend exception, if any.
+    """
+
+    def __init__(self, text: str | None = None, cached: bool = False):
+        self.text = text or ""
+        self.error: Exception | None = None
+        self.cached = cached
+        self._queue: queue.Queue = queue.Queue()
+        self._finished = threading.Event()
+        if text is not None:
+            self._queue.put(text)
+            self._queue.put(_DONE)
+            self._finished.set()
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def chunks(self, timeout: float | None = None) -> Iterator[str]:
+        while True:
+            item = self._queue.get(timeout=timeout)
+            if item is _DONE:
+                return
+            yield item
+
+    def wait(self, timeout: float | None = None) -> str:
+        self._finished.wait(timeout)
+        return self.text
+
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="msy-chat")
+_responses = TTLCache()
+
+
+def _produce(backend: ChatBackend, prompt: str, reply: Reply, build: Callable[[str], str] | None = None) -> None:
+    try:
+        if build is not None:
+            prompt = build(prompt)
+        key = (backend.name, backend.model, prompt)
+        text = _responses.get(key)
+        if text is not None:
+            reply.text, reply.cached = text, True
+            reply._queue.put(text)
+            return
+        for chunk in backend.stream(prompt):
+            reply.text += chunk
+            reply._queue.put(chunk)
+        _responses.put(key, reply.text)
+    except Exception as e:  # surfaced to the page through reply.error
+        reply.error = e
+        reply._queue.put(f"Error: {e}")
+    finally:
+        reply._queue.put(_DONE)
+        reply._finished.set()
+
+
+def submit(prompt: str, backend: ChatBackend | None = None, build: Callable[[str], str] | None = None) -> Reply:
+    """Start answering ``prompt`` off the calling thread; cached answers return finished.
+
+    ``build`` turns ``prompt`` into the text sent to the model (e.g. adds the
+    data context) and runs on the worker too, so slow lookups never block the
+    page; the cache is then keyed on what it returns.
+    """
+    backend = backend or get_backend()
+    if build is None:
+        text = _responses.get((backend.name, backend.model, prompt))
+        if text is not None:
+            return Reply(text, cached=True)
+    reply = Reply()
+    _pool.submit(_produce, backend, prompt, reply, build)
+    return reply
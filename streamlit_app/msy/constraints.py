@@ -0,0 +1,84 @@
+# msy/constraints.py
+"""Forecast vs. shipment supply constraint table.
+
+Builds the rows behind ``ingredient_forecast_with_constraints.csv`` and the
+Forecasting Ingredient Analysis page: fitted history plus future months per
+ingredient, compared against the monthly supply from the shipment schedule.
+"""
+import numpy as np
+import pandas as pd
+
+from msy import forecast as fc
+from msy import recipes as rec
+from msy import shipments, usage
+
+SHIPMENT_PATH = shipments.SHIPMENT_PATH
+
+HISTORICAL = "Historical Data"
+SUFFICIENT = "✅ Sufficient Supply"
+SHORTFALL = "⚠️ SHORTFALL: Order More"
+NO_SUPPLY = "No Supply Data"
+
+COLUMNS = [
+    "Month_Label", "Date", "Ingredient", "Forecasted_Usage_Original_Unit", "Constraint_Unit",
+    "Forecast_LBS_or_Count", "Monthly_Supply_Constraint", "Shortfall_Surplus", "Action_Required",
+]
+
+
+def monthly_supply(path=SHIPMENT_PATH) -> pd.DataFrame:
+    """Average supply per recipe ingredient: Monthly_Supply_Constraint and Constraint_Unit (lbs or Count)."""
+    per_month = shipments.average_monthly("lbs", shipments.load_lines(path))
+    return pd.DataFrame({
+        "Ingredient": per_month.index,
+        "Monthly_Supply_Constraint": per_month.to_numpy(),
+        "Constraint_Unit": [rec.unit_label(ing, "lbs") for ing in per_month.index],
+    })
+
+
+def history(months: list[str] | None = None) -> pd.DataFrame:
+    """Monthly usage in lbs (or counts) as forecaster input rows (Ingredient, ds, y)."""
+    hist = usage.usage_long(months, unit="lbs")
+    return hist.rename(columns={"Date": "ds", "Usage": "y"})[["Ingredient", "ds", "y"]]
+
+
+def constraint_rows(forecast: pd.DataFrame, last_actual: pd.Timestamp) -> pd.DataFrame:
+    """Forecaster output (FORECAST_COLUMNS) -> COLUMNS rows compared against supply.
+
+    Supply is what the delivery calendar brings in each month, so months
+    with five weekly deliveries get five.
+    """
+    if forecast.empty:  # every series too short for the backend
+        return pd.DataFrame(columns=COLUMNS)
+    out = forecast.rename(columns={"yhat": "Forecast_LBS_or_Count", "ds": "Date"})
+    supply = shipments.supply_long(out["Date"].min(), out["Date"].max() + pd.offsets.MonthEnd(0), "month", "lbs")
+    supply = supply.rename(columns={"Supply": "Monthly_Supply_Constraint", "Unit": "Constraint_Unit"})
+    supply["Date"] = supply["Date"].astype(out["Date"].dtype)
+    out = out.merge(supply, on=["Ingredient", "Date"], how="left")
+
+    to_original = 1 / rec.unit_vector(out["Ingredient"].tolist(), "lbs")
+    out["Forecasted_Usage_Original_Unit"] = out["Forecast_LBS_or_Count"] * to_original
+    out["Month_Label"] = out["Date"].dt.strftime("%b")
+    out["Shortfall_Surplus"] = out["Monthly_Supply_Constraint"] - out["Forecast_LBS_or_Count"]
+
+    future = out["Date"] > last_actual
+    out["Action_Required"] = np.select(
+        [~future, out["Shortfall_Surplus"].isna(), out["Shortfall_Surplus"] < 0],
+        [HISTORICAL, NO_SUPPLY, SHORTFALL],
+        default=SUFFICIENT,
+    )
+    return out.sort_values(["Ingredient", "Date"]).reset_index(drop=True)[COLUMNS]
+
+
+def build_constraint_table(forecaster: fc.Forecaster | None = None, periods: int = 3,
+                           months: list[str] | None = None,
+                           ingredients: list[str] | None = None) -> pd.DataFrame:
+    """Forecast usage with ``forecaster`` and compare each month with shipment supply.
+
+    ``ingredients`` limits the forecast to those series (all when None).
+    """
+    forecaster = forecaster or fc.get_forecaster()
+    hist = history(months)
+    last_actual = hist["ds"].max()
+    if ingredients is not None:
+        hist = hist[hist["Ingredient"].isin(ingredients)]
+    return constraint_rows(forecaster.forecast(hist, periods), last_actual)
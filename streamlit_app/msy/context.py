@@ -0,0 +1,143 @@
+# msy/context.py
+"""Data-grounded context for the chat assistant.
+
+Instead of pasting tables into prompts, each data source is reduced once to
+a few ranked one-line facts:
+
+* ``supply`` -- forecast months with the tightest supply (the constraint
+  table from :mod:`msy.artifacts`), shortfalls first
+* ``movers`` -- menu items whose unit sales changed most in the last month
+* ``income`` -- category income for the latest month and its change
+
+Summaries are :func:`msy.cache.cached`, so they are rebuilt only when the
+data (or the forecast artifacts) change. :func:`build_context` ranks the
+sections by keywords in the question and fills lines until the token
+budget is spent, keeping prompt size bounded however large the data grows.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from msy import artifacts, cache, constraints, cube, datasets
+
+DEFAULT_TOKEN_BUDGET = 600
+CHARS_PER_TOKEN = 4  # rough English average; good enough for a budget
+TOP_N = 8
+
+KEYWORDS = {
+    "supply": r"short|supply|shipment|order|stock|run out|inventory|ingredient|forecast|need",
+    "movers": r"trend|popular|best|sell|seller|item|menu|grow|drop|mover",
+    "income": r"income|revenue|sales|category|money|profit|earn",
+}
+
+PREAMBLE = (
+    "You are the assistant of the Mai Shan Yun restaurant dashboard. Answer from the data below "
+    "when it is relevant and say so when it does not cover the question."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _ingredient_label(name: str) -> str:
+    return re.sub(r"\s*\((g|count|pcs)\)|\s*used \(g\)|\(g\)", "", name).strip()
+
+
+# ---------- Summaries ----------
+@cache.cached("context.supply")
+def supply_summary(artifact_version: str, top_n: int = TOP_N) -> list[str]:
+    """Forecast months with the least supply headroom, one line per ingredient."""
+    table = artifacts.load_latest()
+    future = table[table["Action_Required"] != constraints.HISTORICAL]
+    if future.empty:
+        return []
+    first = future["Date"].min()
+    month = future[future["Date"] == first].sort_values("Shortfall_Surplus")
+    label = pd.Timestamp(first).strftime("%B %Y")
+    lines = [f"Supply forecast for {label} (forecast usage vs monthly shipments):"]
+    for r in month.head(top_n).itertuples():
+        lines.append(
+            f"- {_ingredient_label(r.Ingredient)}: {r.Forecast_LBS_or_Count:,.1f} {r.Constraint_Unit} needed, "
+            f"{r.Monthly_Supply_Constraint:,.1f} supplied, {r.Shortfall_Surplus:+,.1f} -> {r.Action_Required}"
+        )
+    return lines
+
+
+@cache.cached("context.movers")
+def movers_summary(top_n: int = TOP_N) -> list[str]:
+    """Items with the largest unit-sales change between the last two months."""
+    counts = datasets.monthly_item_counts()
+    if counts.shape[1] < 2:
+        return []
+    prev, last = counts.columns[-2], counts.columns[-1]
+    change = (counts[last] - counts[prev]).sort_values(key=np.abs, ascending=False)
+    lines = [f"Biggest menu item movers, {prev} -> {last} (units sold):"]
+    for item, delta in change.head(top_n).items():
+        lines.append(f"- {item}: {counts.at[item, prev]:,.0f} -> {counts.at[item, last]:,.0f} ({delta:+,.0f})")
+    return lines
+
+
+@cache.cached("context.income")
+def income_summary(top_n: int = TOP_N) -> list[str]:
+    """Top categories by income in the latest month, with the change from the month before."""
+    income = cube.load_cube().query("category", "amount")
+    last = income.columns[-1]
+    prev = income.columns[-2] if income.shape[1] > 1 else None
+    lines = [f"Category income for {last} (total ${income[last].sum():,.0f}):"]
+    for category, amount in income[last].sort_values(ascending=False).head(top_n).items():
+        change = f", {amount - income.at[category, prev]:+,.0f} vs {prev}" if prev else ""
+        lines.append(f"- {category}: ${amount:,.0f}{change}")
+    return lines
+
+
+def summaries() -> dict[str, list[str]]:
+    return {
+        "supply": supply_summary(artifacts.version()),
+        "movers": movers_summary(),
+        "income": income_summary(),
+    }
+
+
+# ---------- Prompt ----------
+def rank_sections(question: str) -> list[str]:
+    """Section names, most relevant to ``question`` first (ties keep KEYWORDS order)."""
+    text = question.lower()
+    hits = {name: len(re.findall(pattern, text)) for name, pattern in KEYWORDS.items()}
+    return sorted(KEYWORDS, key=lambda name: -hits[name])
+
+
+def build_context(question: str, budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Summary lines for ``question`` within ``budget`` tokens.
+
+    Sections are filled in relevance order; a section's header is only
+    added together with at least one of its lines.
+    """
+    sections = summaries()
+    out, used = [], 0
+    for name in rank_sections(question):
+        lines = sections[name]
+        if len(lines) < 2:
+            continue
+        header, body = lines[0], lines[1:]
+        cost = estimate_tokens(header) + 1
+        taken = []
+        for line in body:
+            line_cost = estimate_tokens(line) + 1
+            if used + cost + line_cost > budget:
+                break
+            taken.append(line)
+            cost += line_cost
+        if taken:
+            out.extend([header, *taken])
+            used += cost
+    return "\n".join(out)
+
+
+def grounded_prompt(question: str, budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """``question`` preceded by the preamble and the budgeted data context."""
+    context = build_context(question, budget)
+    if not context:
+        return question
+    return f"{PREAMBLE}\n\nData:\n{context}\n\nQuestion: {question}"
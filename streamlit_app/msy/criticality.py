@@ -0,0 +1,108 @@
+# msy/criticality.py
+"""Ingredient criticality on the item-ingredient network.
+
+All measures come from sparse matrix products over every month at once::
+
+    R  items x recipes       (1 where a sold item resolves to a recipe row)
+    Q  recipes x ingredients (grams, or counts, per serving)
+    B  = R @ (Q > 0)          items x ingredients biadjacency
+
+    grams sold (weighted degree) = Q.T @ R.T @ counts     ingredients x months
+    revenue at risk              = B.T @ amount           ingredients x months
+    items served                 = B.T @ (counts > 0)     ingredients x months
+
+Revenue at risk is what the menu items containing an ingredient took in:
+the sales lost if that ingredient ran out. Shared-ingredient clusters are
+Louvain communities of the networkx ingredient projection ``B.T @ diag(rev) @ B``.
+"""
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from msy import cache, cube, network, resolve
+
+RANK_COLUMNS = [
+    "Ingredient", "Items Using", "Grams Sold", "Revenue at Risk ($)", "Revenue Share (%)",
+    "Cluster", "Criticality",
+]
+
+
+def _matrices(months=None):
+    """Sparse R, B, Q and the resolved items' count / dollar arrays (items x ``months``)."""
+    c = cube.load_cube()
+    qty, ingredients = network.recipe_grams()
+    counts = c.query("item", "count", months)
+    amount = c.query("item", "amount", months)
+    names = counts.index
+
+    index = resolve.resolve_items(names)
+    index = index[index["score"] >= resolve.MIN_SCORE].set_index("raw_name")["recipe_id"]
+    recipe_id = pd.Series(names).map(index).to_numpy()
+    keep = ~pd.isna(recipe_id)
+    rid = recipe_id[keep].astype(int)
+
+    R = sparse.csr_matrix((np.ones(len(rid)), (np.arange(len(rid)), rid)), shape=(len(rid), qty.shape[0]))
+    Q = sparse.csr_matrix(qty)
+    B = (R @ (Q > 0).astype(float)).tocsr()
+    return R, B, Q, counts.to_numpy()[keep], amount.to_numpy()[keep], list(counts.columns), ingredients
+
+
+@cache.cached("criticality.by_month")
+def by_month() -> pd.DataFrame:
+    """Long Month / Ingredient table of grams sold, revenue at risk and items served."""
+    R, B, Q, counts, amount, months, ingredients = _matrices()
+    grams = Q.T @ (R.T @ counts)
+    at_risk = B.T @ amount
+    served = B.T @ (counts > 0).astype(float)
+
+    shape = (len(ingredients), len(months))
+    out = pd.DataFrame({
+        "Month": np.tile(months, len(ingredients)),
+        "Ingredient": np.repeat(ingredients, len(months)),
+        "Items Using": np.asarray(served).reshape(shape).ravel().astype(int),
+        "Grams Sold": np.asarray(grams).reshape(shape).ravel(),
+        "Revenue at Risk ($)": np.asarray(at_risk).reshape(shape).ravel(),
+    })
+    # share of everything sold that month, matched or not
+    month_total = cube.load_cube().query("item", "amount").sum(axis=0)
+    out["Revenue Share (%)"] = 100 * out["Revenue at Risk ($)"] / out["Month"].map(month_total).replace(0, np.nan)
+    return out
+
+
+@cache.cached("criticality.clusters")
+def clusters(months=None) -> pd.Series:
+    """Ingredient -> shared-ingredient cluster (1 = the cluster with the most revenue)."""
+    R, B, Q, counts, amount, _, ingredients = _matrices(months)
+    revenue = amount.sum(axis=1)
+
+    shared = (B.T @ sparse.diags(revenue) @ B).tocoo()
+    G = nx.Graph()
+    G.add_nodes_from(ingredients)
+    G.add_weighted_edges_from(
+        (ingredients[i], ingredients[j], w) for i, j, w in zip(shared.row, shared.col, shared.data) if i < j and w > 0
+    )
+    communities = nx.community.louvain_communities(G, weight="weight", seed=0)
+    strength = dict(G.degree(weight="weight"))
+    communities = sorted(communities, key=lambda comm: -sum(strength[n] for n in comm))
+    return pd.Series({ing: k + 1 for k, comm in enumerate(communities) for ing in comm}, name="Cluster")
+
+
+def ranking(months=None) -> pd.DataFrame:
+    """Ingredients ranked by criticality over ``months`` (cube selection; all when None).
+
+    ``Criticality`` averages the percentile ranks of revenue at risk and the
+    number of items using the ingredient; grams sold mixes grams with counts
+    (eggs, wings, ramen) so it is reported but left out of the score.
+    """
+    df = by_month()
+    selected = cube.load_cube().query("item", "count", months).columns
+    df = df[df["Month"].isin(selected)]
+    agg = df.groupby("Ingredient", as_index=False).agg({
+        "Items Using": "max", "Grams Sold": "sum", "Revenue at Risk ($)": "sum",
+    })
+    total = cube.load_cube().query("item", "amount", months).to_numpy().sum()
+    agg["Revenue Share (%)"] = 100 * agg["Revenue at Risk ($)"] / total if total else np.nan
+    agg["Cluster"] = agg["Ingredient"].map(clusters(months))
+    agg["Criticality"] = agg[["Revenue at Risk ($)", "Items Using"]].rank(pct=True).mean(axis=1)
+    return agg.sort_values(["Criticality", "Revenue at Risk ($)"], ascending=False)[RANK_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,145 @@
+# msy/cube.py
+"""Pre-aggregated month cube over the store's group, category and item tables.
+
+For every dimension the cube holds dense ``(members x months)`` arrays of
+unit counts and amount cents, built once per :func:`msy.store.data_version`
+and saved next to the ingested tables as ``.msy_cache/cube/<version>.npz``.
+Months are kept in calendar order, so a month range is an array slice;
+page interactions (range sliders, category pickers) are served by
+:meth:`Cube.query` without touching the raw rows.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from msy import money, store
+
+# cube dimension -> store table
+DIMENSIONS = {"group": "groups", "category": "categories", "item": "items"}
+MEASURES = ("count", "amount")
+
+_loaded: dict[str, "Cube"] = {}
+
+
+class Cube:
+    """Count and amount-cents arrays per dimension, indexed by member and month."""
+
+    def __init__(self, months: list[str], members: dict[str, list[str]],
+                 counts: dict[str, np.ndarray], cents: dict[str, np.ndarray]):
+        self.months = list(months)
+        self.members = {dim: list(names) for dim, names in members.items()}
+        self.counts = counts
+        self.cents = cents
+        self._month_pos = {m: i for i, m in enumerate(self.months)}
+        self._member_pos = {dim: {m: i for i, m in enumerate(names)} for dim, names in self.members.items()}
+
+    @classmethod
+    def build(cls, data_dir: Path = store.DATA_DIR, cache_dir: Path = store.CACHE_DIR) -> "Cube":
+        """Aggregate the store's tables (one pass over the raw rows per dimension)."""
+        months = store.months(data_dir)
+        members, counts, cents = {}, {}, {}
+        for dim, table in DIMENSIONS.items():
+            key = store.TABLE_KEYS[table]
+            rows = store.load_table(table, data_dir=data_dir, cache_dir=cache_dir)
+            names, member_idx = np.unique(rows[key].to_numpy(dtype=str), return_inverse=True)
+            month_idx = pd.Categorical(rows["Month"], categories=months).codes
+            shape = (len(names), len(months))
+            c = np.zeros(shape)
+            a = np.zeros(shape, dtype=np.int64)
+            np.add.at(c, (member_idx, month_idx), rows["Count"].to_numpy(dtype=float))
+            np.add.at(a, (member_idx, month_idx), rows["Amount_Cents"].to_numpy(dtype=np.int64))
+            members[dim], counts[dim], cents[dim] = names.tolist(), c, a
+        return cls(months, members, counts, cents)
+
+    def save(self, path: Path) -> None:
+        arrays = {"months": np.array(self.months, dtype=str)}
+        for dim in self.members:
+            arrays[f"{dim}_members"] = np.array(self.members[dim], dtype=str)
+            arrays[f"{dim}_count"] = self.counts[dim]
+            arrays[f"{dim}_cents"] = self.cents[dim]
+        def write(tmp: Path) -> None:
+            with open(tmp, "wb") as f:  # a file object: np.savez would append ".npz" to a path
+                np.savez(f, **arrays)
+
+        store.atomic_write(Path(path), write)
+
+    @classmethod
+    def read(cls, path: Path) -> "Cube":
+        with np.load(path) as z:
+            dims = [k[:-len("_members")] for k in z.files if k.endswith("_members")]
+            return cls(
+                z["months"].tolist(),
+                {d: z[f"{d}_members"].tolist() for d in dims},
+                {d: z[f"{d}_count"] for d in dims},
+                {d: z[f"{d}_cents"] for d in dims},
+            )
+
+    # ---------- queries ----------
+    def month_range(self, start: str, end: str) -> list[str]:
+        """Months from ``start`` to ``end`` inclusive (either order)."""
+        lo, hi = sorted((self._month_pos[start], self._month_pos[end]))
+        return self.months[lo:hi + 1]
+
+    def _month_index(self, months) -> slice | list[int]:
+        if months is None:
+            return slice(None)
+        if isinstance(months, tuple):  # (start, end) range -> contiguous slice
+            lo, hi = sorted((self._month_pos[months[0]], self._month_pos[months[1]]))
+            return slice(lo, hi + 1)
+        return [self._month_pos[m] for m in months if m in self._month_pos]
+
+    def query(self, dim: str, measure: str = "amount", months=None,
+              members: list[str] | None = None) -> pd.DataFrame:
+        """Members x months table of ``measure`` (amount in dollars).
+
+        ``months`` is None (all), a ``(start, end)`` tuple or a list of labels;
+        ``members`` restricts and orders the rows (unknown members give zeros).
+        """
+        if dim not in self.members:
+            raise ValueError(f"Unknown cube dimension {dim!r}; expected one of {list(self.members)}")
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure {measure!r}; expected one of {list(MEASURES)}")
+        cols = self._month_index(months)
+        month_labels = np.array(self.months)[cols].tolist()
+        values = self.counts[dim] if measure == "count" else money.to_dollars(self.cents[dim])
+
+        if members is None:
+            data, index = values[:, cols], self.members[dim]
+        else:
+            pos = self._member_pos[dim]
+            rows = np.array([pos.get(m, -1) for m in members], dtype=int)
+            data = np.where((rows >= 0)[:, None], values[rows.clip(0)][:, cols], 0)
+            index = list(members)
+        return pd.DataFrame(data, index=pd.Index(index, name=dim), columns=pd.Index(month_labels, name="Month"))
+
+    def long(self, dim: str, months=None, members: list[str] | None = None) -> pd.DataFrame:
+        """Month / member / Count / Amount rows for the selection (zero cells dropped)."""
+        count = self.query(dim, "count", months, members).stack()
+        amount = self.query(dim, "amount", months, members).stack()
+        out = pd.DataFrame({"Count": count, "Amount": amount}).reset_index()
+        out = out[(out["Count"] != 0) | (out["Amount"] != 0)]
+        return out[["Month", dim, "Count", "Amount"]].reset_index(drop=True)
+
+
+def load_cube(version: str | None = None, data_dir: Path = store.DATA_DIR,
+              cache_dir: Path = store.CACHE_DIR) -> Cube:
+    """Cube for the current data version: memory, then disk, then a fresh build."""
+    version = version or store.data_version(data_dir, cache_dir)
+    if version in _loaded:
+        return _loaded[version]
+
+    cube_dir = Path(cache_dir) / "cube"
+    path = cube_dir / f"{version}.npz"
+    if path.exists():
+        cube = Cube.read(path)
+    else:
+        cube = Cube.build(data_dir, cache_dir)
+        cube_dir.mkdir(parents=True, exist_ok=True)
+        cube.save(path)
+        for old in cube_dir.glob("*.npz"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    _loaded.clear()
+    _loaded[version] = cube
+    return cube
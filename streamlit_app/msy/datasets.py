@@ -0,0 +1,50 @@
+# msy/datasets.py
+"""Derived datasets served to the dashboard pages.
+
+Every loader is a :func:`msy.cache.cached` function, so the pages and
+``python -m msy precompute`` share one definition and one cache entry: once
+the precompute command has run, a page only unpickles a prebuilt result.
+"""
+import pandas as pd
+
+from msy import attribution, cache, constraints, cube, recipes, store, usage
+
+# fallback when the shipment schedule is exported from Excel
+SHIPMENT_XLSX_PATH = constraints.SHIPMENT_PATH.with_suffix(".xlsx")
+
+
+@cache.cached("datasets.ingredient_usage")
+def ingredient_usage(months: list[str] | None = None) -> pd.DataFrame:
+    """Ingredient x month usage in lbs (counts for count ingredients)."""
+    return usage.usage(months, unit="lbs")
+
+
+@cache.cached("datasets.monthly_item_counts")
+def monthly_item_counts() -> pd.DataFrame:
+    """Item x month unit counts; item names that only differ in case are merged."""
+    counts = cube.load_cube().query("item", "count")
+    return counts.groupby(counts.index.str.lower()).sum()
+
+
+@cache.cached("datasets.item_sales")
+def item_sales() -> pd.DataFrame:
+    """Item sales of every month, without zero-amount rows."""
+    df = store.load_table("items")
+    df = df[df["Amount"].notna() & (df["Amount"] != 0)]
+    return df[["Item Name", "Amount", "Month"]].reset_index(drop=True)
+
+
+@cache.cached("datasets.ingredient_profit")
+def ingredient_profit() -> tuple[pd.DataFrame, pd.Series]:
+    """Months x ingredients revenue attribution and monthly revenue totals."""
+    return attribution.ingredient_profit(item_sales(), recipes.load_recipes())
+
+
+@cache.cached("datasets.shipments", sources=[constraints.SHIPMENT_PATH, SHIPMENT_XLSX_PATH])
+def shipments() -> pd.DataFrame | None:
+    """The shipment schedule as exported (CSV, or the Excel file); None if missing."""
+    if constraints.SHIPMENT_PATH.exists():
+        return pd.read_csv(constraints.SHIPMENT_PATH)
+    if SHIPMENT_XLSX_PATH.exists():
+        return pd.read_excel(SHIPMENT_XLSX_PATH, engine="openpyxl")
+    return None
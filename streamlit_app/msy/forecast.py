@@ -0,0 +1,332 @@
+# msy/forecast.py
+"""Pluggable ingredient forecasting backends.
+
+All backends implement :class:`Forecaster` and take long ``history`` rows
+(Ingredient, ds, y) to return fitted + future rows with ``yhat`` and an 80%
+interval (``yhat_lower``/``yhat_upper``, Prophet's default width):
+
+* ``prophet`` -- one Prophet model per ingredient (slow, nightly batch jobs)
+* ``holt`` -- Holt linear-trend exponential smoothing, all ingredients at once
+* ``linear`` -- least-squares linear trend, all ingredients at once
+* ``seasonal_naive`` -- last year's value (last value until a year of history)
+
+The array backends forecast every ingredient as one NumPy operation and run
+in milliseconds, which is what the dashboard uses; its default is the most
+accurate of them in the rolling-origin backtest (:mod:`msy.backtest`,
+``python -m benchmarks.bench_forecast``). ``FORECAST_BACKEND`` and
+``DASHBOARD_BACKEND`` pick the backend for batch jobs and for pages; both
+can be overridden with the ``MSY_FORECAST_BACKEND`` and
+``MSY_DASHBOARD_FORECAST_BACKEND`` environment variables.
+
+Prophet runner
+--------------
+Each series is fitted in a process pool. The fitted model (Prophet JSON) and
+its predictions are stored under ``.msy_cache/prophet``, keyed by a hash of
+the series history and the hyperparameters, so a nightly refresh only pays
+for the ingredients whose data changed.
+"""
+import abc
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from msy import store
+
+FORECAST_BACKEND = os.environ.get("MSY_FORECAST_BACKEND", "prophet")
+DASHBOARD_BACKEND = os.environ.get("MSY_DASHBOARD_FORECAST_BACKEND", "seasonal_naive")
+
+PROPHET_CACHE_DIR = store.CACHE_DIR / "prophet"
+
+DEFAULT_PARAMS = {
+    "changepoint_prior_scale": 0.01,
+    "clip_factor": 5.0,
+}
+
+FORECAST_COLUMNS = ["Ingredient", "ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+def series_key(series: pd.DataFrame, params: dict) -> str:
+    """Hash of one series' ``ds``/``y`` values plus the fit hyperparameters."""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(series[["ds", "y"]], index=False).to_numpy().tobytes())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _prepare(group: pd.DataFrame, clip_factor: float) -> pd.DataFrame:
+    df = group[["ds", "y"]].sort_values("ds").reset_index(drop=True)
+    df["y"] = df["y"].clip(0, df["y"].mean() * clip_factor)
+    return df
+
+
+def _fit(df: pd.DataFrame, params: dict) -> str:
+    """Fit one Prophet model and return it as JSON (runs in a worker process)."""
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    model = Prophet(**{k: v for k, v in params.items() if k != "clip_factor"})
+    model.fit(df)
+    return model_to_json(model)
+
+
+def _predict(model_json: str, periods: int) -> pd.DataFrame:
+    from prophet.serialize import model_from_json
+
+    model = model_from_json(model_json)
+    future = model.make_future_dataframe(periods=periods, freq="MS")
+    return model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+
+def _load_model(cache_dir: Path, key: str) -> str | None:
+    try:
+        return (Path(cache_dir) / f"{key}.json").read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _save_model(cache_dir: Path, key: str, model_json: str) -> None:
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    store.atomic_write(Path(cache_dir) / f"{key}.json", lambda tmp: tmp.write_text(model_json))
+
+
+def run_prophet(history: pd.DataFrame, periods: int = 3, params: dict | None = None,
+                workers: int | None = None, min_points: int = 3,
+                cache_dir: Path = PROPHET_CACHE_DIR) -> pd.DataFrame:
+    """Forecast every ingredient in ``history`` (columns Ingredient, ds, y).
+
+    Returns history and ``periods`` future months per ingredient with
+    ``yhat``/``yhat_lower``/``yhat_upper``. ``workers`` is the process pool
+    size (``None`` = CPU count, ``1`` = fit in-process). Results are
+    reproducible: a cached model's forecast is reused as long as its history
+    and hyperparameters are unchanged.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+
+    series, models, to_fit = {}, {}, {}
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    for ingredient, group in history.groupby("Ingredient", sort=True):
+        if len(group) < min_points:
+            continue
+        df = _prepare(group, params["clip_factor"])
+        key = series_key(df, params)
+        series[ingredient] = key
+        cached = _load_model(cache_dir, key)
+        if cached is not None:
+            models[ingredient] = cached
+        else:
+            to_fit[ingredient] = df
+
+    if to_fit:
+        names = list(to_fit)
+        if workers == 1 or len(names) == 1:
+            fitted = [_fit(to_fit[n], params) for n in names]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fitted = list(pool.map(_fit, [to_fit[n] for n in names], [params] * len(names)))
+        for name, model_json in zip(names, fitted):
+            _save_model(cache_dir, series[name], model_json)
+            models[name] = model_json
+
+    frames = []
+    for name, key in series.items():
+        # predict() samples uncertainty intervals, so its output is cached too
+        path = Path(cache_dir) / f"{key}_{periods}.parquet"
+        if name not in to_fit and path.exists():
+            predicted = pd.read_parquet(path)
+        else:
+            predicted = _predict(models[name], periods)
+            store.atomic_write(path, lambda tmp: predicted.to_parquet(tmp, index=False))
+        frames.append(predicted.assign(Ingredient=name))
+    if not frames:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[FORECAST_COLUMNS]
+
+
+# ---------- Pluggable backends ----------
+Z_80 = 1.2815515655446004  # two-sided 80% interval, Prophet's default width
+
+
+class Forecaster(abc.ABC):
+    """Forecast many ingredient series; subclasses set ``name`` and ``default_params``."""
+
+    name = ""
+    default_params: dict = {"clip_factor": DEFAULT_PARAMS["clip_factor"]}
+
+    def __init__(self, workers: int | None = None, **params):
+        self.params = {**self.default_params, **params}
+        self.workers = workers  # process pool size, for backends that fit per series
+
+    @abc.abstractmethod
+    def forecast(self, history: pd.DataFrame, periods: int = 3) -> pd.DataFrame:
+        """History (Ingredient, ds, y) -> fitted and future FORECAST_COLUMNS rows."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.params})"
+
+
+class ProphetForecaster(Forecaster):
+    name = "prophet"
+    default_params = {**DEFAULT_PARAMS}
+
+    def __init__(self, workers: int | None = None, cache_dir: Path = PROPHET_CACHE_DIR, **params):
+        super().__init__(workers, **params)
+        self.cache_dir = cache_dir
+
+    def forecast(self, history: pd.DataFrame, periods: int = 3) -> pd.DataFrame:
+        return run_prophet(history, periods, self.params, workers=self.workers, cache_dir=self.cache_dir)
+
+
+class ArrayForecaster(Forecaster):
+    """Backends that forecast an (ingredients x months) array in one go."""
+
+    min_points = 3
+
+    @abc.abstractmethod
+    def predict_array(self, y: np.ndarray, periods: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``yhat`` and interval half-width, both (n_series, n_months + periods)."""
+
+    def forecast(self, history: pd.DataFrame, periods: int = 3) -> pd.DataFrame:
+        wide = history.pivot_table(index="Ingredient", columns="ds", values="y", aggfunc="sum")
+        wide = wide.sort_index(axis=1)
+        wide = wide[wide.notna().sum(axis=1) >= self.min_points].fillna(0.0)
+        if wide.empty:
+            return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+        y = wide.to_numpy(dtype=float)
+        cap = y.mean(axis=1, keepdims=True) * self.params["clip_factor"]
+        y = np.clip(y, 0, cap)
+
+        yhat, half = self.predict_array(y, periods)
+        yhat = np.maximum(yhat, 0.0)
+        lower = np.maximum(yhat - half, 0.0)
+        upper = yhat + half
+
+        last = wide.columns[-1]
+        dates = list(wide.columns) + list(pd.date_range(last, periods=periods + 1, freq="MS")[1:])
+        n, t = yhat.shape
+        return pd.DataFrame({
+            "Ingredient": np.repeat(wide.index.to_numpy(), t),
+            "ds": np.tile(pd.DatetimeIndex(dates).to_numpy(), n),
+            "yhat": yhat.ravel(),
+            "yhat_lower": lower.ravel(),
+            "yhat_upper": upper.ravel(),
+        })[FORECAST_COLUMNS]
+
+
+class HoltForecaster(ArrayForecaster):
+    """Holt's linear trend; alpha/beta picked per series from a small grid by one-step SSE."""
+
+    name = "holt"
+    default_params = {
+        "clip_factor": DEFAULT_PARAMS["clip_factor"],
+        "alphas": (0.2, 0.4, 0.6, 0.8),
+        "betas": (0.05, 0.1, 0.2, 0.4),
+        "damping": 0.9,
+        "init_points": 12,
+    }
+
+    def predict_array(self, y, periods):
+        n, t = y.shape
+        grid = np.array([(a, b) for a in self.params["alphas"] for b in self.params["betas"]])
+        alpha = grid[:, 0][:, None]  # (grid, 1) broadcasts over series
+        beta = grid[:, 1][:, None]
+        phi = self.params["damping"]
+
+        # start from a least-squares line over the first season rather than the first two points,
+        # which a single noisy month can send the wrong way for the whole fit
+        k = min(t, self.params["init_points"])
+        x = np.arange(k, dtype=float) - (k - 1) / 2
+        slope = (y[:, :k] - y[:, :k].mean(axis=1, keepdims=True)) @ x / (x @ x)
+        start = y[:, :k].mean(axis=1) - slope * (k - 1) / 2
+
+        level = np.broadcast_to(start, (len(grid), n)).copy()
+        trend = np.broadcast_to(slope, (len(grid), n)).copy()
+        fitted = np.empty((len(grid), n, t))
+        fitted[:, :, 0] = start
+        for i in range(1, t):
+            pred = level + phi * trend
+            fitted[:, :, i] = pred
+            new_level = alpha * y[:, i] + (1 - alpha) * pred
+            trend = beta * (new_level - level) + (1 - beta) * phi * trend
+            level = new_level
+
+        sse = ((fitted[:, :, 1:] - y[None, :, 1:]) ** 2).sum(axis=2)
+        best = sse.argmin(axis=0)
+        cols = np.arange(n)
+        a, b = grid[best, 0], grid[best, 1]
+        level, trend, fitted = level[best, cols], trend[best, cols], fitted[best, cols]
+        sigma = np.sqrt(sse[best, cols] / max(t - 1, 1))
+
+        h = np.arange(1, periods + 1)
+        damp = np.cumsum(phi ** h)  # phi + phi^2 + ... + phi^h
+        future = level[:, None] + damp[None, :] * trend[:, None]
+        # h-step variance factor of Holt's method: 1 + sum_{j<h} (alpha (1 + j beta))^2
+        j = np.arange(periods)
+        steps = (a[:, None] * (1 + j[None, :] * b[:, None])) ** 2
+        steps[:, 0] = 0.0
+        var_factor = 1 + np.cumsum(steps, axis=1)
+
+        yhat = np.concatenate([fitted, future], axis=1)
+        half = Z_80 * sigma[:, None] * np.concatenate([np.ones((n, t)), np.sqrt(var_factor)], axis=1)
+        return yhat, half
+
+
+class LinearTrendForecaster(ArrayForecaster):
+    """Ordinary least-squares line per series with prediction intervals."""
+
+    name = "linear"
+
+    def predict_array(self, y, periods):
+        n, t = y.shape
+        x = np.arange(t, dtype=float)
+        xbar = x.mean()
+        sxx = ((x - xbar) ** 2).sum()
+        slope = ((x - xbar) * (y - y.mean(axis=1, keepdims=True))).sum(axis=1) / sxx
+        intercept = y.mean(axis=1) - slope * xbar
+
+        xs = np.arange(t + periods, dtype=float)
+        yhat = intercept[:, None] + slope[:, None] * xs[None, :]
+        resid = y - yhat[:, :t]
+        sigma = np.sqrt((resid ** 2).sum(axis=1) / max(t - 2, 1))
+        se = np.sqrt(1 + 1 / t + (xs - xbar) ** 2 / sxx)
+        return yhat, Z_80 * sigma[:, None] * se[None, :]
+
+
+class SeasonalNaiveForecaster(ArrayForecaster):
+    """Same month last year; the last observed value until a full season exists."""
+
+    name = "seasonal_naive"
+    default_params = {"clip_factor": DEFAULT_PARAMS["clip_factor"], "season_length": 12}
+    min_points = 2
+
+    def predict_array(self, y, periods):
+        n, t = y.shape
+        m = self.params["season_length"] if t > self.params["season_length"] else 1
+        fitted = np.concatenate([y[:, :m], y[:, :-m]], axis=1)
+        future = np.tile(y[:, -m:], (1, -(-periods // m)))[:, :periods]
+        resid = (y - fitted)[:, m:]
+        sigma = np.sqrt((resid ** 2).mean(axis=1))
+        seasons = np.arange(periods) // m + 1
+        half = Z_80 * sigma[:, None] * np.concatenate([np.ones((n, t)), np.sqrt(seasons)[None, :].repeat(n, 0)], axis=1)
+        return np.concatenate([fitted, future], axis=1), half
+
+
+BACKENDS = {
+    cls.name: cls
+    for cls in (ProphetForecaster, HoltForecaster, LinearTrendForecaster, SeasonalNaiveForecaster)
+}
+
+
+def get_forecaster(name: str | None = None, **params) -> Forecaster:
+    """Instantiate a backend by name (``FORECAST_BACKEND`` when None)."""
+    name = name or FORECAST_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown forecast backend {name!r}; expected one of {list(BACKENDS)}")
+    return BACKENDS[name](**params)
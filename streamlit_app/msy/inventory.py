@@ -0,0 +1,122 @@
+# msy/inventory.py
+"""Day- or week-step inventory simulation against the delivery calendar.
+
+Monthly demand (the constraint table's ``Forecast_LBS_or_Count``) is spread
+evenly over the days of each month and deliveries come from
+:mod:`msy.shipments`, so every ingredient is an array over the same steps.
+On-hand stock with lost sales is the net flow reflected at zero::
+
+    x        = start + cumsum(supply - demand)        ingredients x steps
+    unmet    = max(0, -running_min(x))                 demand that could not be served
+    on_hand  = x + unmet
+
+so a whole horizon for all ingredients is a handful of NumPy operations.
+Deliveries land before the day's demand is served.
+"""
+import numpy as np
+import pandas as pd
+
+from msy import artifacts, constraints, shipments
+from msy import recipes as rec
+
+STEPS = ("day", "week")
+DEFAULT_COVER_DAYS = 7
+
+REPORT_COLUMNS = [
+    "Ingredient", "Unit", "Start On Hand", "Min On Hand", "First Stockout", "Stockout Steps",
+    "Unmet Demand", "End On Hand",
+]
+
+
+def monthly_demand(table: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Ingredient x month start demand in lbs (counts) from the constraint table.
+
+    Defaults to the latest forecast artifacts: fitted values for history
+    months, forecasts after that.
+    """
+    table = artifacts.load_latest() if table is None else table
+    wide = table.pivot_table(index="Ingredient", columns="Date", values="Forecast_LBS_or_Count", aggfunc="sum")
+    wide.columns = pd.DatetimeIndex(wide.columns)
+    return wide.clip(lower=0).fillna(0.0)
+
+
+def daily_demand(monthly: pd.DataFrame, start, end) -> pd.DataFrame:
+    """``monthly`` spread evenly over the days between ``start`` and ``end``.
+
+    Days in months missing from ``monthly`` get no demand.
+    """
+    days = pd.date_range(start, end, freq="D")
+    month = shipments.period_start(days, "month")
+    cols = monthly.columns.get_indexer(month)
+    per_day = monthly.to_numpy() / np.asarray(monthly.columns.days_in_month)[None, :]
+    values = np.where(cols >= 0, per_day[:, cols.clip(0)], 0.0)
+    return pd.DataFrame(values, index=monthly.index, columns=days)
+
+
+def simulate(demand: np.ndarray, supply: np.ndarray, start: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """On-hand stock and cumulative unmet demand (both ingredients x steps)."""
+    x = start[:, None] + np.cumsum(supply - demand, axis=1)
+    unmet = np.maximum(0.0, -np.minimum.accumulate(x, axis=1))
+    return x + unmet, unmet
+
+
+def _by_week(daily: pd.DataFrame) -> pd.DataFrame:
+    weeks = shipments.period_start(daily.columns, "week")
+    return daily.T.groupby(weeks).sum().T
+
+
+def run(start, end, step: str = "day", cover_days: float = DEFAULT_COVER_DAYS,
+        table: pd.DataFrame | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Simulate every ingredient with a shipment line from ``start`` to ``end``.
+
+    Stock starts at ``cover_days`` of the first days' demand. Returns the
+    long on-hand levels (Ingredient / Date / Demand / Supply / On Hand /
+    Unmet) and one ``REPORT_COLUMNS`` row per ingredient, earliest stockout
+    first.
+    """
+    if step not in STEPS:
+        raise ValueError(f"Unknown step {step!r}; expected one of {list(STEPS)}")
+    demand = daily_demand(monthly_demand(table), start, end)
+    supply = shipments.supply(start, end, "day", "lbs")
+    ingredients = [ing for ing in supply.index if ing in demand.index]
+    demand, supply = demand.loc[ingredients], supply.loc[ingredients, demand.columns]
+
+    cover = int(np.ceil(cover_days))
+    opening = demand.to_numpy()[:, :cover].sum(axis=1) * (cover_days / cover if cover else 0.0)
+    if step == "week":
+        demand, supply = _by_week(demand), _by_week(supply)
+
+    on_hand, unmet = simulate(demand.to_numpy(), supply.to_numpy(), opening)
+    dates = demand.columns
+
+    short = np.diff(unmet, axis=1, prepend=0.0) > 1e-9
+    first = np.where(short.any(axis=1), short.argmax(axis=1), -1)
+    report = pd.DataFrame({
+        "Ingredient": ingredients,
+        "Unit": [rec.unit_label(ing, "lbs") for ing in ingredients],
+        "Start On Hand": opening,
+        "Min On Hand": on_hand.min(axis=1),
+        "First Stockout": pd.Series(dates[first.clip(0)]).where(first >= 0).to_numpy(),
+        "Stockout Steps": short.sum(axis=1),
+        "Unmet Demand": unmet[:, -1],
+        "End On Hand": on_hand[:, -1],
+    })
+    report = report.sort_values(["First Stockout", "Unmet Demand"], ascending=[True, False], na_position="last")
+
+    shape = len(ingredients) * len(dates)
+    levels = pd.DataFrame({
+        "Ingredient": np.repeat(ingredients, len(dates)),
+        "Date": np.tile(dates, len(ingredients)),
+        "Demand": demand.to_numpy().reshape(shape),
+        "Supply": supply.to_numpy().reshape(shape),
+        "On Hand": on_hand.reshape(shape),
+        "Unmet": unmet.reshape(shape),
+    })
+    return levels, report[REPORT_COLUMNS].reset_index(drop=True)
+
+
+def forecast_window(table: pd.DataFrame | None = None) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """First and last day of the forecast (non-historical) months of the constraint table."""
+    table = artifacts.load_latest() if table is None else table
+    future = pd.to_datetime(table.loc[table["Action_Required"] != constraints.HISTORICAL, "Date"])
+    return future.min(), future.max() + pd.offsets.MonthEnd(0)
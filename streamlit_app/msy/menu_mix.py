@@ -0,0 +1,128 @@
+# msy/menu_mix.py
+"""Menu-mix profit optimizer.
+
+Chooses servings per menu item for one month to maximize margin under the
+month's ingredient deliveries::
+
+    maximize    margin @ servings
+    subject to  usage (ingredients x items) @ servings <= supply
+                floor * baseline <= servings <= (1 + promote) * baseline
+
+Margins are the average ``Amount`` per serving (``Amount / Count``, the
+profit figure the dashboards use) less any ingredient costs passed in.
+Baselines are actual servings for history months and the servings forecast
+after that (:func:`msy.whatif.baseline`). Only ingredients with a shipment
+line are constrained.
+
+:func:`model` builds and caches the constraint matrix per month; a slider
+move only changes bounds and right-hand sides, so :func:`solve` is one
+HiGHS call on an LP with a row per supplied ingredient and a column per
+item. Its duals are the shadow prices: the margin one more lb (count) of
+an ingredient would add this month.
+"""
+import numpy as np
+import pandas as pd
+
+from msy import cache, shipments, whatif
+from msy import recipes as rec
+
+DEFAULT_PROMOTE = 0.5  # servings may grow up to 50% over the baseline
+DEFAULT_FLOOR = 0.0  # and be cut down to this share of it
+
+MIX_COLUMNS = ["Item", "Margin", "Baseline Servings", "Servings", "Change (%)", "Action", "Marginal Value"]
+SHADOW_COLUMNS = ["Ingredient", "Unit", "Supply", "Baseline Usage", "Usage", "Slack", "Shadow Price"]
+
+
+@cache.cached("menu_mix.model")
+def model(date, periods: int = whatif.DEFAULT_PERIODS) -> dict:
+    """Items, baseline servings, price per serving, usage matrix and supply for the month at ``date``."""
+    base = whatif.baseline(periods)
+    date = pd.Timestamp(date)
+    recipes = rec.load_recipes()
+    supply = shipments.supply(date, date + pd.offsets.MonthEnd(0), "month", "lbs", recipes=recipes).iloc[:, 0]
+    names = rec.ingredient_names(recipes)
+    cols = [names.index(ing) for ing in supply.index]
+    servings = base["servings"][date]
+    return {
+        "items": list(servings.index),
+        "servings": servings.to_numpy(dtype=float),
+        "price": base["price"].reindex(servings.index).fillna(0.0).to_numpy(dtype=float),
+        "usage": rec.recipe_matrix(recipes, unit="lbs")[:, cols].T,  # ingredients x items
+        "ingredients": list(supply.index),
+        "supply": supply.to_numpy(dtype=float),
+    }
+
+
+def margins(m: dict, ingredient_costs: dict[str, float] | None = None) -> np.ndarray:
+    """Price per serving less the cost of the constrained ingredients in it ($ per lb or count)."""
+    if not ingredient_costs:
+        return m["price"]
+    unknown = set(ingredient_costs) - set(m["ingredients"])
+    if unknown:
+        raise ValueError(f"Unknown ingredient {sorted(unknown)}; expected one of {m['ingredients']}")
+    cost = np.array([ingredient_costs.get(ing, 0.0) for ing in m["ingredients"]])
+    return m["price"] - cost @ m["usage"]
+
+
+def solve(m: dict, promote: float = DEFAULT_PROMOTE, floor: float = DEFAULT_FLOOR, supply_scale: float = 1.0,
+          ingredient_costs: dict[str, float] | None = None) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """Most profitable servings between ``floor`` and ``1 + promote`` x the baseline.
+
+    Supply is ``supply_scale`` x the month's deliveries. When even the floor
+    overruns supply the floor is returned with ``feasible`` False and no
+    shadow prices.
+
+    Returns the mix (``MIX_COLUMNS``, one row per item), the ingredients
+    (``SHADOW_COLUMNS``) and a summary with baseline and optimal margin.
+    ``Marginal Value`` is the margin one more serving of headroom on an
+    item's bound would add; ``Shadow Price`` the margin per extra lb
+    (count) of supply.
+    """
+    from scipy.optimize import linprog
+
+    margin = margins(m, ingredient_costs)
+    baseline = m["servings"]
+    bounds = np.column_stack([baseline * floor, baseline * (1.0 + promote)])
+    supply = m["supply"] * supply_scale
+    res = linprog(-margin, A_ub=m["usage"], b_ub=supply, bounds=bounds, method="highs")
+    if res.status == 2:
+        servings, shadow, marginal = bounds[:, 0], np.full(len(supply), np.nan), np.zeros(len(baseline))
+    elif res.status != 0:
+        raise RuntimeError(f"Menu-mix solve failed: {res.message}")
+    else:
+        # + 0.0 turns the solver's -0.0 duals into 0.0
+        servings, shadow = res.x, -res.ineqlin.marginals + 0.0
+        marginal = -(res.lower.marginals + res.upper.marginals) + 0.0
+
+    moved = servings - baseline
+    action = np.select([moved > 1e-6 * np.maximum(baseline, 1), moved < -1e-6 * np.maximum(baseline, 1)],
+                       ["Promote", "Limit"], default="Keep")
+    mix = pd.DataFrame({
+        "Item": m["items"],
+        "Margin": margin,
+        "Baseline Servings": baseline,
+        "Servings": servings,
+        "Change (%)": np.divide(moved, baseline, out=np.zeros_like(moved), where=baseline > 0) * 100,
+        "Action": action,
+        "Marginal Value": marginal,
+    })[MIX_COLUMNS]
+
+    usage = m["usage"] @ servings
+    ingredients = pd.DataFrame({
+        "Ingredient": m["ingredients"],
+        "Unit": [rec.unit_label(ing, "lbs") for ing in m["ingredients"]],
+        "Supply": supply,
+        "Baseline Usage": m["usage"] @ baseline,
+        "Usage": usage,
+        "Slack": supply - usage,
+        "Shadow Price": shadow,
+    })[SHADOW_COLUMNS]
+    summary = {
+        "baseline_margin": float(margin @ baseline),
+        "margin": float(margin @ servings),
+        "feasible": res.status == 0,
+        "status": res.message,
+    }
+    return (mix.sort_values("Change (%)", ascending=False).reset_index(drop=True),
+            ingredients.sort_values("Shadow Price", ascending=False, na_position="last").reset_index(drop=True),
+            summary)
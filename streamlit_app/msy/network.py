@@ -0,0 +1,122 @@
+# msy/network.py
+"""Menu item -> ingredient network.
+
+Edges come straight from the recipe matrix: one fancy-index of the resolved
+recipe rows and one ``np.nonzero`` over the quantity threshold give every
+(item, ingredient) pair at once. Graphs, their pyvis HTML and node-link JSON
+are cached per (months, top_n, min_qty) through :mod:`msy.cache`, and the
+HTML is generated in memory instead of through a temp file.
+"""
+import json
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from msy import cache, cube, recipes, resolve
+
+ITEM_COLOR, INGREDIENT_COLOR = "orange", "lightblue"
+DEFAULT_TOP_N = 10
+DEFAULT_MIN_QTY = 10.0
+
+# keep the layout settling quickly when the whole menu is drawn
+VIS_OPTIONS = {
+    "physics": {
+        "solver": "barnesHut",
+        "barnesHut": {"gravitationalConstant": -8000, "springLength": 120},
+        "stabilization": {"iterations": 150},
+        "minVelocity": 1.0,
+    },
+    "interaction": {"hideEdgesOnDrag": True, "tooltipDelay": 100},
+}
+
+
+@cache.cached("network.recipe_grams", sources=[recipes.RECIPE_PATH])
+def recipe_grams() -> tuple[np.ndarray, list[str]]:
+    """Recipe matrix in grams (counts for count ingredients) and its column names."""
+    recipes_df = recipes.load_recipes()
+    return recipes.recipe_matrix(recipes_df, unit="g"), recipes.ingredient_names(recipes_df)
+
+
+@cache.cached("network.item_counts")
+def item_counts(months=None) -> pd.DataFrame:
+    """Items sold in ``months`` (cube selection) with their recipe row, best sellers first.
+
+    Columns: ``item_name`` (lower-cased), ``Count`` and ``recipe_id`` (NaN
+    when the item has no recipe match of at least ``resolve.MIN_SCORE``).
+    """
+    counts = cube.load_cube().query("item", "count", months).sum(axis=1)
+    counts = counts[counts > 0]
+    index = resolve.resolve_items(counts.index)
+    index = index[index["score"] >= resolve.MIN_SCORE].set_index("raw_name")["recipe_id"]
+
+    items = pd.DataFrame({
+        "item_name": counts.index.str.lower().str.strip(),
+        "Count": counts.to_numpy(),
+        "recipe_id": counts.index.map(index),
+    })
+    items = items.groupby("item_name", as_index=False).agg(Count=("Count", "sum"), recipe_id=("recipe_id", "first"))
+    return items.sort_values("Count", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def edges(items: pd.DataFrame, min_qty: float = DEFAULT_MIN_QTY) -> pd.DataFrame:
+    """(item, ingredient) pairs whose per-serving quantity is positive and at least ``min_qty``.
+
+    ``grams_sold`` weights the quantity by the item's sales count.
+    """
+    qty, ingredients = recipe_grams()
+    matched = items[items["recipe_id"].notna()]
+    per_item = qty[matched["recipe_id"].to_numpy(dtype=int)]
+    rows, cols = np.nonzero((per_item > 0) & (per_item >= min_qty))  # min_qty 0 must not link every ingredient
+    return pd.DataFrame({
+        "item": matched["item_name"].to_numpy()[rows],
+        "ingredient": np.asarray(ingredients)[cols],
+        "qty": per_item[rows, cols],
+        "grams_sold": per_item[rows, cols] * matched["Count"].to_numpy()[rows],
+    })
+
+
+def build_graph(months=None, top_n: int | None = DEFAULT_TOP_N, min_qty: float = DEFAULT_MIN_QTY) -> nx.Graph:
+    """Bipartite graph of the ``top_n`` best sellers (all items when None) and their ingredients."""
+    items = item_counts(months)
+    if top_n is not None:
+        items = items.head(top_n)
+    e = edges(items, min_qty)
+
+    G = nx.Graph()
+    G.add_nodes_from(
+        (name, {"color": ITEM_COLOR, "size": 25, "title": name, "kind": "item", "count": float(count)})
+        for name, count in zip(items["item_name"], items["Count"])
+    )
+    G.add_nodes_from(
+        (ing, {"color": INGREDIENT_COLOR, "size": 15, "title": ing, "kind": "ingredient"})
+        for ing in e["ingredient"].unique()
+    )
+    G.add_edges_from(
+        (item, ing, {"value": q, "title": f"{q:g} units", "grams_sold": g})
+        for item, ing, q, g in zip(e["item"], e["ingredient"], e["qty"], e["grams_sold"])
+    )
+    return G
+
+
+def render_html(G: nx.Graph, height: str = "750px") -> str:
+    """pyvis page for ``G`` as a string (vis.js from the CDN, nothing written to disk)."""
+    from pyvis.network import Network
+
+    net = Network(height=height, width="100%", notebook=False, bgcolor="#ffffff", font_color="black",
+                  cdn_resources="remote")
+    net.from_nx(G)
+    net.set_options(json.dumps(VIS_OPTIONS))
+    return net.generate_html()
+
+
+@cache.cached("network.html")
+def network_html(months=None, top_n: int | None = DEFAULT_TOP_N, min_qty: float = DEFAULT_MIN_QTY,
+                 height: str = "750px") -> str:
+    return render_html(build_graph(months, top_n, min_qty), height)
+
+
+@cache.cached("network.json")
+def network_json(months=None, top_n: int | None = DEFAULT_TOP_N, min_qty: float = DEFAULT_MIN_QTY) -> dict:
+    """Node-link JSON of the graph, for consumers other than the page."""
+    return nx.node_link_data(build_graph(months, top_n, min_qty), edges="links")
@@ -0,0 +1,191 @@
+# msy/pos.py
+"""Streaming ingestion of monthly POS item exports into the cleaned sales store.
+
+Only new or changed ``*_Data_Matrix`` exports (xlsx or csv) are read, a
+chunk of rows at a time, and each normalized chunk is appended to
+``.msy_cache/sales`` as its own Parquet part::
+
+    sales/<export stem>-<sha1[:12]>-<chunk>.parquet
+    sales/manifest.json    # export file -> content hash, month, parts, rows
+
+Cleaned rows have the columns of the old ``cleaned_item_sales.csv``: item
+names lower-cased, counts parsed to numbers, ``"$6,921.26"`` amounts parsed to
+integer ``amount_cents`` (and ``amount`` in dollars, see ``msy.money``) and
+the month standardized to the store's label (``"May"``). Amount parsing stats
+are kept per export in the manifest. Memory is bounded by ``chunk_rows``,
+however many exports the data folder holds.
+
+Run from ``streamlit_app``::
+
+    python -m msy.pos [--force] [--chunk-rows 50000]
+"""
+import argparse
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+
+from msy import money, store
+
+SALES_DIR = store.CACHE_DIR / "sales"
+CHUNK_ROWS = 50_000
+ITEM_KEY = store.TABLE_KEYS["items"]
+SALES_COLUMNS = ["item name", "count", "amount", "amount_cents", "month", "source_file"]
+
+# bump when the layout of the stored parts changes
+SALES_SCHEMA = 2
+
+
+def _read_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Raw item rows of one export, ``chunk_rows`` at a time."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype=str)
+        return
+    if suffix == ".xls":  # legacy format cannot be streamed; these are small
+        for raw in pd.read_excel(path, sheet_name=None, dtype=str).values():
+            if ITEM_KEY in [str(c).strip() for c in raw.columns]:
+                for start in range(0, len(raw), chunk_rows):
+                    yield raw.iloc[start:start + chunk_rows]
+                return
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+            if ITEM_KEY not in header:
+                continue
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunk_rows:
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header)
+            return  # first item sheet wins, as in store.parse_workbook
+    finally:
+        wb.close()
+
+
+def normalize_chunk(raw: pd.DataFrame, month: str, source_file: str) -> tuple[pd.DataFrame, dict]:
+    """Raw export rows -> ``(SALES_COLUMNS frame, amount_stats)``."""
+    raw = raw.rename(columns=lambda c: str(c).strip())
+    names = raw[ITEM_KEY].astype("string").str.strip().str.lower()
+    keep = (names.fillna("") != "").to_numpy()
+    raw = raw[keep].reset_index(drop=True)
+    cents, stats = money.to_cents(raw["Amount"] if "Amount" in raw.columns else [""] * len(raw))
+    out = pd.DataFrame({
+        "item name": names[keep].astype(str).to_numpy(),
+        "count": store._to_number(raw["Count"]) if "Count" in raw.columns else 0.0,
+        "amount": money.to_dollars(cents),
+        "amount_cents": cents,
+        "month": month,
+        "source_file": source_file,
+    })
+    return out[SALES_COLUMNS], stats
+
+
+def _part_prefix(path: Path, sha1: str) -> str:
+    return f"{path.stem}-{sha1[:12]}"
+
+
+def ingest(data_dir: Path = store.DATA_DIR, sales_dir: Path = SALES_DIR, force: bool = False,
+           chunk_rows: int = CHUNK_ROWS) -> dict[str, int]:
+    """Append new or changed exports to the sales store; return {file -> rows written}."""
+    sales_dir = Path(sales_dir)
+    sales_dir.mkdir(parents=True, exist_ok=True)
+    manifest = store._read_manifest(sales_dir)
+    new_manifest: dict = {}
+    written: dict[str, int] = {}
+
+    for month, path in store.discover_month_files(data_dir).items():
+        sha1 = store.fingerprint(path, manifest)
+        entry = manifest.get(path.name)
+        if not force and entry and entry["sha1"] == sha1 and entry.get("schema") == SALES_SCHEMA:
+            new_manifest[path.name] = {**entry, "mtime_ns": os.stat(path).st_mtime_ns}
+            continue
+
+        prefix = _part_prefix(path, sha1)
+        parts, rows, stats = [], 0, []
+        for i, raw in enumerate(_read_chunks(path, chunk_rows)):
+            chunk, chunk_stats = normalize_chunk(raw, month, path.name)
+            stats.append(chunk_stats)
+            target = sales_dir / f"{prefix}-{i:05d}.parquet"
+            store.atomic_write(target, lambda tmp: chunk.to_parquet(tmp, index=False))
+            parts.append(target.name)
+            rows += len(chunk)
+
+        st_ = os.stat(path)
+        new_manifest[path.name] = {
+            "month": month,
+            "sha1": sha1,
+            "mtime_ns": st_.st_mtime_ns,
+            "size": st_.st_size,
+            "parts": parts,
+            "rows": rows,
+            "schema": SALES_SCHEMA,
+            "amount_stats": money.merge_stats(*stats),
+        }
+        written[path.name] = rows
+
+    if new_manifest != manifest:
+        store._write_manifest(sales_dir, new_manifest)
+        # drop parts of exports that were replaced or removed
+        live = {p for entry in new_manifest.values() for p in entry["parts"]}
+        for p in sales_dir.glob("*.parquet"):
+            if p.name not in live:
+                p.unlink(missing_ok=True)
+    return written
+
+
+def iter_sales(months: list[str] | None = None, sales_dir: Path = SALES_DIR) -> Iterator[pd.DataFrame]:
+    """Cleaned sales one stored part at a time (bounded memory)."""
+    for entry in store._read_manifest(sales_dir).values():
+        if months is not None and entry["month"] not in months:
+            continue
+        for part in entry["parts"]:
+            yield pd.read_parquet(Path(sales_dir) / part)
+
+
+def load_sales(months: list[str] | None = None, sales_dir: Path = SALES_DIR) -> pd.DataFrame:
+    """All cleaned sales rows for ``months`` (every ingested month when None)."""
+    frames = [f for f in iter_sales(months, sales_dir) if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=SALES_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def monthly_totals(sales_dir: Path = SALES_DIR) -> pd.DataFrame:
+    """Total item count and amount per month (``ds`` = month start), streamed."""
+    totals = [
+        f.groupby("month")[["count", "amount_cents"]].sum() for f in iter_sales(sales_dir=sales_dir)
+    ]
+    if not totals:
+        return pd.DataFrame(columns=["ds", "count", "amount"])
+    out = pd.concat(totals).groupby(level=0).sum()
+    out["amount"] = money.to_dollars(out["amount_cents"])
+    out.index = [store.month_start(m) for m in out.index]
+    return out.rename_axis("ds").sort_index().reset_index()[["ds", "count", "amount"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest new monthly POS exports into the sales store.")
+    parser.add_argument("--data-dir", type=Path, default=store.DATA_DIR)
+    parser.add_argument("--force", action="store_true", help="re-read every export")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    written = ingest(args.data_dir, force=args.force, chunk_rows=args.chunk_rows)
+    for name, rows in written.items():
+        print(f"{name}: {rows:,} rows")
+    print(f"{len(written)} export(s) ingested into {SALES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
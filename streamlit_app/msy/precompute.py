@@ -0,0 +1,116 @@
+# msy/precompute.py
+"""Build every derived dataset before the app serves traffic.
+
+Stages form a small DAG and run on a thread pool as soon as their
+dependencies finish; each stage fills the same caches the pages read
+(``msy.store`` tables, the resolution index, the cube, ``msy.datasets``
+results and the forecast artifact store), so a cold page load only reads
+prebuilt files. Run from ``streamlit_app``::
+
+    python -m msy precompute [--workers 4] [--only usage forecasts] [--force]
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from msy import anomalies, artifacts, cache, context, criticality, cube, datasets, network, pos, resolve, risk, store
+from msy import forecast as fc
+
+
+def _resolution():
+    names = store.load_table("items")["Item Name"].unique()
+    return len(resolve.resolve_items(names))
+
+
+def _network():
+    months = cube.load_cube().months
+    html = network.network_html((months[0], months[0]), network.DEFAULT_TOP_N, network.DEFAULT_MIN_QTY)
+    return f"{len(html):,} bytes"
+
+
+def _forecasts():
+    return len(artifacts.update(fc.get_forecaster(fc.DASHBOARD_BACKEND)))
+
+
+# stage -> (dependencies, build function)
+STAGES = {
+    "tables": ((), lambda: len(store.ingest())),
+    "sales_store": ((), lambda: len(pos.ingest())),
+    "versions": (("tables",), cache.data_version),
+    "resolution": (("tables",), _resolution),
+    "cube": (("tables",), lambda: len(cube.load_cube().months)),
+    "usage": (("versions", "resolution"), lambda: datasets.ingredient_usage(store.months()).shape),
+    "menu_trend": (("versions", "cube"), lambda: datasets.monthly_item_counts().shape),
+    "item_sales": (("versions",), lambda: len(datasets.item_sales())),
+    "ingredient_profit": (("item_sales",), lambda: datasets.ingredient_profit()[0].shape),
+    "shipments": (("versions",), lambda: datasets.shipments().shape),
+    "network": (("versions", "resolution", "cube"), _network),
+    "criticality": (("versions", "resolution", "cube"), lambda: criticality.by_month().shape),
+    "anomalies": (("versions", "cube"), lambda: (len(anomalies.alerts()), len(anomalies.duplicates()))),
+    "forecasts": (("versions", "resolution"), _forecasts),
+    "shortfall_risk": (("versions", "resolution"), lambda: risk.shortfall_risk().shape),
+    "chat_context": (("menu_trend", "forecasts"), lambda: len(context.grounded_prompt(""))),
+}
+
+
+def with_dependencies(names: list[str]) -> list[str]:
+    """``names`` plus everything they depend on, in STAGES order."""
+    unknown = set(names) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages {sorted(unknown)}; expected some of {list(STAGES)}")
+    wanted, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(STAGES[name][0])
+    return [s for s in STAGES if s in wanted]
+
+
+def run(stages: list[str] | None = None, workers: int | None = None) -> list[dict]:
+    """Run ``stages`` (all when None) in dependency order; return one timing row per stage."""
+    todo = with_dependencies(stages) if stages else list(STAGES)
+    done, failed, report = set(), set(), {}
+    t0 = time.perf_counter()
+
+    def timed(name):
+        start = time.perf_counter()
+        result = STAGES[name][1]()
+        return start - t0, time.perf_counter() - start, result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while todo or running:
+            for name in list(todo):
+                deps = STAGES[name][0]
+                if any(d in failed for d in deps):
+                    todo.remove(name)
+                    failed.add(name)
+                    report[name] = {"stage": name, "status": "skipped", "start": None, "seconds": None,
+                                    "result": "dependency failed"}
+                elif all(d in done for d in deps):
+                    todo.remove(name)
+                    running[pool.submit(timed, name)] = name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    start, seconds, result = future.result()
+                    done.add(name)
+                    report[name] = {"stage": name, "status": "ok", "start": start, "seconds": seconds,
+                                    "result": result}
+                except Exception as e:  # report and skip dependents, keep building the rest
+                    failed.add(name)
+                    report[name] = {"stage": name, "status": "failed", "start": None, "seconds": None,
+                                    "result": repr(e)}
+    return [report[s] for s in STAGES if s in report]
+
+
+def print_report(rows: list[dict], total: float) -> None:
+    print(f"{'stage':<20}{'status':<9}{'start s':>9}{'time s':>9}  result")
+    for r in rows:
+        start = f"{r['start']:.2f}" if r["start"] is not None else "-"
+        seconds = f"{r['seconds']:.2f}" if r["seconds"] is not None else "-"
+        print(f"{r['stage']:<20}{r['status']:<9}{start:>9}{seconds:>9}  {r['result']}")
+    print(f"total {total:.2f}s")
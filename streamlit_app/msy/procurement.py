@@ -0,0 +1,184 @@
+# msy/procurement.py
+"""Order quantities and cadences from forecast demand.
+
+For every line of ``MSY Data - Shipment.csv`` a mixed-integer program picks
+one cadence (weekly, biweekly or monthly) and a whole number of packs
+(``Quantity per shipment``) per delivery, so that for every recipe
+ingredient and every week of the horizon::
+
+    opening + deliveries so far + uncovered  >=  demand so far + safety stock
+
+at minimum ``order_cost`` per delivery plus ``holding_cost`` per lb (count)
+of projected stock per week, with uncovered demand priced at
+``shortage_cost`` per week so the program is always feasible (a monthly line
+cannot deliver before the 1st). The cost defaults are placeholders; the shipment sheet carries no
+prices, so pass real ones when they are known.
+
+Variables are packs ``n`` and cadence choices ``y`` per line and cadence,
+linked by ``n <= max_packs * y``. Delivery dates come from
+:func:`msy.shipments.delivery_dates`, so the plan lands on the same Mondays
+and month starts as the calendar. Solved with HiGHS via
+:func:`scipy.optimize.milp`; the whole menu over 12 weeks is a few hundred
+rows.
+
+Projected stock is ``opening + deliveries so far - demand so far`` at the
+end of each week, before any uncovered demand is added back. The objective
+keeps only its deliveries part, since opening stock and demand do not
+depend on the plan; the summary reports the full figure, so its total is
+``objective`` plus that constant.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from msy import inventory, shipments
+from msy import recipes as rec
+
+DEFAULT_WEEKS = 12
+DEFAULT_SAFETY_DAYS = 3
+ORDER_COST = 25.0  # per delivery of one line
+HOLDING_COST = 0.05  # per lb (count) of projected stock per week
+SHORTAGE_COST = 1_000.0  # per lb (count) of demand left uncovered
+
+PLAN_COLUMNS = [
+    "Ingredient", "Unit", "Pack Size", "Current Frequency", "Current Packs", "Frequency", "Packs",
+    "Deliveries", "Ordered", "Current Ordered", "Order Cost",
+]
+
+
+def horizon(start, weeks: int = DEFAULT_WEEKS) -> pd.DatetimeIndex:
+    """``weeks`` Monday week starts from the first Monday on or after ``start``."""
+    start = pd.Timestamp(start).normalize()
+    monday = start + pd.Timedelta(days=(-start.weekday()) % 7)
+    return pd.date_range(monday, periods=weeks, freq="7D")
+
+
+def weekly_demand(weeks: pd.DatetimeIndex, table: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Recipe ingredient x week demand in lbs (counts) from the constraint table's monthly forecast."""
+    daily = inventory.daily_demand(inventory.monthly_demand(table), weeks[0], weeks[-1] + pd.Timedelta(days=6))
+    return daily.T.groupby(shipments.period_start(daily.columns, "week")).sum().T[weeks]
+
+
+def cumulative_deliveries(weeks: pd.DatetimeIndex, frequencies=shipments.FREQUENCIES) -> np.ndarray:
+    """Frequencies x weeks: deliveries of each cadence up to and including each week."""
+    end = weeks[-1] + pd.Timedelta(days=6)
+    out = np.zeros((len(frequencies), len(weeks)))
+    for k, f in enumerate(frequencies):
+        codes = weeks.get_indexer(shipments.period_start(shipments.delivery_dates(f, weeks[0], end), "week"))
+        out[k] = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(weeks)))
+    return out
+
+
+def solve(start, weeks: int = DEFAULT_WEEKS, safety_days: float = DEFAULT_SAFETY_DAYS,
+          opening_days: float = inventory.DEFAULT_COVER_DAYS, order_cost: float = ORDER_COST,
+          holding_cost: float = HOLDING_COST, shortage_cost: float = SHORTAGE_COST,
+          frequencies=shipments.FREQUENCIES, table: pd.DataFrame | None = None,
+          lines: pd.DataFrame | None = None) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """Cheapest cadence and packs per delivery for every shipment line.
+
+    Stock opens at ``opening_days`` of the first week's demand and safety
+    stock is ``safety_days`` of each week's demand. Returns the plan
+    (``PLAN_COLUMNS``, one row per line), the weekly levels per recipe
+    ingredient (Ingredient / Date / Demand / Supply / On Hand / Uncovered)
+    and a summary of the cost parts, the total, the solver ``objective``
+    and the solve time.
+    """
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import csr_array, hstack, kron
+
+    unknown = set(frequencies) - set(shipments.FREQUENCIES)
+    if unknown:
+        raise ValueError(f"Unknown shipment frequency {sorted(unknown)}; expected one of {list(shipments.FREQUENCIES)}")
+    frequencies = [f for f in shipments.FREQUENCIES if f in frequencies]
+    lines = shipments.load_lines() if lines is None else lines.reset_index(drop=True)
+    week_starts = horizon(start, weeks)
+
+    alloc = shipments.allocation(lines)
+    ingredients = list(alloc.columns)
+    demand = weekly_demand(week_starts, table).reindex(ingredients).fillna(0.0).to_numpy()  # I x W
+    # lbs (counts) of each recipe ingredient in one pack of each line
+    pack = alloc.to_numpy() * rec.unit_vector(ingredients, "lbs")[None, :] * lines["Quantity"].to_numpy()[:, None]
+    cum = cumulative_deliveries(week_starts, frequencies)  # F x W
+    n_lines, n_freq, n_ing, n_weeks = len(lines), len(frequencies), len(ingredients), len(week_starts)
+
+    opening = demand[:, 0] * opening_days / 7
+    need = np.cumsum(demand, axis=1) + demand * safety_days / 7 - opening[:, None]  # I x W
+
+    # supply so far of ingredient i in week w per pack of (line l, cadence f): pack[l, i] * cum[f, w]
+    cover = csr_array(np.einsum("li,fw->iwlf", pack, cum).reshape(n_ing * n_weeks, n_lines * n_freq))
+    n_vars = 2 * n_lines * n_freq + n_ing * n_weeks
+    coverage = LinearConstraint(
+        hstack([cover, csr_array((n_ing * n_weeks, n_lines * n_freq)), csr_array(np.eye(n_ing * n_weeks))]),
+        lb=need.ravel(), ub=np.inf,
+    )
+    # n[l, f] <= max_packs[l] * y[l, f]; at most one cadence per line
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_pack = np.where(pack > 0, (need[:, -1][None, :] + opening[None, :]) / pack, 0.0)
+    max_packs = np.ceil(per_pack.max(axis=1, initial=0.0) / np.maximum(cum[:, -1].min(), 1)) + 1
+    eye = csr_array(np.eye(n_lines * n_freq))
+    linking = LinearConstraint(
+        hstack([eye, -csr_array(np.diag(np.repeat(max_packs, n_freq))), csr_array((n_lines * n_freq, n_ing * n_weeks))]),
+        lb=-np.inf, ub=0.0,
+    )
+    one_cadence = LinearConstraint(
+        hstack([csr_array((n_lines, n_lines * n_freq)), kron(np.eye(n_lines), np.ones((1, n_freq))),
+                csr_array((n_lines, n_ing * n_weeks))]),
+        lb=0.0, ub=1.0,
+    )
+
+    holding = holding_cost * np.einsum("li,fw->lf", pack, cum).ravel()  # deliveries part of projected stock
+    ordering = order_cost * np.tile(cum[:, -1], n_lines)
+    c = np.concatenate([holding, ordering, np.full(n_ing * n_weeks, shortage_cost)])
+    integrality = np.concatenate([np.ones(2 * n_lines * n_freq), np.zeros(n_ing * n_weeks)])
+    upper = np.concatenate([np.repeat(max_packs, n_freq), np.ones(n_lines * n_freq), np.full(n_ing * n_weeks, np.inf)])
+
+    began = time.perf_counter()
+    res = milp(c, constraints=[coverage, linking, one_cadence], integrality=integrality,
+               bounds=Bounds(np.zeros(n_vars), upper))
+    seconds = time.perf_counter() - began
+    if res.x is None:
+        raise RuntimeError(f"Procurement solve failed: {res.message}")
+
+    packs = np.round(res.x[: n_lines * n_freq]).reshape(n_lines, n_freq)
+    uncovered = res.x[2 * n_lines * n_freq:].reshape(n_ing, n_weeks).clip(min=0.0)
+    choice = packs.argmax(axis=1)
+    chosen = packs[np.arange(n_lines), choice]
+    deliveries = np.where(chosen > 0, cum[choice, -1], 0)
+    plan = pd.DataFrame({
+        "Ingredient": lines["Ingredient"],
+        "Unit": lines["Unit"],
+        "Pack Size": lines["Quantity"],
+        "Current Frequency": lines["Frequency"],
+        "Current Packs": lines["Shipments"],
+        "Frequency": np.where(chosen > 0, np.asarray(frequencies)[choice], "none"),
+        "Packs": chosen.astype(int),
+        "Deliveries": deliveries.astype(int),
+        "Ordered": chosen * deliveries * lines["Quantity"],
+        "Current Ordered": lines["Per Delivery"] * lines["Frequency"].map(
+            dict(zip(shipments.FREQUENCIES, cumulative_deliveries(week_starts)[:, -1]))),
+        "Order Cost": order_cost * deliveries,
+    })[PLAN_COLUMNS]
+
+    supply = pack.T @ (packs @ np.diff(cum, axis=1, prepend=0.0))  # I x W
+    stock = opening[:, None] + np.cumsum(supply - demand, axis=1)  # projected stock, as in the objective
+    on_hand = stock + uncovered
+    k = n_ing * n_weeks
+    levels = pd.DataFrame({
+        "Ingredient": np.repeat(ingredients, n_weeks),
+        "Date": np.tile(week_starts, n_ing),
+        "Demand": demand.reshape(k),
+        "Supply": supply.reshape(k),
+        "On Hand": on_hand.reshape(k),
+        "Uncovered": uncovered.reshape(k),
+    })
+    summary = {
+        "order_cost": float(plan["Order Cost"].sum()),
+        "holding_cost": float(holding_cost * stock.sum()),
+        "shortage_cost": float(shortage_cost * uncovered.sum()),
+        "objective": float(res.fun),
+        "seconds": seconds,
+        "status": res.message,
+    }
+    summary["total_cost"] = summary["order_cost"] + summary["holding_cost"] + summary["shortage_cost"]
+    return plan, levels, summary
@@ -0,0 +1,48 @@
+# msy/recipes.py
+"""Recipe matrix loaded from ``MSY Data - Ingredient.csv``."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from msy import store
+
+RECIPE_PATH = store.DATA_DIR / "MSY Data - Ingredient.csv"
+
+# Ingredients that are counts; every other column is in grams
+COUNT_INGREDIENTS = ['Egg(count)', 'Ramen (count)', 'Chicken Wings (pcs)', 'chicken thigh (pcs)', 'White onion']
+
+G_TO_LBS = 1 / 453.592
+UNITS = ("g", "lbs")
+
+
+def load_recipes(path: Path = RECIPE_PATH) -> pd.DataFrame:
+    """Recipe rows with stripped headers; row position is the recipe id."""
+    recipes = pd.read_csv(path)
+    recipes.columns = [c.strip() for c in recipes.columns]
+    recipes["Item name"] = recipes["Item name"].astype(str).str.strip()
+    return recipes.reset_index(drop=True)
+
+
+def ingredient_names(recipes: pd.DataFrame) -> list[str]:
+    return [c for c in recipes.columns if c != "Item name"]
+
+
+def unit_label(ingredient: str, unit: str = "lbs") -> str:
+    """Display unit for one ingredient column."""
+    return "Count" if ingredient in COUNT_INGREDIENTS else unit
+
+
+def unit_vector(ingredients: list[str], unit: str = "lbs") -> np.ndarray:
+    """Per-ingredient multiplier from recipe units (g / count) to ``unit``."""
+    if unit not in UNITS:
+        raise ValueError(f"Unknown unit {unit!r}; expected one of {UNITS}")
+    scale = G_TO_LBS if unit == "lbs" else 1.0
+    return np.array([1.0 if ing in COUNT_INGREDIENTS else scale for ing in ingredients])
+
+
+def recipe_matrix(recipes: pd.DataFrame, unit: str = "lbs") -> np.ndarray:
+    """Dense items x ingredients quantities per serving, missing cells as 0."""
+    names = ingredient_names(recipes)
+    quantities = recipes[names].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    return quantities * unit_vector(names, unit)
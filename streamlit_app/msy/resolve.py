@@ -0,0 +1,82 @@
+# msy/resolve.py
+"""Persisted POS item name -> recipe row resolution index.
+
+Fuzzy matching runs once per distinct raw item name and is stored in
+``.msy_cache/resolution_index.parquet``. The index is rebuilt when the recipe
+CSV changes and only extended when new item names show up in sales.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from msy import store
+from msy.recipes import RECIPE_PATH, load_recipes
+
+# extractOne always returns *some* recipe; below this score the match is noise
+# (drinks, desserts and sides land on a random noodle dish)
+MIN_SCORE = 90
+
+INDEX_COLUMNS = ["raw_name", "base_name", "recipe_id", "recipe_name", "score", "recipe_sha1"]
+
+
+def base_name(raw_name: str) -> str:
+    """Normalize a POS item name the way the recipe sheet names things."""
+    name = str(raw_name).strip().lower()
+    if "fried chicken" in name:
+        return "Fried Wings"
+    if "cutlet" in name:
+        return "Chicken Cutlet"
+    return "".join(c for c in name if c.isalpha() or c.isspace()).strip()
+
+
+def _match_names(names: list[str], recipe_names: list[str]) -> pd.DataFrame:
+    from thefuzz import process
+
+    choices = [n.lower() for n in recipe_names]
+    # first occurrence wins for duplicated recipe names
+    first_id = {}
+    for i, n in enumerate(choices):
+        first_id.setdefault(n, i)
+
+    rows = []
+    for raw in names:
+        base = base_name(raw)
+        match = process.extractOne(base, choices)
+        if match is None:
+            rows.append((raw, base, -1, "", 0))
+            continue
+        matched, score, *_ = match
+        rid = first_id[matched]
+        rows.append((raw, base, rid, recipe_names[rid], int(score)))
+    return pd.DataFrame(rows, columns=INDEX_COLUMNS[:-1])
+
+
+def _index_path(cache_dir: Path) -> Path:
+    return Path(cache_dir) / "resolution_index.parquet"
+
+
+def load_index(cache_dir: Path = store.CACHE_DIR) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(_index_path(cache_dir))
+    except FileNotFoundError:
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+
+
+def resolve_items(names, recipe_path: Path = RECIPE_PATH,
+                  cache_dir: Path = store.CACHE_DIR) -> pd.DataFrame:
+    """Index rows for ``names``; unseen names are matched and persisted."""
+    names = pd.Series(list(names), dtype="string").dropna().str.strip().unique().tolist()
+    recipe_sha1 = store.fingerprint(recipe_path)
+
+    index = load_index(cache_dir)
+    index = index[index["recipe_sha1"] == recipe_sha1]
+    missing = sorted(set(names) - set(index["raw_name"]))
+    if missing:
+        recipe_names = load_recipes(recipe_path)["Item name"].tolist()
+        added = _match_names(missing, recipe_names).assign(recipe_sha1=recipe_sha1)
+        index = pd.concat([index, added], ignore_index=True) if not index.empty else added
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        store.atomic_write(_index_path(cache_dir), lambda tmp: index.to_parquet(tmp, index=False))
+
+    return index[index["raw_name"].isin(names)].reset_index(drop=True)
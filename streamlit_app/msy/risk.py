@@ -0,0 +1,137 @@
+# msy/risk.py
+"""Monte Carlo shortfall risk.
+
+Demand is sampled where the uncertainty lives, in servings per recipe, and
+pushed through the recipe matrix, so ingredients shared by the same dishes
+move together::
+
+    servings (scenarios x recipes x months)  ->  @ recipe_matrix (lbs)
+    demand   (scenarios x ingredients x months)  vs  delivery-calendar supply
+
+Servings scenarios come from the forecaster's 80% interval (normal, sigma =
+half-width / z) or from a bootstrap of its in-sample residuals, where one
+month's residuals are drawn for all recipes together. Scenarios are
+evaluated ``chunk`` at a time and only running sums are kept, so memory is
+bounded by one chunk whatever the scenario count.
+"""
+import numpy as np
+import pandas as pd
+
+from msy import cache, recipes as rec, shipments, store, usage
+from msy import forecast as fc
+
+METHODS = ("interval", "bootstrap")
+DEFAULT_SCENARIOS = 10_000
+DEFAULT_CHUNK = 1_000
+
+RISK_COLUMNS = [
+    "Ingredient", "Date", "Unit", "Supply", "Mean Demand", "P(Shortfall)", "P(Shortfall So Far)",
+    "Expected Unmet", "Unmet P95",
+]
+
+
+def servings_forecast(forecaster: fc.Forecaster | None = None, periods: int = 12,
+                      months: list[str] | None = None) -> pd.DataFrame:
+    """Forecaster rows (FORECAST_COLUMNS plus ``y``) per recipe; ``Ingredient`` holds the recipe name."""
+    forecaster = forecaster or fc.get_forecaster(fc.DASHBOARD_BACKEND)
+    counts = usage.sales_matrix(months)
+    hist = counts.rename_axis("Ingredient").reset_index().melt(id_vars="Ingredient", var_name="Month", value_name="y")
+    hist["ds"] = hist["Month"].map(store.month_start)
+    out = forecaster.forecast(hist[["Ingredient", "ds", "y"]], periods)
+    return out.merge(hist[["Ingredient", "ds", "y"]], on=["Ingredient", "ds"], how="left")
+
+
+def _arrays(rows: pd.DataFrame, recipe_names: list[str]):
+    """Future yhat and sigma (recipes x months), residuals (recipes x history months) and future dates."""
+    last = rows.loc[rows["y"].notna(), "ds"].max()
+    future = rows[rows["ds"] > last]
+    yhat = future.pivot(index="Ingredient", columns="ds", values="yhat").reindex(recipe_names).fillna(0.0)
+    upper = future.pivot(index="Ingredient", columns="ds", values="yhat_upper").reindex(recipe_names).fillna(0.0)
+    past = rows[rows["ds"] <= last]
+    resid = (past["y"] - past["yhat"]).to_frame("r").assign(Ingredient=past["Ingredient"], ds=past["ds"])
+    resid = resid.pivot(index="Ingredient", columns="ds", values="r").reindex(recipe_names).fillna(0.0)
+    sigma = (upper - yhat).clip(lower=0) / fc.Z_80
+    return yhat.to_numpy(), sigma.to_numpy(), resid.to_numpy(), yhat.columns
+
+
+def sample_servings(yhat: np.ndarray, sigma: np.ndarray, resid: np.ndarray, n: int,
+                    method: str, rng: np.random.Generator) -> np.ndarray:
+    """``n`` servings scenarios (n x recipes x months), floored at zero."""
+    if method == "interval":
+        draws = yhat[None] + sigma[None] * rng.standard_normal((n, *yhat.shape))
+    else:
+        picks = rng.integers(resid.shape[1], size=(n, yhat.shape[1]))  # a history month per future month
+        draws = yhat[None] + resid[:, picks].transpose(1, 0, 2)
+    return np.maximum(draws, 0.0)
+
+
+def simulate(forecaster: fc.Forecaster | None = None, periods: int = 12, scenarios: int = DEFAULT_SCENARIOS,
+             method: str = "interval", chunk: int = DEFAULT_CHUNK, seed: int = 0,
+             months: list[str] | None = None) -> pd.DataFrame:
+    """Probability of shortfall and unmet demand per ingredient and future month (``RISK_COLUMNS``).
+
+    Quantities are in lbs (counts for count ingredients); only ingredients
+    with a shipment line are reported. ``P(Shortfall So Far)`` is the chance
+    of at least one short month up to that month. ``Unmet P95`` is the 95th
+    percentile of unmet demand, read from a per-cell histogram (200 bins up
+    to 3x the mean demand, rounded up to a bin edge).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown risk method {method!r}; expected one of {list(METHODS)}")
+    recipes = rec.load_recipes()
+    names = recipes["Item name"].tolist()
+    rows = servings_forecast(forecaster, periods, months)
+    yhat, sigma, resid, dates = _arrays(rows, names)
+
+    supply_df = shipments.supply(dates[0], dates[-1] + pd.offsets.MonthEnd(0), "month", "lbs", recipes=recipes)
+    ingredients = list(supply_df.index)
+    cols = [rec.ingredient_names(recipes).index(ing) for ing in ingredients]
+    matrix = rec.recipe_matrix(recipes, unit="lbs")[:, cols]  # recipes x ingredients
+    supply = supply_df[dates].to_numpy()  # ingredients x months
+
+    rng = np.random.default_rng(seed)
+    shape = supply.shape
+    short = np.zeros(shape)
+    short_so_far = np.zeros(shape)
+    unmet_sum = np.zeros(shape)
+    demand_sum = np.zeros(shape)
+    # unmet histogram per cell for the percentile, up to 3x the cell's mean demand
+    bins = 200
+    scale = np.maximum(matrix.T @ yhat, 1e-9) * 3 / bins  # ingredients x months
+    cell = np.arange(supply.size).reshape(shape)
+    hist = np.zeros(supply.size * (bins + 1))
+
+    for start in range(0, scenarios, chunk):
+        n = min(chunk, scenarios - start)
+        servings = sample_servings(yhat, sigma, resid, n, method, rng)
+        demand = np.einsum("srm,ri->sim", servings, matrix)
+        unmet = np.maximum(demand - supply[None], 0.0)
+        short += (unmet > 0).sum(axis=0)
+        short_so_far += np.logical_or.accumulate(unmet > 0, axis=2).sum(axis=0)
+        unmet_sum += unmet.sum(axis=0)
+        demand_sum += demand.sum(axis=0)
+        b = np.minimum(np.ceil(unmet / scale[None]), bins).astype(np.int64)
+        hist += np.bincount((cell[None] * (bins + 1) + b).ravel(), minlength=hist.size)
+
+    cdf = np.cumsum(hist.reshape(*shape, bins + 1), axis=2) / scenarios
+    p95 = np.argmax(cdf >= 0.95, axis=2) * scale
+
+    k = len(ingredients) * len(dates)
+    return pd.DataFrame({
+        "Ingredient": np.repeat(ingredients, len(dates)),
+        "Date": np.tile(dates, len(ingredients)),
+        "Unit": np.repeat([rec.unit_label(ing, "lbs") for ing in ingredients], len(dates)),
+        "Supply": supply.reshape(k),
+        "Mean Demand": (demand_sum / scenarios).reshape(k),
+        "P(Shortfall)": (short / scenarios).reshape(k),
+        "P(Shortfall So Far)": (short_so_far / scenarios).reshape(k),
+        "Expected Unmet": (unmet_sum / scenarios).reshape(k),
+        "Unmet P95": p95.reshape(k),
+    })[RISK_COLUMNS]
+
+
+@cache.cached("risk.shortfall")
+def shortfall_risk(periods: int = 3, scenarios: int = DEFAULT_SCENARIOS, method: str = "interval",
+                   seed: int = 0) -> pd.DataFrame:
+    """:func:`simulate` with the dashboard backend, cached per data version."""
+    return simulate(fc.get_forecaster(fc.DASHBOARD_BACKEND), periods, scenarios, method, seed=seed)
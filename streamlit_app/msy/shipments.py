@@ -0,0 +1,219 @@
+# msy/shipments.py
+"""Shipment schedule engine.
+
+Each line of ``MSY Data - Shipment.csv`` delivers ``Quantity per shipment x
+Number of shipments`` of one ingredient every week, every two weeks or on
+the first of every month. The engine expands the schedule into a dated
+delivery calendar and converts deliveries into the recipe units of
+``MSY Data - Ingredient.csv`` (grams or counts)::
+
+    deliveries (periods x lines) @ allocation (lines x recipe ingredients)
+
+``allocation`` holds the unit conversion factor, split by recipe usage when
+one line feeds several recipe columns ("Peas + Carrot"). Weekly and biweekly
+deliveries fall on Mondays counted from ``ANCHOR``, so a calendar does not
+depend on the window it is computed for. Dates are generated per frequency
+and broadcast over all lines of that frequency; nothing loops over lines.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from msy import recipes as rec
+from msy import store
+
+SHIPMENT_PATH = store.DATA_DIR / "MSY Data - Shipment.csv"
+
+# recipe ingredient column -> "Ingredient" in MSY Data - Shipment.csv
+SHIPMENT_INGREDIENTS = {
+    "braised beef used (g)": "Beef",
+    "Braised Chicken(g)": "Chicken",
+    "Egg(count)": "Egg",
+    "Rice(g)": "Rice",
+    "Ramen (count)": "Ramen",
+    "Rice Noodles(g)": "Rice Noodles",
+    "Chicken Wings (pcs)": "Chicken Wings",
+    "flour (g)": "Flour",
+    "Green Onion": "Green Onion",
+    "Cilantro": "Cilantro",
+    "White onion": "White Onion",
+    "Peas(g)": "Peas + Carrot",
+    "Carrot(g)": "Peas + Carrot",
+    "Boychoy(g)": "Bokchoy",
+    "Tapioca Starch": "Tapioca Starch",
+}
+
+FREQUENCIES = ("weekly", "biweekly", "monthly")
+DELIVERIES_PER_MONTH = {"weekly": 52 / 12, "biweekly": 26 / 12, "monthly": 1.0}
+ANCHOR = pd.Timestamp("2025-01-06")  # a Monday; weekly and biweekly deliveries count from here
+
+GRAMS_PER_LB = 453.592
+PORTIONS_PER_ROLL = 1.0  # one ramen roll (noodle nest) per bowl
+
+# (shipment unit, recipe unit) -> recipe units per shipment unit
+CONVERSIONS = {
+    ("lbs", "g"): GRAMS_PER_LB,
+    ("eggs", "count"): 1.0,
+    ("whole onion", "count"): 1.0,
+    ("pieces", "count"): 1.0,
+    ("rolls", "count"): PORTIONS_PER_ROLL,
+}
+
+PERIODS = {"month": "MS", "week": "W-MON", "day": "D"}
+LINE_COLUMNS = ["Ingredient", "Quantity", "Unit", "Shipments", "Frequency", "Per Delivery", "Per Month"]
+
+
+def recipe_unit(ingredient: str) -> str:
+    return "count" if ingredient in rec.COUNT_INGREDIENTS else "g"
+
+
+def load_lines(path: Path = SHIPMENT_PATH) -> pd.DataFrame:
+    """Schedule lines with normalized names, units and frequencies (``LINE_COLUMNS``).
+
+    ``Per Month`` is the average monthly quantity in shipment units.
+    """
+    return normalize_lines(pd.read_csv(path))
+
+
+def normalize_lines(ship: pd.DataFrame) -> pd.DataFrame:
+    """Schedule as exported (CSV or Excel columns) -> ``LINE_COLUMNS``."""
+    ship = ship.rename(columns=lambda c: str(c).strip())
+    lines = pd.DataFrame({
+        "Ingredient": ship["Ingredient"].astype(str).str.strip(),
+        "Quantity": pd.to_numeric(ship["Quantity per shipment"], errors="coerce").fillna(0.0),
+        "Unit": ship["Unit of shipment"].astype(str).str.strip().str.lower(),
+        "Shipments": pd.to_numeric(ship["Number of shipments"], errors="coerce").fillna(0.0),
+        "Frequency": ship["frequency"].astype(str).str.strip().str.lower(),
+    })
+    unknown = set(lines["Frequency"]) - set(FREQUENCIES)
+    if unknown:
+        raise ValueError(f"Unknown shipment frequency {sorted(unknown)}; expected one of {list(FREQUENCIES)}")
+    lines["Per Delivery"] = lines["Quantity"] * lines["Shipments"]
+    lines["Per Month"] = lines["Per Delivery"] * lines["Frequency"].map(DELIVERIES_PER_MONTH)
+    return lines[LINE_COLUMNS]
+
+
+def allocation(lines: pd.DataFrame, recipes: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Lines x recipe ingredients: recipe units delivered per shipment unit.
+
+    A line shared by several recipe columns is split by their total
+    per-serving quantity across the menu (equal shares when unused).
+    """
+    recipes = rec.load_recipes() if recipes is None else recipes
+    ingredients = [ing for ing in rec.ingredient_names(recipes) if ing in SHIPMENT_INGREDIENTS]
+    weight = pd.Series(rec.recipe_matrix(recipes, unit="g").sum(axis=0), index=rec.ingredient_names(recipes))
+
+    target = pd.Series({ing: SHIPMENT_INGREDIENTS[ing] for ing in ingredients})
+    onehot = (target.to_numpy()[None, :] == lines["Ingredient"].to_numpy()[:, None]).astype(float)
+    shares = onehot * weight[ingredients].to_numpy()[None, :]
+    totals = shares.sum(axis=1, keepdims=True)
+    counts = onehot.sum(axis=1, keepdims=True)
+    equal = np.divide(onehot, counts, out=np.zeros_like(onehot), where=counts > 0)
+    shares = np.divide(shares, totals, out=equal, where=totals > 0)
+
+    units = [recipe_unit(ing) for ing in ingredients]
+    by_unit = pd.DataFrame({u: [CONVERSIONS.get((u, r), np.nan) for r in units] for u in lines["Unit"].unique()})
+    factors = by_unit.T.reindex(lines["Unit"]).to_numpy().reshape(len(lines), len(units))
+    missing = (shares > 0) & np.isnan(factors)
+    if missing.any():
+        i, j = np.argwhere(missing)[0]
+        raise ValueError(f"No conversion from {lines['Unit'].iat[i]!r} to {units[j]!r} "
+                         f"for {ingredients[j]!r}; add it to CONVERSIONS")
+    return pd.DataFrame(shares * np.nan_to_num(factors), index=lines.index, columns=ingredients)
+
+
+def delivery_dates(frequency: str, start, end) -> pd.DatetimeIndex:
+    """Delivery dates of one frequency between ``start`` and ``end`` (inclusive)."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    if frequency == "monthly":
+        return pd.date_range(start, end, freq="MS")
+    step = 7 if frequency == "weekly" else 14
+    first = -(-(start - ANCHOR).days // step)
+    last = (end - ANCHOR).days // step
+    return ANCHOR + pd.to_timedelta(np.arange(first, last + 1) * step, unit="D")
+
+
+def calendar(start, end, lines: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Every delivery between ``start`` and ``end``: Date, line, Ingredient, Quantity, Unit."""
+    lines = load_lines() if lines is None else lines
+    frames = []
+    for frequency in FREQUENCIES:
+        idx = np.flatnonzero(lines["Frequency"].to_numpy() == frequency)
+        dates = delivery_dates(frequency, start, end)
+        if len(idx) == 0 or len(dates) == 0:
+            continue
+        line = np.tile(idx, len(dates))
+        frames.append(pd.DataFrame({
+            "Date": np.repeat(dates.to_numpy(), len(idx)),
+            "line": line,
+            "Ingredient": lines["Ingredient"].to_numpy()[line],
+            "Quantity": lines["Per Delivery"].to_numpy()[line],
+            "Unit": lines["Unit"].to_numpy()[line],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["Date", "line", "Ingredient", "Quantity", "Unit"])
+    return pd.concat(frames, ignore_index=True).sort_values(["Date", "line"], kind="stable").reset_index(drop=True)
+
+
+def period_start(dates, period: str = "month") -> pd.DatetimeIndex:
+    """First day of the month, the Monday of the week, or the day itself, of each date."""
+    dates = pd.DatetimeIndex(dates).normalize()
+    if period == "month":
+        return dates.to_period("M").start_time
+    if period == "week":
+        return dates - pd.to_timedelta(dates.weekday, unit="D")
+    return dates
+
+
+def supply(start, end, period: str = "month", unit: str = "g", lines: pd.DataFrame | None = None,
+           recipes: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Recipe ingredient (index) x period start (columns) supply.
+
+    ``period`` is "month", "week" (Monday starts) or "day". ``unit`` is "g"
+    (recipe units) or "lbs"; count ingredients stay in counts, as in
+    :mod:`msy.usage`.
+    Only ingredients with a shipment line are returned.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}; expected one of {list(PERIODS)}")
+    lines = load_lines() if lines is None else lines.reset_index(drop=True)
+    alloc = allocation(lines, recipes)
+
+    # deliveries per period and frequency, then one broadcast over that frequency's lines
+    periods = pd.date_range(period_start([start], period)[0], end, freq=PERIODS[period])
+    frequency = lines["Frequency"].to_numpy()
+    matrix = np.zeros((len(periods), len(lines)))
+    for f in FREQUENCIES:
+        codes = periods.get_indexer(period_start(delivery_dates(f, start, end), period))
+        per_period = np.bincount(codes, minlength=len(periods)).astype(float)
+        matrix += per_period[:, None] * (frequency == f)
+    matrix *= lines["Per Delivery"].to_numpy(dtype=float)
+
+    values = (matrix @ alloc.to_numpy()).T * rec.unit_vector(list(alloc.columns), unit)[:, None]
+    return pd.DataFrame(values, index=pd.Index(alloc.columns, name="Ingredient"), columns=periods)
+
+
+def supply_long(start, end, period: str = "month", unit: str = "g") -> pd.DataFrame:
+    """``supply`` as rows of Ingredient / Date / Supply / Unit."""
+    wide = supply(start, end, period, unit)
+    out = wide.reset_index().melt(id_vars="Ingredient", var_name="Date", value_name="Supply")
+    out["Date"] = pd.to_datetime(out["Date"])
+    out["Unit"] = out["Ingredient"].map(lambda ing: rec.unit_label(ing, unit) if unit == "lbs" else recipe_unit(ing))
+    return out
+
+
+def line_supply(lines: pd.DataFrame | None = None, unit: str = "lbs") -> pd.Series:
+    """Average monthly supply of each line in recipe units (lbs or counts with ``unit="lbs"``)."""
+    lines = load_lines() if lines is None else lines
+    alloc = allocation(lines)
+    per_unit = alloc.to_numpy() @ rec.unit_vector(list(alloc.columns), unit)
+    return pd.Series(lines["Per Month"].to_numpy() * per_unit, index=lines.index, name="Per Month")
+
+
+def average_monthly(unit: str = "lbs", lines: pd.DataFrame | None = None) -> pd.Series:
+    """Average monthly supply per recipe ingredient (52/12 weekly deliveries a month)."""
+    lines = load_lines() if lines is None else lines.reset_index(drop=True)
+    alloc = allocation(lines)
+    values = lines["Per Month"].to_numpy() @ alloc.to_numpy() * rec.unit_vector(list(alloc.columns), unit)
+    return pd.Series(values, index=pd.Index(alloc.columns, name="Ingredient"), name="Per Month")
@@ -0,0 +1,73 @@
+# msy/startup.py
+"""Import-time profiling for the dashboard's cold start.
+
+Every measurement runs in a fresh interpreter (``python -X importtime``),
+so nothing already imported by the caller hides the cost. A page's imports
+are read from its source with :mod:`ast` and replayed without running the
+page itself. From ``streamlit_app``::
+
+    python -m msy imports [Home.py pages/Network.py] [--top 15]
+
+``HEAVY_MODULES`` are the analytics libraries the landing page must not
+pull in; pages load them in the code paths that use them.
+"""
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+HOME = APP_DIR / "Home.py"
+
+HEAVY_MODULES = (
+    "pandas", "numpy", "pyarrow", "scipy", "networkx", "pyvis", "thefuzz", "prophet",
+    "google.genai", "google.generativeai", "altair", "matplotlib", "openpyxl",
+)
+IMPORT_BUDGET_SECONDS = 1.5  # Home.py's cold import, checked by benchmarks/bench_imports.py
+
+
+def script_imports(path: Path) -> str:
+    """The top-level ``import`` statements of a script, as source code."""
+    source = Path(path).read_text(encoding="utf-8")
+    nodes = [n for n in ast.parse(source).body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                          capture_output=True, text=True, check=True)
+
+
+def profile(code: str) -> list[dict]:
+    """Per-module import cost of running ``code`` cold.
+
+    One row per imported module: ``module``, ``self_s``, ``cumulative_s`` and
+    ``depth`` (0 for modules imported directly by ``code``).
+    """
+    rows = []
+    for line in _run(code).stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({"module": name.strip(), "self_s": int(self_us) / 1e6,
+                     "cumulative_s": int(cumulative_us) / 1e6, "depth": depth})
+    return rows
+
+
+def total_seconds(rows: list[dict]) -> float:
+    return sum(r["cumulative_s"] for r in rows if r["depth"] == 0)
+
+
+def loaded_heavy(code: str) -> list[str]:
+    """``HEAVY_MODULES`` that are imported after running ``code`` cold."""
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    lines = _run(probe).stdout.strip().splitlines()
+    return [m for m in lines[-1].split(",") if m] if lines else []
+
+
+def print_profile(rows: list[dict], top: int = 15) -> None:
+    print(f"{'module':<56}{'self s':>9}{'cum s':>9}")
+    for r in sorted(rows, key=lambda r: -r["cumulative_s"])[:top]:
+        print(f"{'  ' * r['depth'] + r['module']:<56}{r['self_s']:>9.3f}{r['cumulative_s']:>9.3f}")
+    print(f"total {total_seconds(rows):.3f}s")
@@ -0,0 +1,261 @@
+# msy/store.py
+"""Columnar month-matrix store.
+
+Every ``*_Data_Matrix.xlsx`` workbook is parsed once into three normalized
+Parquet tables (``groups``, ``categories``, ``items``) under ``.msy_cache``.
+Cached tables are keyed by the workbook's content hash, and the hash itself is
+only recomputed when the file's mtime or size changes.
+
+Amounts are parsed once here to integer cents (``Amount_Cents``, see
+``msy.money``); ``Amount`` is the same value in dollars for display. Cells
+that could not be parsed are counted per table in the manifest
+(:func:`validation_report`).
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from msy import money
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_ROOT / "data"
+CACHE_DIR = APP_ROOT / ".msy_cache"
+
+# Month workbooks are named by month only; they cover May-October 2025
+DATA_YEAR = 2025
+
+MONTH_FILE_RE = re.compile(r"^([A-Za-z]+)_Data_Matrix.*\.(xlsx|xls|csv)$", re.I)
+
+# Sheets are classified by their key column instead of by sheet name, which
+# is what used to need the October "data 1/2/3" swap on every page.
+TABLE_KEYS = {
+    "groups": "Group",
+    "categories": "Category",
+    "items": "Item Name",
+}
+VALUE_COLUMNS = ["Count", "Amount", "Amount_Cents", "Month"]
+
+# bump when the layout of the cached tables changes
+TABLE_SCHEMA = 2
+
+
+def _month_key(m: str) -> int:
+    return pd.to_datetime(m, format="%B").month
+
+
+def month_start(month: str, year: int = DATA_YEAR) -> pd.Timestamp:
+    """First day of a month label such as ``"May"``."""
+    return pd.Timestamp(year=year, month=_month_key(month), day=1)
+
+
+def discover_month_files(data_dir: Path = DATA_DIR) -> dict[str, Path]:
+    """Return {MonthName -> Path} for files that match *_Data_Matrix.* (calendar order)."""
+    mapping: dict[str, Path] = {}
+    for p in Path(data_dir).glob("*_Data_Matrix*.*"):
+        m = MONTH_FILE_RE.match(p.name)
+        if not m:
+            continue
+        mapping[m.group(1).capitalize()] = p
+    return dict(sorted(mapping.items(), key=lambda kv: _month_key(kv[0])))
+
+
+def months(data_dir: Path = DATA_DIR) -> list[str]:
+    """Month labels available in the data folder, in calendar order."""
+    return list(discover_month_files(data_dir))
+
+
+# ---------- Fingerprints ----------
+def _sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _manifest_path(cache_dir: Path) -> Path:
+    return Path(cache_dir) / "manifest.json"
+
+
+def _read_manifest(cache_dir: Path) -> dict:
+    try:
+        return json.loads(_manifest_path(cache_dir).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def atomic_write(target: Path, write) -> None:
+    """Call ``write(tmp)`` on a fresh temp file next to ``target``, then rename it into place.
+
+    Every writer gets its own temp file, so concurrent writers of one target
+    (threads or processes) race only on the final ``os.replace``: the last
+    one wins and readers never see a partial file.
+    """
+    target = Path(target)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(Path(tmp))
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _write_manifest(cache_dir: Path, manifest: dict) -> None:
+    text = json.dumps(manifest, indent=2, sort_keys=True)
+    atomic_write(_manifest_path(cache_dir), lambda tmp: tmp.write_text(text))
+
+
+def fingerprint(path: Path, manifest: dict | None = None) -> str:
+    """Content hash of ``path``, reusing the manifest entry while mtime/size are unchanged."""
+    st_ = os.stat(path)
+    entry = (manifest or {}).get(Path(path).name)
+    if entry and entry["mtime_ns"] == st_.st_mtime_ns and entry["size"] == st_.st_size:
+        return entry["sha1"]
+    return _sha1(path)
+
+
+# ---------- Normalization ----------
+def _to_number(s: pd.Series) -> pd.Series:
+    """Parse counts such as ``"8,464"`` (unparseable cells become 0)."""
+    return pd.Series(money.to_dollars(money.to_cents(s)[0]), index=s.index)
+
+
+def _classify(df: pd.DataFrame) -> str | None:
+    for table, key in TABLE_KEYS.items():
+        if key in df.columns:
+            return table
+    return None
+
+
+def _empty_table(table: str) -> pd.DataFrame:
+    return pd.DataFrame(columns=[TABLE_KEYS[table]] + VALUE_COLUMNS).astype({"Amount_Cents": "int64"})
+
+
+def normalize_sheet(df: pd.DataFrame, month_label: str) -> tuple[str, pd.DataFrame, dict] | None:
+    """Turn one raw sheet into ``(table, frame, amount_stats)``; frame has key + VALUE_COLUMNS."""
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    table = _classify(df)
+    if table is None:
+        return None
+    key = TABLE_KEYS[table]
+
+    out = pd.DataFrame({key: df[key].astype("string").fillna("").str.strip()})
+    out["Count"] = _to_number(df["Count"]) if "Count" in df.columns else 0.0
+    keep = (out[key] != "").to_numpy()
+    cents, stats = money.to_cents(df["Amount"][keep] if "Amount" in df.columns else [])
+    out = out[keep].reset_index(drop=True)
+    out["Amount_Cents"] = cents if "Amount" in df.columns else 0
+    out["Amount"] = money.to_dollars(out["Amount_Cents"])
+    out["Month"] = month_label
+    out[key] = out[key].astype(str)
+    return table, out[[key] + VALUE_COLUMNS], stats
+
+
+def parse_workbook(path: Path, month_label: str) -> tuple[dict[str, pd.DataFrame], dict[str, dict]]:
+    """Read every sheet of a month workbook (or a single CSV) into normalized tables.
+
+    Returns ``(tables, amount_stats)``, both keyed by table name.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        sheets = {"csv": pd.read_csv(path)}
+    else:
+        sheets = pd.read_excel(path, sheet_name=None, engine="openpyxl")
+
+    tables: dict[str, pd.DataFrame] = {}
+    stats: dict[str, dict] = {}
+    for raw in sheets.values():
+        parsed = normalize_sheet(raw, month_label)
+        if parsed is None:
+            continue
+        table, frame, amount_stats = parsed
+        # first sheet of a kind wins, like the old fixed sheet-name lookup
+        if table not in tables:
+            tables[table] = frame
+            stats[table] = amount_stats
+    return tables, stats
+
+
+# ---------- Ingestion ----------
+def _table_path(cache_dir: Path, sha1: str, table: str) -> Path:
+    return Path(cache_dir) / "tables" / f"{sha1}_{table}_v{TABLE_SCHEMA}.parquet"
+
+
+def ingest(data_dir: Path = DATA_DIR, cache_dir: Path = CACHE_DIR, force: bool = False) -> dict[str, str]:
+    """Convert new or changed workbooks to Parquet; return {month -> content hash}."""
+    cache_dir = Path(cache_dir)
+    (cache_dir / "tables").mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    new_manifest: dict = {}
+    hashes: dict[str, str] = {}
+
+    for month, path in discover_month_files(data_dir).items():
+        sha1 = fingerprint(path, manifest)
+        entry = manifest.get(path.name, {})
+        cached = all(_table_path(cache_dir, sha1, t).exists() for t in TABLE_KEYS)
+        amount_stats = entry.get("amount_stats") if entry.get("sha1") == sha1 else None
+        if force or not cached or amount_stats is None:
+            tables, amount_stats = parse_workbook(path, month)
+            for table in TABLE_KEYS:
+                frame = tables.get(table, _empty_table(table))
+                atomic_write(_table_path(cache_dir, sha1, table), lambda tmp: frame.to_parquet(tmp, index=False))
+
+        st_ = os.stat(path)
+        new_manifest[path.name] = {
+            "month": month,
+            "sha1": sha1,
+            "mtime_ns": st_.st_mtime_ns,
+            "size": st_.st_size,
+            "amount_stats": amount_stats,
+        }
+        hashes[month] = sha1
+
+    if new_manifest != manifest:
+        _write_manifest(cache_dir, new_manifest)
+        # drop tables of workbooks that were replaced or removed
+        live = {_table_path(cache_dir, sha1, t).name for sha1 in hashes.values() for t in TABLE_KEYS}
+        for p in (cache_dir / "tables").glob("*.parquet"):
+            if p.name not in live:
+                p.unlink(missing_ok=True)
+    return hashes
+
+
+def data_version(data_dir: Path = DATA_DIR, cache_dir: Path = CACHE_DIR) -> str:
+    """Short hash over all month workbooks; changes whenever a month is added or edited."""
+    hashes = ingest(data_dir, cache_dir)
+    blob = json.dumps([TABLE_SCHEMA, sorted(hashes.items())]).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def load_table(table: str, months: list[str] | None = None,
+               data_dir: Path = DATA_DIR, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """Concatenate one normalized table across ``months`` (all months when None)."""
+    if table not in TABLE_KEYS:
+        raise ValueError(f"Unknown table {table!r}; expected one of {list(TABLE_KEYS)}")
+    hashes = ingest(data_dir, cache_dir)
+    wanted = list(hashes) if months is None else [m for m in hashes if m in months]
+    frames = [pd.read_parquet(_table_path(cache_dir, hashes[m], table)) for m in wanted]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return _empty_table(table)
+    return pd.concat(frames, ignore_index=True)
+
+
+def validation_report(data_dir: Path = DATA_DIR, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """Amount parsing stats per month and table (parsed / missing / rejected cells)."""
+    ingest(data_dir, cache_dir)
+    rows = [
+        {"Month": entry["month"], "Table": table, **stats}
+        for entry in _read_manifest(cache_dir).values()
+        for table, stats in entry["amount_stats"].items()
+    ]
+    return pd.DataFrame(rows, columns=["Month", "Table", "cells", "parsed", "missing", "rejected",
+                                       "rejected_examples"])
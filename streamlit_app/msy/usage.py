@@ -0,0 +1,77 @@
+# msy/usage.py
+"""Ingredient usage engine.
+
+Usage for every month is one matrix product::
+
+    usage (ingredients x months) = recipe_matrix.T (ingredients x recipes)
+                                   @ sales (recipes x months)
+
+Sales rows are mapped to recipe rows through :mod:`msy.resolve`.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from msy import recipes as rec
+from msy import resolve, store
+
+
+def sales_matrix(months: list[str] | None = None, items: list[str] | None = None,
+                 recipe_path: Path = rec.RECIPE_PATH, min_score: int = resolve.MIN_SCORE,
+                 value: str = "Count") -> pd.DataFrame:
+    """Servings sold per recipe row (index) and month (columns).
+
+    ``items`` restricts the result to recipe names (case-insensitive); sales
+    rows whose fuzzy match scores below ``min_score`` are not attributed.
+    ``value="Amount"`` sums the sales amount instead of the servings.
+    """
+    recipes = rec.load_recipes(recipe_path)
+    months = store.months() if months is None else [m for m in store.months() if m in months]
+
+    sales = store.load_table("items", months)
+    index = resolve.resolve_items(sales["Item Name"].unique(), recipe_path)
+    index = index[(index["recipe_id"] >= 0) & (index["score"] >= min_score)]
+    sales = sales.merge(index[["raw_name", "recipe_id"]], left_on="Item Name", right_on="raw_name")
+
+    counts = sales.pivot_table(index="recipe_id", columns="Month", values=value, aggfunc="sum")
+    counts = counts.reindex(index=recipes.index, columns=months).fillna(0.0)
+    counts.index = recipes["Item name"]
+    counts.columns.name = None
+
+    if items is not None:
+        wanted = {i.strip().lower() for i in items}
+        counts = counts[counts.index.str.lower().isin(wanted)]
+    return counts
+
+
+def usage(months: list[str] | None = None, items: list[str] | None = None, unit: str = "lbs",
+          recipe_path: Path = rec.RECIPE_PATH, min_score: int = resolve.MIN_SCORE) -> pd.DataFrame:
+    """Ingredient usage (index) per month (columns) in ``unit`` ("g" or "lbs").
+
+    Count ingredients (eggs, wings, ...) always stay in counts.
+    """
+    recipes = rec.load_recipes(recipe_path)
+    ingredients = rec.ingredient_names(recipes)
+    matrix = rec.recipe_matrix(recipes, unit)
+
+    counts = sales_matrix(months, None, recipe_path, min_score)
+    if items is not None:
+        wanted = {i.strip().lower() for i in items}
+        keep = recipes["Item name"].str.lower().isin(wanted).to_numpy()
+        matrix = matrix * keep[:, None]
+
+    values = matrix.T @ counts.to_numpy(dtype=float)
+    return pd.DataFrame(values, index=ingredients, columns=counts.columns)
+
+
+def usage_long(months: list[str] | None = None, items: list[str] | None = None,
+               unit: str = "lbs", recipe_path: Path = rec.RECIPE_PATH) -> pd.DataFrame:
+    """``usage`` as rows of Ingredient / Month / Date / Usage / Unit."""
+    wide = usage(months, items, unit, recipe_path)
+    out = wide.rename_axis("Ingredient").reset_index().melt(
+        id_vars="Ingredient", var_name="Month", value_name="Usage"
+    )
+    out["Date"] = out["Month"].map(store.month_start)
+    out["Unit"] = out["Ingredient"].map(lambda ing: rec.unit_label(ing, unit))
+    return out
+
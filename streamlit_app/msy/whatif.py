@@ -0,0 +1,136 @@
+# msy/whatif.py
+"""What-if scenarios on menu demand.
+
+A :class:`Scenario` holds one month's servings per recipe, the average price
+per serving and the delivery-calendar supply. Changing a recipe's demand
+multiplier is a rank-1 update::
+
+    usage[cols] += recipe_matrix[recipe, cols] * servings[recipe] * (new - old)
+
+where ``cols`` are only the ingredients that recipe uses, and revenue moves
+by ``price * servings * (new - old)``. Nothing else is recomputed, so a
+slider move costs microseconds; pages keep the scenario in session state
+and call :meth:`Scenario.apply` with the current multipliers.
+
+History months use actual servings; later months use the dashboard
+forecaster's servings forecast (:func:`msy.risk.servings_forecast`).
+"""
+import numpy as np
+import pandas as pd
+
+from msy import cache, cube, risk, shipments, store, usage
+from msy import forecast as fc
+from msy import recipes as rec
+
+DEFAULT_PERIODS = 3
+
+RESULT_COLUMNS = [
+    "Ingredient", "Unit", "Baseline Usage", "Scenario Usage", "Change", "Supply", "Surplus", "Status",
+]
+
+
+@cache.cached("whatif.baseline")
+def baseline(periods: int = DEFAULT_PERIODS) -> dict:
+    """Servings per recipe x month (actuals, then forecast), price per serving and other revenue per month."""
+    counts = usage.sales_matrix()
+    amounts = usage.sales_matrix(value="Amount")
+    months = list(counts.columns)
+    dates = [store.month_start(m) for m in months]
+
+    rows = risk.servings_forecast(fc.get_forecaster(fc.DASHBOARD_BACKEND), periods)
+    future = rows[rows["ds"] > max(dates)].pivot(index="Ingredient", columns="ds", values="yhat")
+    future = future.reindex(counts.index).fillna(0.0)
+
+    servings = pd.concat([counts.set_axis(dates, axis=1), future], axis=1)
+    price = (amounts.sum(axis=1) / counts.sum(axis=1).replace(0, np.nan)).fillna(0.0)
+
+    # revenue of items outside the recipe sheet (drinks, sides): last actual month carried forward
+    total = cube.load_cube().query("group", "amount", months).sum(axis=0).to_numpy()
+    other = total - amounts.sum(axis=0).to_numpy()
+    other = np.concatenate([other, np.full(len(future.columns), other[-1])])
+    return {
+        "servings": servings,
+        "price": price,
+        "other_revenue": pd.Series(other, index=servings.columns),
+        "actual_months": len(dates),
+    }
+
+
+class Scenario:
+    """One month's usage, revenue and shortfall under per-recipe demand multipliers."""
+
+    def __init__(self, servings: pd.Series, price: pd.Series, supply: pd.Series, other_revenue: float = 0.0,
+                 recipes: pd.DataFrame | None = None):
+        recipes = rec.load_recipes() if recipes is None else recipes
+        self.recipes = list(servings.index)
+        self.ingredients = rec.ingredient_names(recipes)
+        self.matrix = rec.recipe_matrix(recipes, unit="lbs")  # recipes x ingredients
+        self.uses = [np.flatnonzero(row) for row in self.matrix]
+        self.servings = servings.to_numpy(dtype=float)
+        self.price = price.reindex(servings.index).fillna(0.0).to_numpy(dtype=float)
+        self.supply = supply.reindex(self.ingredients).to_numpy(dtype=float)  # NaN: no shipment line
+        self.other_revenue = float(other_revenue)
+
+        self.baseline_usage = self.matrix.T @ self.servings
+        self.baseline_revenue = float(self.price @ self.servings) + self.other_revenue
+        self.multipliers = np.ones(len(self.recipes))
+        self.usage = self.baseline_usage.copy()
+        self.revenue = self.baseline_revenue
+        self._pos = {name: i for i, name in enumerate(self.recipes)}
+
+    @classmethod
+    def for_month(cls, date, periods: int = DEFAULT_PERIODS) -> "Scenario":
+        """Scenario for the month starting at ``date`` (actual or forecast)."""
+        base = baseline(periods)
+        date = pd.Timestamp(date)
+        supply = shipments.supply(date, date + pd.offsets.MonthEnd(0), "month", "lbs")
+        return cls(base["servings"][date], base["price"], supply.iloc[:, 0], base["other_revenue"][date])
+
+    def adjust(self, recipe: str, multiplier: float) -> np.ndarray:
+        """Set one recipe's demand multiplier (0 drops it); returns the ingredient columns touched."""
+        if recipe not in self._pos:
+            raise ValueError(f"Unknown recipe {recipe!r}; expected one of {self.recipes}")
+        r = self._pos[recipe]
+        delta = float(multiplier) - self.multipliers[r]
+        cols = self.uses[r]
+        if delta:
+            self.usage[cols] += self.matrix[r, cols] * (self.servings[r] * delta)
+            self.revenue += self.price[r] * self.servings[r] * delta
+            self.multipliers[r] = multiplier
+        return cols
+
+    def apply(self, multipliers: dict[str, float]) -> set[str]:
+        """Move to ``multipliers`` (recipes not listed go back to 1); only changed recipes are updated.
+
+        Returns the ingredients whose usage changed.
+        """
+        target = np.ones(len(self.recipes))
+        for recipe, m in multipliers.items():
+            if recipe not in self._pos:
+                raise ValueError(f"Unknown recipe {recipe!r}; expected one of {self.recipes}")
+            target[self._pos[recipe]] = m
+        touched = set()
+        for r in np.flatnonzero(target != self.multipliers):
+            touched.update(self.ingredients[c] for c in self.adjust(self.recipes[r], target[r]))
+        return touched
+
+    def reset(self) -> None:
+        self.apply({})
+
+    def result(self) -> pd.DataFrame:
+        """``RESULT_COLUMNS`` per ingredient, shortfalls first."""
+        surplus = self.supply - self.usage
+        status = np.select(
+            [np.isnan(self.supply), surplus < 0], ["No Supply Data", "⚠️ Shortfall"], default="✅ Sufficient"
+        )
+        out = pd.DataFrame({
+            "Ingredient": self.ingredients,
+            "Unit": [rec.unit_label(ing, "lbs") for ing in self.ingredients],
+            "Baseline Usage": self.baseline_usage,
+            "Scenario Usage": self.usage,
+            "Change": self.usage - self.baseline_usage,
+            "Supply": self.supply,
+            "Surplus": surplus,
+            "Status": status,
+        })
+        return out.sort_values("Surplus", na_position="last").reset_index(drop=True)[RESULT_COLUMNS]
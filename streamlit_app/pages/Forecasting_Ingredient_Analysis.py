@@ -2,23 +2,33 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import re
+from msy import artifacts, cache, constraints, forecast
 
 # PAGE CONFIGURATION
 st.set_page_config(layout="wide", page_title="Ingredient Demand Forecast Viewer")
 
-# --- Configuration ---
-# Updated to match the name of the file created by the forecasting script
-CSV_FILEPATH = r"C:\Users\emily\Documents\Datathon\tamu-datathon-project\streamlit_app\pages\Predictive_Analysis\ingredient_forecast_with_constraints.csv"
-# Assuming 6 historical data points (May through October 2025)
-HISTORICAL_MONTHS = 6 
+# --- DATA LOADING AND PREPROCESSING ---
+@st.cache_data
+def refresh_forecasts(data_version):
+    """Forecasts ingredients with new inputs into the artifact store (``msy.artifacts``).
+
+    Uses the dashboard backend (``msy.forecast.DASHBOARD_BACKEND``); ingredients
+    already forecast by the batch job keep their stored run.
+    """
+    artifacts.update(forecast.get_forecaster(forecast.DASHBOARD_BACKEND))
+    return artifacts.version()
 
 
-# --- DATA LOADING AND PREPROCESSING ---
 @st.cache_data
-def load_data():
-    """Loads, cleans, and pre-processes the ingredient forecast data."""
+def load_ingredient_names(artifact_version):
+    return artifacts.ingredients()
+
+
+@st.cache_data
+def load_data(ingredient, artifact_version):
+    """Loads and pre-processes the forecast partition of a single ingredient."""
     try:
-        df = pd.read_csv(CSV_FILEPATH)
+        df = artifacts.load_ingredient(ingredient)
 
         # Rename columns to standardized, easier-to-use names
         df = df.rename(columns={
@@ -39,13 +49,9 @@ def load_data():
         df['ds'] = pd.to_datetime(df['ds'])
 
         # Determine the period for visualization
-        df['period'] = df.groupby('ingredient').cumcount()
-        df['period'] = df['period'].apply(lambda x: 'Historical Proxy' if x < HISTORICAL_MONTHS else 'Future Forecast')
+        df['period'] = (df['action_required'] == constraints.HISTORICAL).map({True: 'Historical Proxy', False: 'Future Forecast'})
         
         return df
-    except FileNotFoundError:
-        st.error(f"Error: The file '{CSV_FILEPATH}' was not found. Please ensure it is available.")
-        return pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading or processing data: {e}")
         return pd.DataFrame()
@@ -137,20 +143,22 @@ def calculate_metrics(df_filtered):
 
 # --- STREAMLIT APP LAYOUT ---
 if __name__ == "__main__":
-    df = load_data()
+    artifact_version = refresh_forecasts(cache.data_version())
+    ingredient_names = load_ingredient_names(artifact_version)
 
     st.title("Ingredient Demand Forecast & Constraint Analysis")
     st.markdown("Use this dashboard to check future demand for ingredients and see if your current shipment schedule is sufficient to cover it.")
 
-    if not df.empty:
+    if ingredient_names:
         # Ingredient Selection (The Dropdown) 
-        default_ingredient = 'braised beef used (g)' if 'braised beef used (g)' in df['ingredient'].unique() else df['ingredient'].iloc[0]
+        default_ingredient = 'braised beef used (g)' if 'braised beef used (g)' in ingredient_names else ingredient_names[0]
         
         selected_ingredient = st.selectbox(
             "**Select Ingredient to Analyze:**", 
-            df['ingredient'].unique().tolist(),
-            index=df['ingredient'].unique().tolist().index(default_ingredient) if default_ingredient in df['ingredient'].unique() else 0
+            ingredient_names,
+            index=ingredient_names.index(default_ingredient)
         )
+        df = load_data(selected_ingredient, artifact_version)
 
         st.markdown("---")
         
@@ -217,7 +225,5 @@ if __name__ == "__main__":
                 use_container_width=True
             )
 
-    elif df.empty:
-        st.warning(f"Data could not be loaded. Please ensure the required CSV file ('{CSV_FILEPATH}') is correctly formatted and available.")
     else:
-        st.info("The loaded data set appears to be empty or missing sufficient ingredient information to perform the analysis.")
\ No newline at end of file
+        st.warning("No ingredient forecasts are available yet. Run `python -m msy precompute` from `streamlit_app` first.")
\ No newline at end of file
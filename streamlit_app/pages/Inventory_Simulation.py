@@ -0,0 +1,108 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+from msy import artifacts, inventory, risk
+
+st.set_page_config(page_title="Inventory Simulation", layout="wide")
+st.title("Inventory Simulation")
+st.caption(
+    "On-hand stock stepped through the delivery calendar against forecast demand, "
+    "so stockouts between biweekly and monthly deliveries show up."
+)
+
+
+@st.cache_data
+def load_table(artifact_version):
+    """Latest constraint table from the forecast artifact store."""
+    return artifacts.load_latest()
+
+
+table = load_table(artifacts.version())
+if table.empty:
+    st.error("No forecasts found. Run `python -m msy precompute` from `streamlit_app` first.")
+    st.stop()
+
+# --- Sidebar ---
+months = sorted(pd.to_datetime(table["Date"]).unique())
+forecast_start, _ = inventory.forecast_window(table)
+if pd.isna(forecast_start):
+    st.info("The latest forecasts have no future months. Run `python -m msy precompute` after the next month lands.")
+    st.stop()
+start_m, end_m = st.sidebar.select_slider(
+    "Months",
+    options=months,
+    value=(forecast_start, months[-1]),
+    format_func=lambda m: m.strftime("%b %Y"),
+)
+step = st.sidebar.radio("Step", inventory.STEPS, format_func=str.title, horizontal=True)
+cover_days = st.sidebar.slider("Starting stock (days of demand)", 0, 30, inventory.DEFAULT_COVER_DAYS)
+
+# --- Simulation ---
+levels, report = inventory.run(start_m, end_m + pd.offsets.MonthEnd(0), step, cover_days, table)
+
+short = report["First Stockout"].notna().sum()
+c1, c2 = st.columns(2)
+c1.metric("Ingredients that run out", f"{short} of {len(report)}")
+c2.metric("First stockout", report["First Stockout"].min().strftime("%b %d, %Y") if short else "None")
+
+st.subheader("Stockout Report")
+st.dataframe(
+    report.style.format({
+        "Start On Hand": "{:,.1f}", "Min On Hand": "{:,.1f}", "Unmet Demand": "{:,.1f}",
+        "End On Hand": "{:,.1f}", "First Stockout": lambda d: "" if pd.isna(d) else d.strftime("%Y-%m-%d"),
+    }),
+    use_container_width=True, hide_index=True,
+)
+
+# --- On-hand chart ---
+ingredient = st.selectbox("Ingredient", report["Ingredient"])
+unit = report.loc[report["Ingredient"] == ingredient, "Unit"].iat[0]
+data = levels[levels["Ingredient"] == ingredient]
+
+base = alt.Chart(data).encode(x=alt.X("Date:T", title="Date"))
+on_hand = base.mark_line(color="#750e2b", strokeWidth=2, interpolate="step-after").encode(
+    y=alt.Y("On Hand:Q", title=f"On Hand ({unit})"),
+    tooltip=[
+        alt.Tooltip("Date:T", format="%Y-%m-%d"),
+        alt.Tooltip("On Hand:Q", format=",.1f"),
+        alt.Tooltip("Demand:Q", format=",.1f"),
+        alt.Tooltip("Supply:Q", format=",.1f"),
+        alt.Tooltip("Unmet:Q", title="Unmet so far", format=",.1f"),
+    ],
+)
+deliveries = base.transform_filter(alt.datum.Supply > 0).mark_tick(color="#2b8a3e", thickness=2).encode(
+    y=alt.Y("On Hand:Q")
+)
+layers = [on_hand, deliveries]
+first = report.loc[report["Ingredient"] == ingredient, "First Stockout"].iat[0]
+if pd.notna(first):
+    layers.append(
+        alt.Chart(pd.DataFrame({"Date": [first]})).mark_rule(color="#D41919", strokeDash=[6, 4]).encode(x="Date:T")
+    )
+st.altair_chart(alt.layer(*layers).properties(height=420), use_container_width=True)
+
+# --- Shortfall risk ---
+st.subheader("Shortfall Risk")
+st.caption(
+    "Monte Carlo over servings scenarios drawn from the forecast intervals (or bootstrapped residuals), "
+    "pushed through the recipes and compared with each month's deliveries."
+)
+r1, r2 = st.columns(2)
+method = r1.radio("Scenarios from", risk.METHODS, format_func=str.title, horizontal=True)
+scenarios = r2.select_slider("Scenarios", options=[1_000, 5_000, 10_000, 20_000], value=risk.DEFAULT_SCENARIOS)
+
+risk_df = risk.shortfall_risk(3, scenarios, method)
+risk_df = risk_df[risk_df["P(Shortfall So Far)"] > 0].sort_values(
+    ["P(Shortfall So Far)", "Expected Unmet"], ascending=False
+)
+if risk_df.empty:
+    st.success("No ingredient ran short in any scenario.")
+else:
+    st.dataframe(
+        risk_df.style.format({
+            "Date": lambda d: d.strftime("%b %Y"), "Supply": "{:,.1f}", "Mean Demand": "{:,.1f}",
+            "P(Shortfall)": "{:.0%}", "P(Shortfall So Far)": "{:.0%}", "Expected Unmet": "{:,.1f}",
+            "Unmet P95": "{:,.1f}",
+        }),
+        use_container_width=True, hide_index=True,
+    )
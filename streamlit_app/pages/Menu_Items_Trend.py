@@ -1,51 +1,22 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import os
+from msy import anomalies, datasets
 
 st.set_page_config(page_title="Menu Item Trends", layout="wide")
 st.title("Menu Item Popularity Trends")
 
-dataset_folder = "data"
-MONTH_ORDER = ["May", "June", "July", "August", "September", "October"]
-
-@st.cache_data
-def load_monthly_sales(dataset_folder):
-    monthly_sales = {}
-
-    for file in sorted(os.listdir(dataset_folder)):
-        if not file.endswith(".xlsx"):
-            continue
-        file_path = os.path.join(dataset_folder, file)
-        sheet = "data 2" if "October" in file else "data 3"
-        try:
-            sales_df = pd.read_excel(file_path, sheet_name=sheet)
-        except:
-            continue
-
-        sales_df.columns = [c.strip() for c in sales_df.columns]
-        item_col = next((c for c in sales_df.columns if 'item' in c.lower() and 'name' in c.lower()), None)
-        count_col = next((c for c in sales_df.columns if 'count' in c.lower()), None)
-        if item_col is None or count_col is None:
-            continue
-
-        sales_df[item_col] = sales_df[item_col].astype(str).str.strip().str.lower()
-        sales_df[count_col] = pd.to_numeric(sales_df[count_col], errors='coerce').fillna(0)
-        month_name = file.split("_")[0]
-
-        for _, row in sales_df.iterrows():
-            item = row[item_col]
-            count = row[count_col]
-            monthly_sales.setdefault(item, {})[month_name] = monthly_sales.get(item, {}).get(month_name, 0) + count
-
-    if not monthly_sales:
+def load_monthly_sales():
+    """Item x month sales counts, prebuilt from the month cube (see msy.datasets)."""
+    monthly_df = datasets.monthly_item_counts()
+    if monthly_df.empty:
         return None
 
-    monthly_df = pd.DataFrame(monthly_sales).fillna(0).T
-    monthly_df = monthly_df.reindex(columns=MONTH_ORDER, fill_value=0)
+    monthly_df.index.name = None
+    monthly_df.columns.name = None
     return monthly_df
 
-monthly_df = load_monthly_sales(dataset_folder)
+monthly_df = load_monthly_sales()
 if monthly_df is None or monthly_df.empty:
     st.error("No data loaded. Check your dataset folder.")
     st.stop()
@@ -99,5 +70,31 @@ for item in declining_items.index:
     st.markdown(f"**{item.title()}** (Total Decrease: {declining_items[item]:.0f})")
     st.dataframe(monthly_df_diff.loc[item])
 
+st.subheader("🚨 Anomaly Alerts")
+st.caption(
+    "Every item and category series scored at once: months that move against the rest of the menu "
+    "(robust z-score of the log series after the common month effect), odd unit prices and missing months."
+)
+alerts = anomalies.alerts()
+a1, a2 = st.columns(2)
+dimension = a1.radio("Series", anomalies.DIMENSIONS, format_func=str.title, horizontal=True)
+kinds = a2.multiselect("Kinds", sorted(alerts["Kind"].unique()), default=sorted(alerts["Kind"].unique()))
+shown = alerts[(alerts["Dimension"] == dimension) & alerts["Kind"].isin(kinds)].drop(columns="Dimension")
+if shown.empty:
+    st.success("No anomalies for this selection.")
+else:
+    st.dataframe(
+        shown.style.format({"Value": "{:,.2f}", "Expected": "{:,.2f}", "Score": "{:+.1f}"}),
+        use_container_width=True, hide_index=True,
+    )
+
+duplicates = anomalies.duplicates()
+if not duplicates.empty:
+    st.markdown("**Possible duplicate spellings** (likely data errors: sales split across two names)")
+    st.dataframe(
+        duplicates.style.format({"Similarity": "{:.0f}", "Count": "{:,.0f}", "Other Count": "{:,.0f}"}),
+        use_container_width=True, hide_index=True,
+    )
+
 with st.expander("📄 View Full Monthly Sales Table"):
     st.dataframe(monthly_df)
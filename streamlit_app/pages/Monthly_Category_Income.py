@@ -1,9 +1,8 @@
 # pages/Monthly_Shipments.py
-import re
-from pathlib import Path
 import pandas as pd
 import streamlit as st
 import altair as alt
+from msy import cube, store
 
 st.set_page_config(page_title="Monthly Matrix • Data 1 & Data 2", layout="wide")
 
@@ -23,75 +22,10 @@ D2_CATEGORIES = [
     "Tossed Rice Noodle", "Wonton"
 ]
 
-# Resolve ../data relative to this page
-DATA_DIR = (Path(__file__).parent.parent / "data").resolve()
-MONTH_FILE_RE = re.compile(r"^([A-Za-z]+)_Data_Matrix\.(xlsx|xls|csv)$", re.I)
+DATA_DIR = store.DATA_DIR
 
-def _month_key(m: str) -> int:
-    return pd.to_datetime(m, format="%B").month
-
-def discover_month_files() -> dict[str, Path]:
-    """Return {MonthName -> Path} for files that match *_Data_Matrix.* (calendar order)."""
-    mapping: dict[str, Path] = {}
-    for p in DATA_DIR.glob("*_Data_Matrix.*"):
-        m = MONTH_FILE_RE.match(p.name)
-        if not m:
-            continue
-        month_name = m.group(1).capitalize()
-        mapping[month_name] = p
-    return dict(sorted(mapping.items(), key=lambda kv: _month_key(kv[0])))
-
-# ---------- Loaders with October swap ----------
-@st.cache_data(show_spinner=False)
-def load_data1_for_month(path: Path, month_label: str) -> pd.DataFrame:
-    """Load Data 1, except for October where we take 'data 3'."""
-    sheet_name = "data 3" if month_label.lower() == "october" else "data 1"
-    if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)  # CSV: assume correct format
-    else:
-        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-    df.columns = [c.strip() for c in df.columns]
-
-    required = {"Group", "Amount"}
-    if not required.issubset(df.columns):
-        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name})")
-
-    out = df[["Group", "Amount"]].copy()
-    out["Amount"] = (
-        out["Amount"].astype("string")
-        .str.replace(r"[\$,]", "", regex=True)
-        .replace({"": "0", pd.NA: "0"})
-    ).astype(float)
-    out["Group"] = out["Group"].astype("string").fillna("").str.strip()
-    out["Month"] = month_label
-    return out
-
-@st.cache_data(show_spinner=False)
-def load_data2_for_month(path: Path, month_label: str) -> pd.DataFrame:
-    """Load Data 2, except for October where we take 'data 1'."""
-    sheet_name = "data 1" if month_label.lower() == "october" else "data 2"
-    if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)
-    else:
-        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-    df.columns = [c.strip() for c in df.columns]
-
-    required = {"Category", "Count", "Amount"}
-    if not required.issubset(df.columns):
-        missing = required - set(df.columns)
-        raise ValueError(f"Missing one of {required} in {path.name} ({sheet_name}). Missing: {missing}")
-
-    out = df[["Category", "Count", "Amount"]].copy()
-    out["Category"] = out["Category"].astype("string").fillna("").str.strip()
-    out["Count"] = pd.to_numeric(out["Count"], errors="coerce").fillna(0)
-    out["Amount"] = (
-        out["Amount"].astype("string")
-        .str.replace(r"[\$,]", "", regex=True)
-        .replace({"": "0", pd.NA: "0"})
-    )
-    out["Amount"] = pd.to_numeric(out["Amount"], errors="coerce").fillna(0.0)
-    out["Month"] = month_label
-    return out
+# ---------- Aggregates (month x group/category cube, see msy.cube) ----------
+month_cube = cube.load_cube(store.data_version())
 
 # ---------- UI ----------
 tabs = st.tabs(["Data 1 — Stacked Revenue", "Data 2 — Category Pies"])
@@ -106,11 +40,10 @@ with tabs[0]:
         """, unsafe_allow_html=True
     )
 
-    month_to_path = discover_month_files()
-    if not month_to_path:
+    months_all = month_cube.months
+    if not months_all:
         st.error(f"No files found in {DATA_DIR}")
         st.stop()
-    months_all = list(month_to_path.keys())
 
     st.caption("Choose the month range for Data 1:")
     start_m, end_m = st.select_slider(
@@ -118,9 +51,7 @@ with tabs[0]:
         value=(months_all[0], months_all[-1]),
         label_visibility="collapsed",
     )
-    i0, i1 = months_all.index(start_m), months_all.index(end_m)
-    lo, hi = sorted([i0, i1])
-    months_d1 = months_all[lo:hi+1]
+    months_d1 = month_cube.month_range(start_m, end_m)
 
     with st.expander("Advanced groups (optional)"):
         d1_groups = st.multiselect("Stack segments", D1_GROUPS, default=D1_GROUPS)
@@ -129,19 +60,12 @@ with tabs[0]:
             d1_groups = D1_GROUPS[:]
     color_scale = alt.Scale(domain=d1_groups, range=D1_COLORS[:len(d1_groups)])
 
-    # Load & combine
-    frames1 = [load_data1_for_month(month_to_path[m], m) for m in months_d1]
-    d1 = pd.concat(frames1, ignore_index=True) if frames1 else pd.DataFrame(columns=["Group","Amount","Month"])
-
-    pivot = (
-        d1.groupby(["Month", "Group"], as_index=False)["Amount"].sum()
-          .pivot(index="Month", columns="Group", values="Amount")
-    )
-    pivot = pivot.reindex(index=months_d1).reindex(columns=d1_groups).fillna(0.0)
+    # Slice the cube: months x groups
+    pivot = month_cube.query("group", "amount", months=(start_m, end_m), members=d1_groups).T
+    pivot.columns.name = "Group"
 
-    long = pivot.reset_index().melt(id_vars="Month", var_name="Group", value_name="Amount")
-    tot = long.groupby("Month", as_index=False)["Amount"].sum().rename(columns={"Amount": "Total"})
-    long = long.merge(tot, on="Month", how="left")
+    long = pivot.stack().rename("Amount").reset_index()
+    long["Total"] = long["Month"].map(pivot.sum(axis=1))
 
     chart = (
         alt.Chart(long)
@@ -181,8 +105,7 @@ with tabs[1]:
         """, unsafe_allow_html=True
     )
 
-    month_to_path = discover_month_files()
-    months_all = list(month_to_path.keys())
+    months_all = month_cube.months
     if not months_all:
         st.error(f"No files found in {DATA_DIR}")
         st.stop()
@@ -226,19 +149,13 @@ with tabs[1]:
         per_row = 2
 
     with right:
-        frames2 = [load_data2_for_month(month_to_path[m], m) for m in m_sel]
-        d2 = pd.concat(frames2, ignore_index=True) if frames2 else pd.DataFrame(columns=["Category","Count","Amount","Month"])
-        d2["Category"] = d2["Category"].astype("string").fillna("").str.strip()
-        if cats_selected:
-            d2 = d2[d2["Category"].isin(cats_selected)]
-        else:
-            d2 = d2.iloc[0:0]
+        d2 = month_cube.long("category", months=m_sel, members=cats_selected).rename(columns={"category": "Category"})
         d2 = d2[d2["Amount"] > 0]
 
         if d2.empty:
             st.info("No data for the chosen filters.")
         else:
-            agg = d2.groupby(["Month", "Category"], as_index=False)[["Amount", "Count"]].sum()
+            agg = d2
             for i in range(0, len(m_sel), per_row):
                 row = st.columns(per_row, gap="large")
                 for col, month in zip(row, m_sel[i:i+per_row]):
@@ -1,58 +1,46 @@
 import streamlit as st
-import pandas as pd
-import networkx as nx
-from pyvis.network import Network
-import tempfile
-import os
+from msy import criticality, cube, network
 
 st.set_page_config(page_title="Menu Ingredient Network", layout="wide")
-st.title("Menu Item - Ingredient Network for May")
-
-min_qty = 10
-top_n_items = 10 
-
-excel_file = "data/May_Data_Matrix.xlsx"
-sheet_name = 'data 3'
-ingredient_file = "data/MSY Data - Ingredient.csv"
-
-sales_df = pd.read_excel(excel_file, sheet_name=sheet_name)
-sales_df['Count'] = pd.to_numeric(sales_df['Count'], errors='coerce')
-sales_df['item_name'] = sales_df['Item Name'].str.lower().str.strip()
-
-top_items = sales_df.sort_values('Count', ascending=False).head(top_n_items)
-
-ingredients_df = pd.read_csv(ingredient_file)
-ingredients_df['item_name'] = ingredients_df['Item name'].str.lower().str.strip()
-
-merged_df = pd.merge(top_items, ingredients_df, on='item_name', how='left')
-
-ingredient_cols = [col for col in ingredients_df.columns if col.lower() not in ['item name', 'item_name']]
-
-G = nx.Graph()
-
-for _, row in merged_df.iterrows():
-    item = row['item_name']
-    G.add_node(item, color='orange', size=25, title=f"{item}")
-
-    for ing in ingredient_cols:
-        qty = pd.to_numeric(row[ing], errors='coerce')
-        if pd.notnull(qty) and qty >= min_qty:
-            if not G.has_node(ing):
-                G.add_node(ing, color='lightblue', size=15, title=f"{ing}")
-            G.add_edge(item, ing, value=qty, title=f"{qty} units")
-
-net = Network(height="750px", width="100%", notebook=False, bgcolor="#ffffff", font_color="black")
-net.from_nx(G)
-
-with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp_file:
-    tmp_path = tmp_file.name
-    net.write_html(tmp_path)
-
-    st.components.v1.html(
-        open(tmp_path, 'r', encoding='utf-8').read(),
-        height=750,
-        scrolling=True
-    )
-
-os.remove(tmp_path)
 
+# --- Parameters ---
+months_all = cube.load_cube().months
+if not months_all:
+    st.error("No month data found.")
+    st.stop()
+
+st.sidebar.header("Network Options")
+start_m, end_m = st.sidebar.select_slider(
+    "Months", options=months_all, value=(months_all[0], months_all[0])
+)
+months = (start_m, end_m)
+
+items = network.item_counts(months)
+show_all = st.sidebar.checkbox(f"Show the full menu ({len(items)} items)", value=False)
+top_n_items = None if show_all else st.sidebar.slider(
+    "Top items by sales", 1, max(len(items), 1), min(network.DEFAULT_TOP_N, max(len(items), 1))
+)
+min_qty = st.sidebar.slider(
+    "Minimum quantity per serving (g or count)", 0.0, 300.0, network.DEFAULT_MIN_QTY, step=5.0
+)
+
+label = start_m if start_m == end_m else f"{start_m}–{end_m}"
+st.title(f"Menu Item - Ingredient Network for {label}")
+
+# HTML is built once per parameter set and served from the shared cache
+html = network.network_html(months, top_n_items, min_qty)
+st.components.v1.html(html, height=750, scrolling=True)
+
+# --- Supply risk ---
+st.subheader(f"Ingredient Supply Risk for {label}")
+st.caption(
+    "Revenue at risk is what the items containing an ingredient sold: the sales lost if it ran out. "
+    "Clusters group ingredients that share best-selling items."
+)
+st.dataframe(
+    criticality.ranking(months).style.format({
+        "Grams Sold": "{:,.0f}", "Revenue at Risk ($)": "${:,.2f}", "Revenue Share (%)": "{:.1f}%",
+        "Criticality": "{:.2f}",
+    }),
+    use_container_width=True, hide_index=True,
+)
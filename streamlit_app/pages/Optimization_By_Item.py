@@ -3,121 +3,35 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import re
-import os
+from msy import datasets, menu_mix, store, whatif
 
 st.set_page_config(page_title="Optimization Dashboard", layout="wide")
 
 st.sidebar.title("⚙️ Optimization Mode")
 mode = st.sidebar.selectbox(
     "Choose Optimization Type:",
-    ["Item Optimization", "Ingredient Optimization"]
+    ["Item Optimization", "Ingredient Optimization", "Menu Mix Optimization"]
 )
 
 # ITEM OPTIMIZATION
-@st.cache_data
-def load_month_data(file_path, sheet_name, month_name):
-    """Loads Excel data for one month and cleans it."""
-    try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-    except Exception as e:
-        st.warning(f"⚠️ Could not load {file_path}: {e}")
-        return None
-
-    item_col = next((col for col in df.columns if 'item' in col.lower()), None)
-    amount_col = next((col for col in df.columns if 'amount' in col.lower()), None)
-    if not item_col or not amount_col:
-        st.warning(f"⚠️ Missing columns in {file_path}")
-        return None
-
-    df[amount_col] = pd.to_numeric(df[amount_col].replace('[\$,]', '', regex=True), errors='coerce')
-    df = df[df[amount_col].notna() & (df[amount_col] != 0)]
-    df = df[[item_col, amount_col]].rename(columns={item_col: 'Item Name', amount_col: 'Amount'})
-    df['Month'] = month_name
-    return df
-
-
-files = [
-    ("data/May_Data_Matrix.xlsx", "data 3", "May"),
-    ("data/June_Data_Matrix.xlsx", "data 3", "June"),
-    ("data/July_Data_Matrix.xlsx", "data 3", "July"),
-    ("data/August_Data_Matrix.xlsx", "data 3", "August"),
-    ("data/September_Data_Matrix.xlsx", "data 3", "September"),
-    ("data/October_Data_Matrix.xlsx", "data 2", "October"),
-]
-
-dfs = [load_month_data(path, sheet, name) for path, sheet, name in files if os.path.exists(path)]
-dfs = [df for df in dfs if df is not None]
+def load_month_data(month_name):
+    """One month of cleaned item sales (None when the month has no rows)."""
+    df = item_sales[item_sales['Month'] == month_name]
+    return None if df.empty else df.reset_index(drop=True)
+
+
+month_names = store.months()
+item_sales = datasets.item_sales()
+
+dfs = [df for df in (load_month_data(name) for name in month_names) if df is not None]
 
 
 # INGREDIENT OPTIMIZATION
-@st.cache_data
 def load_ingredient_data():
-    """Loads and processes ingredient-level optimization."""
-    ingredient_df = pd.read_csv("data/MSY Data - Ingredient.csv")
-    ingredient_df.columns = ingredient_df.columns.str.strip()
-    ingredient_df['Item name'] = ingredient_df['Item name'].str.strip().str.lower()
-
-    month_files = [
-        ("data/May_Data_Matrix.xlsx", "data 3", "May"),
-        ("data/June_Data_Matrix.xlsx", "data 3", "June"),
-        ("data/July_Data_Matrix.xlsx", "data 3", "July"),
-        ("data/August_Data_Matrix.xlsx", "data 3", "August"),
-        ("data/September_Data_Matrix.xlsx", "data 3", "September"),
-        ("data/October_Data_Matrix.xlsx", "data 2", "October"),
-    ]
-
-    monthly_dfs = []
-    for file_path, sheet_name, month_name in month_files:
-        if not os.path.exists(file_path):
-            continue
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-        item_col = next((col for col in df.columns if 'item' in col.lower()), None)
-        amount_col = next((col for col in df.columns if 'amount' in col.lower()), None)
-        if not item_col or not amount_col:
-            continue
-        df[amount_col] = pd.to_numeric(df[amount_col].replace('[\$,]', '', regex=True), errors='coerce')
-        df = df[df[amount_col].notna() & (df[amount_col] != 0)]
-        df = df[[item_col, amount_col]].rename(columns={item_col: 'Item Name', amount_col: 'Amount'})
-        df['Month'] = month_name
-        df['Item Name'] = df['Item Name'].str.strip().str.lower()
-        monthly_dfs.append(df)
-
-    combined_df = pd.concat(monthly_dfs, ignore_index=True)
-
-    special_matches = {
-        "fried wings": ["chicken wings", "fried chicken", "crunch chicken"],
-        "chicken cutlet": ["chicken cutlet"],
-        "beef tossed rice noodles": ["beef tossed rice noodle"],
-        "pork tossed rice noodles": ["pork tossed rice noodle"],
-        "chicken tossed rice noodles": ["chicken tossed rice noodle"]
-    }
-
-    ingredient_profit_per_month = {month: {} for month in combined_df['Month'].unique()}
-    month_total_profit = {}
-
-    for month in combined_df['Month'].unique():
-        month_df = combined_df[combined_df['Month'] == month]
-        month_total = month_df['Amount'].sum()
-        month_total_profit[month] = month_total
-
-        for ingredient in ingredient_df.columns[1:]:
-            ingredient_clean = ingredient.strip()
-            used_in_items = ingredient_df.loc[
-                ingredient_df[ingredient].notna() & (ingredient_df[ingredient] != 0),
-                'Item name'
-            ].dropna().tolist()
-
-            total_profit = 0.0
-            for item in used_in_items:
-                patterns = special_matches.get(item, [item])
-                for p in patterns:
-                    matched = month_df[month_df['Item Name'].str.contains(p, case=False, na=False)]
-                    if not matched.empty:
-                        total_profit += matched['Amount'].sum()
-
-            ingredient_profit_per_month[month][ingredient_clean] = total_profit
+    """Loads ingredient-level optimization (prebuilt attribution, see msy.datasets)."""
+    profit_df, totals = datasets.ingredient_profit()
+    ingredient_profit_per_month = {month: row.to_dict() for month, row in profit_df.iterrows()}
+    month_total_profit = totals.to_dict()
 
     return ingredient_profit_per_month, month_total_profit
 
@@ -132,16 +46,11 @@ if mode == "Item Optimization":
     avg_df = combined_df.groupby('Item Name', as_index=False)['Amount'].mean()
 
     st.sidebar.header("📅 Filters")
-    month_names = [name for _, _, name in files]
     selected_month = st.sidebar.selectbox("Select month:", month_names)
     top_n = 14  # fixed number of bars
 
-    selected_tuple = next((f for f in files if f[2] == selected_month), None)
-    if selected_tuple:
-        file_path, sheet_name, month_name = selected_tuple
-        month_df = load_month_data(file_path, sheet_name, month_name)
-    else:
-        st.stop()
+    month_name = selected_month
+    month_df = load_month_data(month_name)
 
     if month_df is not None and not month_df.empty:
         month_df = month_df.sort_values(by='Amount', ascending=False)
@@ -197,3 +106,64 @@ elif mode == "Ingredient Optimization":
 
     st.plotly_chart(fig, use_container_width=True)
     st.dataframe(df_plot)
+
+elif mode == "Menu Mix Optimization":
+    st.header("Menu Mix Optimization")
+    st.caption(
+        "Which items to promote or limit to maximize profit (average Amount per serving) without using more "
+        "of any ingredient than the month's deliveries. Shadow prices show what one more lb (or count) of an "
+        "ingredient would add."
+    )
+
+    base = whatif.baseline()
+    dates = list(base["servings"].columns)
+    selected_date = st.sidebar.selectbox(
+        "Select month:", dates, index=base["actual_months"] - 1,
+        format_func=lambda d: d.strftime("%B %Y") + ("" if dates.index(d) < base["actual_months"] else " (forecast)"),
+    )
+    promote = st.sidebar.slider("Max increase per item (%)", 0, 200, int(menu_mix.DEFAULT_PROMOTE * 100), step=5)
+    floor = st.sidebar.slider("Min kept per item (% of baseline)", 0, 100, int(menu_mix.DEFAULT_FLOOR * 100), step=5)
+    supply_pct = st.sidebar.slider("Supply (% of scheduled deliveries)", 25, 300, 100, step=5)
+
+    model = menu_mix.model(selected_date)
+    mix, ingredients, summary = menu_mix.solve(model, promote / 100, floor / 100, supply_pct / 100)
+
+    if not summary["feasible"]:
+        st.warning("Even the minimum servings use more than the deliveries; lower the minimum or raise supply.")
+    c1, c2 = st.columns(2)
+    c1.metric("Baseline profit", f"${summary['baseline_margin']:,.0f}")
+    c2.metric(
+        "Optimized profit", f"${summary['margin']:,.0f}",
+        delta=f"{summary['margin'] - summary['baseline_margin']:+,.0f}",
+    )
+    st.caption("Baseline servings may already use more than the deliveries; the optimized mix never does.")
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=mix['Item'], y=mix['Baseline Servings'], name="Baseline", marker_color='lightgray'))
+    fig.add_trace(go.Bar(x=mix['Item'], y=mix['Servings'], name="Optimized", marker_color='#D41919'))
+    fig.update_layout(
+        title=f"Servings by Item — {selected_date.strftime('%B %Y')}",
+        xaxis_title="Item Name",
+        yaxis_title="Servings",
+        barmode='group',
+        xaxis_tickangle=-45,
+        legend=dict(x=0.02, y=0.98),
+        height=600
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(
+        mix.style.format({
+            "Margin": "${:,.2f}", "Baseline Servings": "{:,.0f}", "Servings": "{:,.1f}",
+            "Change (%)": "{:+.0f}%", "Marginal Value": "${:,.2f}",
+        }),
+        hide_index=True,
+    )
+
+    st.subheader("Ingredient Shadow Prices")
+    st.dataframe(
+        ingredients.style.format({
+            "Supply": "{:,.1f}", "Baseline Usage": "{:,.1f}", "Usage": "{:,.1f}", "Slack": "{:,.1f}",
+            "Shadow Price": "${:,.2f}",
+        }, na_rep="—"),
+        hide_index=True,
+    )
@@ -1,30 +1,15 @@
 # predictive_analysis/combined_prev_months.py
 
-import pandas as pd
-import os
+from msy import pos
 
-def combine_previous_months():
+def combine_previous_months(force=False):
     """
-    Combines all monthly sales CSV files from the 'dataset' folder into one cleaned DataFrame.
-    """
-    dataset_folder = "data"
-    output_file = "cleaned_item_sales.csv"
-
-    all_data = []
-
-    for file in sorted(os.listdir(dataset_folder)):
-        if file.endswith(".csv"):
-            month_name = file.replace(".csv", "")
-            df = pd.read_csv(os.path.join(dataset_folder, file))
-            df["Month"] = month_name
-            all_data.append(df)
+    Ingests new or changed monthly POS exports from the 'data' folder into the cleaned sales store.
 
-    combined = pd.concat(all_data, ignore_index=True)
-
-    # Basic cleaning
-    combined.dropna(subset=["Item Name"], inplace=True)
-    combined["Sales Count"] = pd.to_numeric(combined["Sales Count"], errors="coerce").fillna(0)
-
-    # Save
-    combined.to_csv(output_file, index=False)
-    return combined
+    Exports are streamed chunk by chunk (see ``msy.pos``); files already in the
+    store's manifest are skipped. Returns {export file -> rows written}.
+    """
+    written = pos.ingest(force=force)
+    for name, rows in written.items():
+        print(f"Ingested {name}: {rows} rows")
+    return written
@@ -1,30 +1,25 @@
 # predictive_analysis/ingredient_demand_forecast.py
 
-import pandas as pd
-from prophet import Prophet
+from msy import forecast, pos
 
-def run_forecast():
+def run_forecast(backend=None):
     """
-    Generates a basic Prophet forecast for ingredient demand using combined sales data.
-    """
-    df = pd.read_csv("cleaned_item_sales.csv")
+    Generates a basic forecast for ingredient demand using combined sales data.
 
-    if "Date" not in df.columns:
-        # Example: create a date column from Month name
-        df["Date"] = pd.to_datetime(df["Month"] + "-01")
+    ``backend`` is one of ``msy.forecast.BACKENDS`` (default: ``FORECAST_BACKEND``).
+    """
+    pos.ingest()
 
     # Aggregate sales per month
-    grouped = df.groupby("Date")["Sales Count"].sum().reset_index()
-    grouped.rename(columns={"Date": "ds", "Sales Count": "y"}, inplace=True)
-
-    # Prophet forecast
-    model = Prophet(yearly_seasonality=True)
-    model.fit(grouped)
+    grouped = pos.monthly_totals()[["ds", "count"]].rename(columns={"count": "y"})
 
-    future = model.make_future_dataframe(periods=3, freq="M")
-    forecast = model.predict(future)
+    # Forecast the total as a single series
+    backend = backend or forecast.FORECAST_BACKEND
+    params = {"yearly_seasonality": True} if backend == "prophet" else {}
+    forecaster = forecast.get_forecaster(backend, **params)
+    result = forecaster.forecast(grouped.assign(Ingredient="Total"), periods=3)
 
-    result = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    result = result[["ds", "yhat", "yhat_lower", "yhat_upper"]]
     result.to_csv("ingredient_demand_forecast.csv", index=False)
 
     return result
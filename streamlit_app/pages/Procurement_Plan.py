@@ -0,0 +1,94 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+from msy import artifacts, inventory, procurement, shipments
+
+st.set_page_config(page_title="Procurement Plan", layout="wide")
+st.title("Procurement Plan")
+st.caption(
+    "Cheapest delivery cadence and packs per delivery for every shipment line, covering forecast demand "
+    "plus safety stock week by week. Pack sizes come from the shipment sheet."
+)
+
+
+@st.cache_data
+def load_table(artifact_version):
+    """Latest constraint table from the forecast artifact store."""
+    return artifacts.load_latest()
+
+
+@st.cache_data
+def solve(artifact_version, start, weeks, safety_days, opening_days, order_cost, holding_cost, frequencies):
+    return procurement.solve(
+        start, weeks, safety_days, opening_days, order_cost, holding_cost,
+        frequencies=frequencies, table=load_table(artifact_version),
+    )
+
+
+version = artifacts.version()
+table = load_table(version)
+if table.empty:
+    st.error("No forecasts found. Run `python -m msy precompute` from `streamlit_app` first.")
+    st.stop()
+start, _ = inventory.forecast_window(table)
+if pd.isna(start):
+    st.info("The latest forecasts have no future months. Run `python -m msy precompute` after the next month lands.")
+    st.stop()
+
+# --- Sidebar ---
+st.sidebar.header("Plan Settings")
+weeks = st.sidebar.slider("Horizon (weeks)", 4, 13, procurement.DEFAULT_WEEKS)
+safety_days = st.sidebar.slider("Safety stock (days of demand)", 0, 14, procurement.DEFAULT_SAFETY_DAYS)
+opening_days = st.sidebar.slider("Starting stock (days of demand)", 0, 30, inventory.DEFAULT_COVER_DAYS)
+frequencies = st.sidebar.multiselect(
+    "Allowed cadences", shipments.FREQUENCIES, default=list(shipments.FREQUENCIES), format_func=str.title
+)
+order_cost = st.sidebar.number_input("Cost per delivery ($)", 0.0, 1_000.0, procurement.ORDER_COST, step=5.0)
+holding_cost = st.sidebar.number_input(
+    "Holding cost ($ per lb or count per week)", 0.0, 10.0, procurement.HOLDING_COST, step=0.01
+)
+if not frequencies:
+    st.warning("Select at least one cadence.")
+    st.stop()
+
+plan, levels, summary = solve(
+    version, start, weeks, safety_days, opening_days, order_cost, holding_cost, tuple(frequencies)
+)
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Plan cost", f"${summary['order_cost'] + summary['holding_cost']:,.0f}")
+c2.metric("Delivery cost", f"${summary['order_cost']:,.0f}")
+c3.metric("Holding cost", f"${summary['holding_cost']:,.0f}")
+c4.metric("Solve time", f"{summary['seconds'] * 1000:,.0f} ms")
+short = levels.loc[levels["Uncovered"] > 1e-6, "Ingredient"].unique()
+if len(short):
+    st.warning(
+        "Demand plus safety stock can't be fully covered with these cadences for: " + ", ".join(short)
+        + ". Allow more cadences or raise the starting stock."
+    )
+
+st.subheader("Recommended Orders")
+st.dataframe(
+    plan.style.format({
+        "Pack Size": "{:,.0f}", "Current Packs": "{:,.0f}", "Ordered": "{:,.0f}",
+        "Current Ordered": "{:,.0f}", "Order Cost": "${:,.0f}",
+        "Frequency": str.title, "Current Frequency": str.title,
+    }),
+    use_container_width=True, hide_index=True,
+)
+
+# --- Projected stock ---
+ingredient = st.selectbox("Recipe ingredient", levels["Ingredient"].unique())
+data = levels[levels["Ingredient"] == ingredient]
+base = alt.Chart(data).encode(x=alt.X("Date:T", title="Week"))
+on_hand = base.mark_line(color="#750e2b", strokeWidth=2, interpolate="step-after").encode(
+    y=alt.Y("On Hand:Q", title="End of week on hand (lbs or count)"),
+    tooltip=[
+        alt.Tooltip("Date:T", title="Week of", format="%Y-%m-%d"),
+        alt.Tooltip("On Hand:Q", format=",.1f"),
+        alt.Tooltip("Demand:Q", format=",.1f"),
+        alt.Tooltip("Supply:Q", format=",.1f"),
+    ],
+)
+supply = base.mark_bar(color="#2b8a3e", opacity=0.4).encode(y="Supply:Q")
+st.altair_chart(alt.layer(supply, on_hand).properties(height=380), use_container_width=True)
@@ -2,31 +2,24 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import altair as alt
-from pathlib import Path
+from msy import constraints, datasets, shipments
 
 st.set_page_config(page_title="Mai Shan Yan Shipments", layout="wide")
 st.title("Ingredients Shipment Dashboard")
 st.caption("Bars are all displays of monthly frequency per item!")
 
-DATA_DIR = Path("data")
-CSV_PATH = DATA_DIR / "MSY Data - Shipment.csv"   # exact CSV filename
-XLSX_PATH = DATA_DIR / "MSY Data - Shipment.xlsx" # fallback if it's Excel
+CSV_PATH = constraints.SHIPMENT_PATH    # exact CSV filename
+XLSX_PATH = datasets.SHIPMENT_XLSX_PATH  # fallback if it's Excel
 
-if CSV_PATH.exists():
-    df = pd.read_csv(CSV_PATH)
-elif XLSX_PATH.exists():
-    df = pd.read_excel(XLSX_PATH, engine="openpyxl")
-else:
+df = datasets.shipments()
+if df is None:
     st.error(f"Couldn’t find the data file.\nLooked for:\n- {CSV_PATH}\n- {XLSX_PATH}")
     st.stop()
 
-freq_map = {"weekly": 4, "biweekly": 2, "monthly": 1}
-freq = df["frequency"].astype(str).str.strip().str.lower().map(freq_map)
-
-df["quantityshipment"] = df["Quantity per shipment"] * df["Number of shipments"]
-df["Total monthly shipment"] = df["quantityshipment"] * freq
-
-df["Total monthly shipment"] = df["Total monthly shipment"].fillna(0)
+# Monthly totals from the shared shipment engine (52/12 weekly deliveries a month)
+lines = shipments.normalize_lines(df)
+df["Total monthly shipment"] = lines["Per Month"].to_numpy()
+df["Monthly supply (lbs or count)"] = shipments.line_supply(lines, "lbs").to_numpy()
 
 tab_monthly= st.tabs(["📊 Monthly Shipments"])
 
@@ -83,6 +76,7 @@ chart = (
             alt.Tooltip("Number of shipments:Q", title="Number of Shipments"),
             alt.Tooltip("frequency:N", title="Order Frequency"),
             alt.Tooltip("Total monthly shipment:Q", title="Total Per Month",format=",.0f"),
+            alt.Tooltip("Monthly supply (lbs or count):Q", title="Recipe Units Per Month", format=",.1f"),
         ],
     )
     .properties(height=420)
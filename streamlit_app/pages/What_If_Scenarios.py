@@ -0,0 +1,84 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+from msy import cache, whatif
+
+st.set_page_config(page_title="What-If Scenarios", layout="wide")
+st.title("What-If Scenarios")
+st.caption(
+    "Scale menu item demand up or down (or drop an item) and see ingredient usage, "
+    "revenue and shortfalls against that month's deliveries."
+)
+
+# --- Sidebar: month ---
+base = whatif.baseline()
+dates = list(base["servings"].columns)
+month = st.sidebar.selectbox(
+    "Month",
+    dates,
+    index=base["actual_months"] if len(dates) > base["actual_months"] else len(dates) - 1,
+    format_func=lambda d: d.strftime("%b %Y") + ("" if dates.index(d) < base["actual_months"] else " (forecast)"),
+)
+
+# one scenario per session; rebuilt when the month or the data change
+key = (month, cache.data_version())
+if st.session_state.get("whatif_key") != key:
+    st.session_state.whatif = whatif.Scenario.for_month(month)
+    st.session_state.whatif_key = key
+scenario = st.session_state.whatif
+
+# --- Sidebar: demand changes ---
+st.sidebar.header("Demand Changes")
+items = st.sidebar.multiselect("Menu items to change", scenario.recipes)
+multipliers = {}
+for item in items:
+    st.session_state.setdefault(f"whatif_{item}", 0)
+    pct = st.sidebar.slider(f"{item} (%)", -100, 100, step=5, key=f"whatif_{item}")
+    multipliers[item] = 1 + pct / 100
+
+
+def reset_sliders():
+    for item in items:
+        st.session_state[f"whatif_{item}"] = 0
+
+
+st.sidebar.button("Reset", on_click=reset_sliders)
+
+scenario.apply(multipliers)
+result = scenario.result()
+
+# --- Headline numbers ---
+short_base = int((result["Supply"] - result["Baseline Usage"] < 0).sum())
+short_now = int((result["Status"] == "⚠️ Shortfall").sum())
+c1, c2, c3 = st.columns(3)
+c1.metric("Revenue", f"${scenario.revenue:,.0f}", f"{scenario.revenue - scenario.baseline_revenue:+,.0f}")
+c2.metric("Ingredients short", short_now, short_now - short_base, delta_color="inverse")
+c3.metric("Items changed", sum(m != 1 for m in multipliers.values()))
+
+# --- Usage vs supply ---
+st.subheader("Ingredient Usage vs. Supply")
+chart_df = result.melt(
+    id_vars=["Ingredient", "Unit"], value_vars=["Baseline Usage", "Scenario Usage", "Supply"],
+    var_name="Series", value_name="Quantity",
+).dropna()
+chart = (
+    alt.Chart(chart_df)
+    .mark_bar()
+    .encode(
+        y=alt.Y("Ingredient:N", sort=list(result["Ingredient"]), title=None),
+        yOffset="Series:N",
+        x=alt.X("Quantity:Q", title="Quantity (lbs or count)"),
+        color=alt.Color("Series:N", scale=alt.Scale(range=["#9e9e9e", "#750e2b", "#2b8a3e"])),
+        tooltip=["Ingredient:N", "Series:N", alt.Tooltip("Quantity:Q", format=",.1f"), "Unit:N"],
+    )
+    .properties(height=alt.Step(8))
+)
+st.altair_chart(chart, use_container_width=True)
+
+st.dataframe(
+    result.style.format({
+        "Baseline Usage": "{:,.1f}", "Scenario Usage": "{:,.1f}", "Change": "{:+,.1f}",
+        "Supply": "{:,.1f}", "Surplus": "{:+,.1f}",
+    }, na_rep="–"),
+    use_container_width=True, hide_index=True,
+)
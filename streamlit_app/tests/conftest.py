@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""Make ``msy`` importable when pytest is run from outside ``streamlit_app``."""
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
@@ -0,0 +1,55 @@
+# tests/test_anomalies.py
+import numpy as np
+import pytest
+
+from msy import anomalies, cube
+
+MONTHS = ["May", "June", "July", "August", "September", "October", "November", "December"]
+ITEMS = ["Beef Ramen", "Pepsi", "Green Tea", "Wonton Soup", "Fried Rice", "Pepsi Zero", "pepsi zero"]
+
+
+@pytest.fixture(autouse=True)
+def synthetic_cube(monkeypatch):
+    """About 50 sales a month at $2 each, with a few planted anomalies."""
+    rng = np.random.default_rng(0)
+    count = np.round(50 * (1 + 0.03 * rng.standard_normal((len(ITEMS), len(MONTHS)))))
+    count[1, 4] = 200  # Pepsi spikes in September
+    count[2, 2] = 0  # Green Tea sells nothing in July
+    count[5, 4:], count[6, :4] = 0, 0  # "Pepsi Zero" renamed to "pepsi zero" in September
+    price = np.full(count.shape, 2.0)
+    price[3, 5] = 10.0  # Wonton Soup rung up at $10 in October
+    cents = np.round(count * price * 100).astype(np.int64)
+    c = cube.Cube(
+        MONTHS, {"item": ITEMS, "category": ["Noodles", "Rice"]},
+        {"item": count, "category": np.vstack([count[:4].sum(0), count[4:].sum(0)])},
+        {"item": cents, "category": np.vstack([cents[:4].sum(0), cents[4:].sum(0)])},
+    )
+    monkeypatch.setattr(cube, "load_cube", lambda *args, **kwargs: c)
+
+
+def test_planted_anomalies_are_flagged():
+    # __wrapped__ skips the result cache, which is keyed on the real data
+    out = anomalies.alerts.__wrapped__()
+    flagged = set(out[["Member", "Measure", "Month", "Kind"]].itertuples(index=False, name=None))
+    assert flagged == {
+        ("Pepsi", "count", "September", "Spike"),
+        ("Pepsi", "amount", "September", "Spike"),
+        ("Green Tea", "count", "July", "No Sales"),
+        ("Wonton Soup", "amount", "October", "Spike"),
+        ("Wonton Soup", "price", "October", "Price Outlier"),
+    }
+    assert (out["Dimension"] == "item").all()
+    assert out["Score"].abs().is_monotonic_decreasing
+    spike = out[(out["Member"] == "Pepsi") & (out["Measure"] == "count")].iloc[0]
+    assert spike["Value"] == 200 and spike["Expected"] == pytest.approx(50, rel=0.1)
+
+
+def test_quiet_series_are_not_scored():
+    assert anomalies.alerts.__wrapped__(min_median_count=100).empty
+
+
+def test_renamed_item_is_a_duplicate():
+    out = anomalies.duplicates.__wrapped__()
+    assert out[["Name", "Other Name", "Months Together", "Pattern"]].values.tolist() == [
+        ["Pepsi Zero", "pepsi zero", 0, "Renamed"],
+    ]
@@ -0,0 +1,27 @@
+# tests/test_cache.py
+import threading
+import time
+
+from msy import cache
+
+
+def test_concurrent_misses_compute_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "RESULT_DIR", tmp_path)
+    calls = []
+
+    @cache.cached("tests.slow", sources=[])
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return {"x": x}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(3))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [3]
+    assert results == [{"x": 3}] * 8
+    assert [p.suffix for p in (tmp_path / "tests.slow").iterdir()] == [".pkl"]
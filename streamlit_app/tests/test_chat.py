@@ -0,0 +1,73 @@
+# tests/test_chat.py
+import threading
+
+import pytest
+
+from msy import chat
+
+
+class FakeBackend(chat.ChatBackend):
+    """Streams fixed chunks and counts its calls."""
+
+    name = "fake"
+
+    def __init__(self, chunks):
+        super().__init__("fake-model")
+        self.chunks = chunks
+        self.calls = 0
+
+    def stream(self, prompt):
+        self.calls += 1
+        yield from self.chunks
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(chat, "_responses", chat.TTLCache(ttl=60))
+
+
+def test_backend_must_implement_stream():
+    with pytest.raises(TypeError):
+        chat.ChatBackend()
+
+
+def test_reply_streams_chunks_in_order():
+    backend = FakeBackend(["one", " two", " three"])
+    reply = chat.submit("count", backend)
+    assert list(reply.chunks(timeout=5)) == ["one", " two", " three"]
+    assert reply.wait(5) == "one two three"
+    assert reply.error is None and not reply.cached
+
+
+def test_repeated_prompt_is_served_from_cache():
+    backend = FakeBackend(["hello"])
+    chat.submit("hi", backend).wait(5)
+    again = chat.submit("hi", backend)
+    assert again.cached and again.done
+    assert list(again.chunks(timeout=5)) == ["hello"]
+    assert backend.calls == 1
+
+
+def test_expired_prompt_calls_backend_again(monkeypatch):
+    monkeypatch.setattr(chat, "_responses", chat.TTLCache(ttl=0))
+    backend = FakeBackend(["hello"])
+    chat.submit("hi", backend).wait(5)
+    again = chat.submit("hi", backend)
+    again.wait(5)
+    assert not again.cached and backend.calls == 2
+
+
+def test_build_runs_on_the_worker():
+    threads = []
+
+    def build(question):
+        threads.append(threading.current_thread().name)
+        return f"context + {question}"
+
+    backend = FakeBackend(["ok"])
+    first = chat.submit("hi", backend, build=build)
+    assert first.wait(5) == "ok"
+    second = chat.submit("hi", backend, build=build)
+    assert second.wait(5) == "ok" and second.cached
+    assert backend.calls == 1
+    assert all(name.startswith("msy-chat") for name in threads) and len(threads) == 2
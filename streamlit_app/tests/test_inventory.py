@@ -0,0 +1,73 @@
+# tests/test_inventory.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from msy import constraints, inventory, shipments
+from msy import recipes as rec
+
+BEEF, ONION = "braised beef used (g)", "White onion"
+
+
+@pytest.fixture(autouse=True)
+def schedule(monkeypatch):
+    """Beef: 10 lbs every Monday. White onion: 40 every other Monday (Jan 6 and 20, 2025)."""
+    lines = shipments.normalize_lines(pd.DataFrame({
+        "Ingredient": ["Beef", "White Onion"],
+        "Quantity per shipment": [10, 20],
+        "Unit of shipment": ["lbs", "whole onion"],
+        "Number of shipments": [1, 2],
+        "frequency": ["weekly", "biweekly"],
+    }))
+    recipes = pd.DataFrame({"Item name": ["Beef Fried Rice"], BEEF: [100], ONION: [1]})
+    monkeypatch.setattr(shipments, "load_lines", lambda path=None: lines)
+    monkeypatch.setattr(rec, "load_recipes", lambda path=None: recipes)
+
+
+def table(action=constraints.HISTORICAL):
+    # January 2025 demand: 2 lbs of beef and 1 onion a day
+    return pd.DataFrame({
+        "Ingredient": [BEEF, ONION],
+        "Date": pd.Timestamp("2025-01-01"),
+        "Forecast_LBS_or_Count": [62.0, 31.0],
+        "Action_Required": action,
+    })
+
+
+def on_hand(levels, ingredient):
+    return levels.loc[levels["Ingredient"] == ingredient].set_index("Date")["On Hand"]
+
+
+def test_daily_levels_and_stockouts():
+    levels, report = inventory.run("2025-01-01", "2025-01-31", "day", cover_days=3, table=table())
+    beef = on_hand(levels, BEEF)
+    # 6 lbs to start, out on Jan 4, refilled by each Monday's 10 lbs and out again by Saturday
+    np.testing.assert_allclose(beef["2025-01-01":"2025-01-08"], [4, 2, 0, 0, 0, 8, 6, 4])
+    np.testing.assert_allclose(on_hand(levels, ONION)[["2025-01-05", "2025-01-06", "2025-01-20"]], [0, 39, 65])
+
+    report = report.set_index("Ingredient")
+    assert report.index.tolist() == [BEEF, ONION]  # same first stockout, more unmet beef
+    assert (report["First Stockout"] == pd.Timestamp("2025-01-04")).all()
+    assert report["Stockout Steps"].tolist() == [8, 2]
+    np.testing.assert_allclose(report["Unmet Demand"], [16, 2])
+    np.testing.assert_allclose(report["End On Hand"], [0, 54])
+    np.testing.assert_allclose(report["Start On Hand"], [6, 3])
+
+
+def test_weekly_levels_keep_the_totals():
+    levels, report = inventory.run("2025-01-01", "2025-01-31", "week", cover_days=3, table=table())
+    weeks = on_hand(levels, ONION)
+    assert weeks.index.strftime("%m-%d").tolist() == ["12-30", "01-06", "01-13", "01-20", "01-27"]
+    np.testing.assert_allclose(weeks, [0, 33, 26, 59, 54])
+    np.testing.assert_allclose(on_hand(levels, BEEF), 0)
+
+    report = report.set_index("Ingredient")
+    assert (report["First Stockout"] == pd.Timestamp("2024-12-30")).all()
+    np.testing.assert_allclose(report["Unmet Demand"], [16, 2])
+
+
+def test_forecast_window_is_empty_without_future_months():
+    start, end = inventory.forecast_window(table())
+    assert pd.isna(start) and pd.isna(end)
+    start, end = inventory.forecast_window(table(action=constraints.SUFFICIENT))
+    assert (start, end) == (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-31"))
@@ -0,0 +1,50 @@
+# tests/test_menu_mix.py
+import numpy as np
+import pytest
+
+from msy import menu_mix
+
+
+@pytest.fixture
+def model():
+    # Beef Bowl uses a lb of beef and a lb of rice, Rice Bowl a lb of rice
+    return {
+        "items": ["Beef Bowl", "Rice Bowl"],
+        "servings": np.array([10.0, 10.0]),
+        "price": np.array([5.0, 3.0]),
+        "usage": np.array([[1.0, 0.0], [1.0, 1.0]]),  # ingredients x items
+        "ingredients": ["braised beef used (g)", "Rice(g)"],
+        "supply": np.array([12.0, 25.0]),
+    }
+
+
+def test_feasible_mix_and_shadow_prices(model):
+    mix, ingredients, summary = menu_mix.solve(model, promote=0.5, floor=0.0)
+    assert summary["feasible"]
+    assert (summary["baseline_margin"], summary["margin"]) == pytest.approx((80, 99))
+
+    mix = mix.set_index("Item")
+    np.testing.assert_allclose(mix["Servings"], [13, 12])  # Rice Bowl grew most, listed first
+    assert mix.index.tolist() == ["Rice Bowl", "Beef Bowl"]
+    assert mix["Action"].tolist() == ["Promote", "Promote"]
+    np.testing.assert_allclose(mix["Marginal Value"], 0, atol=1e-9)  # neither hits its 15-serving cap
+
+    shadow = ingredients.set_index("Ingredient")["Shadow Price"]
+    # one more lb of rice is one more Rice Bowl; one more lb of beef swaps a Rice Bowl for a Beef Bowl
+    assert shadow.to_dict() == pytest.approx({"Rice(g)": 3, "braised beef used (g)": 2})
+    np.testing.assert_allclose(ingredients["Slack"], 0, atol=1e-9)
+
+
+def test_infeasible_floor_is_returned_without_shadow_prices(model):
+    mix, ingredients, summary = menu_mix.solve(model, floor=1.0, supply_scale=0.5)
+    assert not summary["feasible"]
+    np.testing.assert_allclose(mix["Servings"], 10)
+    assert (mix["Action"] == "Keep").all()
+    assert ingredients["Shadow Price"].isna().all()
+    assert ingredients.set_index("Ingredient").loc["braised beef used (g)", "Slack"] == pytest.approx(-4)
+
+
+def test_ingredient_costs_lower_margins(model):
+    np.testing.assert_allclose(menu_mix.margins(model, {"braised beef used (g)": 1.5}), [3.5, 3.0])
+    with pytest.raises(ValueError, match="Unknown ingredient"):
+        menu_mix.margins(model, {"Tofu": 1.0})
@@ -0,0 +1,24 @@
+# tests/test_money.py
+import numpy as np
+import pandas as pd
+
+from msy import money
+
+
+def test_text_amounts():
+    cents, stats = money.to_cents(["$6,921.26", "-$12.00", "(3.50)", "7", "", None])
+    assert cents.tolist() == [692126, -1200, -350, 700, 0, 0]
+    assert (stats["parsed"], stats["missing"], stats["rejected"]) == (4, 2, 0)
+
+
+def test_floats_in_text_column_are_rounded():
+    cents, stats = money.to_cents(pd.Series(["$1.00", 0.1 + 0.2, 1234.5678, 5, np.nan], dtype=object))
+    assert cents.tolist() == [100, 30, 123457, 500, 0]
+    assert (stats["parsed"], stats["missing"], stats["rejected"]) == (4, 1, 0)
+
+
+def test_minus_only_as_leading_sign():
+    cents, stats = money.to_cents(["12-3", "1.-5", "12.00-", "-12.3", "$-4", "- 4"])
+    assert cents.tolist() == [0, 0, 0, -1230, -400, -400]
+    assert stats["rejected"] == 3
+    assert stats["rejected_examples"] == ["12-3", "1.-5", "12.00-"]
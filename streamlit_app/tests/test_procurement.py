@@ -0,0 +1,70 @@
+# tests/test_procurement.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from msy import procurement, shipments
+from msy import recipes as rec
+
+BEEF = "braised beef used (g)"
+
+
+@pytest.fixture(autouse=True)
+def beef_only(monkeypatch):
+    monkeypatch.setattr(rec, "load_recipes", lambda path=None: pd.DataFrame({"Item name": ["Beef Ramen"], BEEF: [140]}))
+
+
+@pytest.fixture
+def lines():
+    # 10 lb packs of beef, currently one pack a week
+    return shipments.normalize_lines(pd.DataFrame({
+        "Ingredient": ["Beef"], "Quantity per shipment": [10], "Unit of shipment": ["lbs"],
+        "Number of shipments": [1], "frequency": ["weekly"],
+    }))
+
+
+@pytest.fixture
+def table():
+    # 2 lbs of beef a day: 14 a week
+    return pd.DataFrame({
+        "Ingredient": BEEF,
+        "Date": pd.to_datetime(["2025-01-01", "2025-02-01"]),
+        "Forecast_LBS_or_Count": [62.0, 56.0],
+        "Action_Required": "Historical Data",
+    })
+
+
+def solve(lines, table, **kwargs):
+    # four weeks from Monday Jan 6, 2025: biweekly deliveries land on Jan 6 and Jan 20
+    params = dict(weeks=4, safety_days=0, opening_days=0, order_cost=25.0, holding_cost=0.05, shortage_cost=1_000.0)
+    return procurement.solve("2025-01-06", **{**params, **kwargs}, table=table, lines=lines)
+
+
+def test_cheapest_cadence_covers_demand(lines, table):
+    plan, levels, summary = solve(lines, table)
+    # weekly needs 2 packs x 4 deliveries ($100 + $3 holding); biweekly 3 packs x 2 ($50 + $2)
+    row = plan.iloc[0]
+    assert (row["Frequency"], row["Packs"], row["Deliveries"], row["Ordered"]) == ("biweekly", 3, 2, 60)
+    np.testing.assert_allclose(levels["Supply"], [30, 0, 30, 0])
+    np.testing.assert_allclose(levels["On Hand"], [16, 2, 18, 4])
+    assert (levels["On Hand"] >= 0).all() and (levels["Uncovered"] == 0).all()
+    assert summary["order_cost"] == 50.0
+    assert summary["holding_cost"] == pytest.approx(0.05 * 40)
+    assert summary["total_cost"] == pytest.approx(52.0)
+
+
+def test_reported_costs_match_the_objective(lines, table):
+    for kwargs in ({}, {"opening_days": 3, "safety_days": 2}, {"frequencies": ("monthly",)}):
+        _, levels, summary = solve(lines, table, **kwargs)
+        # the objective leaves out opening stock minus demand so far, which no plan changes
+        opening = kwargs.get("opening_days", 0) * levels["Demand"].iloc[0] / 7
+        constant = 0.05 * (opening - levels["Demand"].cumsum()).sum()
+        assert summary["total_cost"] == pytest.approx(summary["objective"] + constant)
+
+
+def test_late_cadence_leaves_demand_uncovered(lines, table):
+    plan, levels, summary = solve(lines, table, frequencies=("monthly",))
+    # the first monthly delivery (Feb 1) falls in the last week
+    assert plan.iloc[0]["Frequency"] == "monthly"
+    np.testing.assert_allclose(levels["Uncovered"], [14, 28, 42, 0])
+    assert summary["shortage_cost"] == pytest.approx(1_000.0 * 84)
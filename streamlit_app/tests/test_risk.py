@@ -0,0 +1,60 @@
+# tests/test_risk.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from msy import forecast as fc
+from msy import recipes as rec
+from msy import risk, shipments
+
+BEEF = "braised beef used (g)"
+
+
+@pytest.fixture(autouse=True)
+def one_recipe(monkeypatch):
+    """Beef Ramen (1 lb of beef) forecast at 100 servings a month against 100 lbs delivered monthly."""
+    recipes = pd.DataFrame({"Item name": ["Beef Ramen", "Plain Rice"], BEEF: [shipments.GRAMS_PER_LB, 0]})
+    lines = shipments.normalize_lines(pd.DataFrame({
+        "Ingredient": ["Beef"], "Quantity per shipment": [100], "Unit of shipment": ["lbs"],
+        "Number of shipments": [1], "frequency": ["monthly"],
+    }))
+    history = pd.date_range("2025-01-01", periods=3, freq="MS")
+    future = pd.date_range("2025-04-01", periods=2, freq="MS")
+    rows = pd.concat([
+        pd.DataFrame({"Ingredient": "Beef Ramen", "ds": history, "y": [90.0, 100.0, 110.0], "yhat": 100.0}),
+        pd.DataFrame({"Ingredient": "Beef Ramen", "ds": future, "y": np.nan, "yhat": 100.0}),
+        pd.DataFrame({"Ingredient": "Plain Rice", "ds": history.append(future), "y": [0.0] * 3 + [np.nan] * 2,
+                      "yhat": 0.0}),
+    ], ignore_index=True)
+    rows["yhat_lower"] = rows["yhat"] - 10 * fc.Z_80
+    rows["yhat_upper"] = rows["yhat"] + 10 * fc.Z_80  # sigma 10 servings
+    monkeypatch.setattr(rec, "load_recipes", lambda path=None: recipes)
+    monkeypatch.setattr(shipments, "load_lines", lambda path=None: lines)
+    monkeypatch.setattr(risk, "servings_forecast", lambda *args, **kwargs: rows)
+
+
+def test_seeded_interval_run():
+    out = risk.simulate(scenarios=20_000, seed=7)
+    assert out["Date"].tolist() == [pd.Timestamp("2025-04-01"), pd.Timestamp("2025-05-01")]
+    assert out["Ingredient"].unique().tolist() == [BEEF]
+    np.testing.assert_allclose(out["Supply"], 100)
+    np.testing.assert_allclose(out["Mean Demand"], 100, atol=0.5)
+    np.testing.assert_allclose(out["P(Shortfall)"], 0.5, atol=0.02)
+    np.testing.assert_allclose(out["P(Shortfall So Far)"], [0.5, 0.75], atol=0.02)
+    np.testing.assert_allclose(out["Expected Unmet"], 10 / np.sqrt(2 * np.pi), atol=0.2)  # sigma * phi(0)
+
+    # same seed, same draws, however the scenarios are chunked
+    pd.testing.assert_frame_equal(out, risk.simulate(scenarios=20_000, seed=7, chunk=3_001))
+
+
+def test_bootstrap_draws_history_residuals():
+    out = risk.simulate(scenarios=30_000, method="bootstrap", seed=1)
+    # demand is 90, 100 or 110 lbs, each a third of the time
+    np.testing.assert_allclose(out["P(Shortfall)"], 1 / 3, atol=0.02)
+    np.testing.assert_allclose(out["Expected Unmet"], 10 / 3, atol=0.2)
+    np.testing.assert_allclose(out["Unmet P95"], 10.5)  # 10 lbs rounded up to a 1.5 lb bin edge
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="Unknown risk method"):
+        risk.simulate(method="quantile")
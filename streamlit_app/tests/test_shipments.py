@@ -0,0 +1,68 @@
+# tests/test_shipments.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from msy import shipments
+
+LB = shipments.GRAMS_PER_LB
+
+
+@pytest.fixture
+def lines():
+    return shipments.normalize_lines(pd.DataFrame({
+        "Ingredient": ["Beef", "White Onion", "Peas + Carrot"],
+        "Quantity per shipment": [10, 20, 2],
+        "Unit of shipment": ["lbs", "whole onion", "lbs"],
+        "Number of shipments": [1, 2, 1],
+        "frequency": ["weekly", "biweekly", "monthly"],
+    }))
+
+
+@pytest.fixture
+def recipes():
+    return pd.DataFrame({
+        "Item name": ["Fried Rice", "Plain"],
+        "braised beef used (g)": [100, 0],
+        "White onion": [1, 0],
+        "Peas(g)": [30, 0],
+        "Carrot(g)": [10, 0],
+    })
+
+
+def test_delivery_dates_follow_the_anchor():
+    assert shipments.delivery_dates("weekly", "2025-01-01", "2025-01-31").day.tolist() == [6, 13, 20, 27]
+    assert shipments.delivery_dates("biweekly", "2025-01-07", "2025-02-28").strftime("%m-%d").tolist() == [
+        "01-20", "02-03", "02-17",
+    ]
+    assert shipments.delivery_dates("monthly", "2025-01-01", "2025-03-15").month.tolist() == [1, 2, 3]
+
+
+def test_calendar_lists_every_delivery(lines):
+    cal = shipments.calendar("2025-01-01", "2025-01-31", lines)
+    assert cal["Date"].is_monotonic_increasing
+    assert cal.groupby("Ingredient").size().to_dict() == {"Beef": 4, "Peas + Carrot": 1, "White Onion": 2}
+    assert cal.loc[cal["Ingredient"] == "White Onion", "Quantity"].tolist() == [40.0, 40.0]
+    assert cal.iloc[0][["Ingredient", "Quantity"]].tolist() == ["Peas + Carrot", 2.0]
+
+
+def test_monthly_supply_converts_and_splits_lines(lines, recipes):
+    jan = shipments.supply("2025-01-01", "2025-01-31", "month", "g", lines, recipes).iloc[:, 0]
+    np.testing.assert_allclose(jan["braised beef used (g)"], 4 * 10 * LB)
+    assert jan["White onion"] == 80  # counted, not weighed
+    np.testing.assert_allclose(jan[["Peas(g)", "Carrot(g)"]], [2 * LB * 30 / 40, 2 * LB * 10 / 40])
+
+
+def test_weekly_supply_starts_on_mondays(lines, recipes):
+    weeks = shipments.supply("2025-01-01", "2025-01-19", "week", "lbs", lines, recipes)
+    assert weeks.columns.strftime("%m-%d").tolist() == ["12-30", "01-06", "01-13"]
+    np.testing.assert_allclose(weeks.loc["braised beef used (g)"], [0, 10, 10])
+    np.testing.assert_allclose(weeks.loc["White onion"], [0, 40, 0])
+    np.testing.assert_allclose(weeks.loc[["Peas(g)", "Carrot(g)"]].sum(), [2, 0, 0])
+
+
+def test_unknown_frequency_is_rejected():
+    raw = pd.DataFrame({"Ingredient": ["Beef"], "Quantity per shipment": [1], "Unit of shipment": ["lbs"],
+                        "Number of shipments": [1], "frequency": ["daily"]})
+    with pytest.raises(ValueError, match="daily"):
+        shipments.normalize_lines(raw)
@@ -0,0 +1,7 @@
+# tests/test_startup.py
+from msy import startup
+
+
+def test_home_imports_stay_light():
+    # the time budget is wall-clock and machine dependent: benchmarks/bench_imports.py checks it
+    assert startup.loaded_heavy(startup.script_imports(startup.HOME)) == []
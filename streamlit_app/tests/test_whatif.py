@@ -0,0 +1,59 @@
+# tests/test_whatif.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from msy import whatif
+
+LB = 453.592
+
+
+@pytest.fixture
+def scenario():
+    recipes = pd.DataFrame({
+        "Item name": ["Fried Rice", "Dumplings"],
+        "Egg(count)": [2, 0],
+        "Rice(g)": [LB, LB],
+        "flour (g)": [0, 2 * LB],
+    })
+    servings = pd.Series({"Fried Rice": 10.0, "Dumplings": 5.0})
+    price = pd.Series({"Fried Rice": 8.0, "Dumplings": 12.0})
+    supply = pd.Series({"Egg(count)": 30.0, "Rice(g)": 20.0})  # no flour line
+    return whatif.Scenario(servings, price, supply, other_revenue=5.0, recipes=recipes)
+
+
+def usage(s):
+    return dict(zip(s.ingredients, np.round(s.usage, 9)))
+
+
+def test_demand_change_scales_ingredient_need(scenario):
+    assert usage(scenario) == {"Egg(count)": 20, "Rice(g)": 15, "flour (g)": 10}
+    assert scenario.baseline_revenue == 145
+
+    assert scenario.apply({"Fried Rice": 1.5}) == {"Egg(count)", "Rice(g)"}
+    assert usage(scenario) == {"Egg(count)": 30, "Rice(g)": 20, "flour (g)": 10}
+    assert scenario.revenue == pytest.approx(185)
+
+    # recipes left out of the multipliers go back to 1
+    scenario.apply({"Dumplings": 0})
+    assert usage(scenario) == {"Egg(count)": 20, "Rice(g)": 10, "flour (g)": 0}
+    assert scenario.revenue == pytest.approx(85)
+
+
+def test_result_lists_shortfalls_first(scenario):
+    scenario.apply({"Fried Rice": 2})
+    out = scenario.result().set_index("Ingredient")
+    assert out.index.tolist() == ["Egg(count)", "Rice(g)", "flour (g)"]
+    assert out.loc["Egg(count)", ["Change", "Surplus", "Unit"]].tolist() == [20, -10, "Count"]
+    assert out["Surplus"].iloc[:2].tolist() == pytest.approx([-10, -5])
+    assert out["Status"].tolist() == ["⚠️ Shortfall", "⚠️ Shortfall", "No Supply Data"]
+
+    scenario.apply({"Fried Rice": 1.2})
+    assert scenario.result().set_index("Ingredient").loc["Rice(g)", "Status"] == "✅ Sufficient"
+    scenario.reset()
+    np.testing.assert_allclose(scenario.usage, scenario.baseline_usage)
+
+
+def test_unknown_recipe_is_rejected(scenario):
+    with pytest.raises(ValueError, match="Unknown recipe"):
+        scenario.apply({"Noodles": 2})